@@ -2,18 +2,65 @@
 PyAISnake AI module - AI algorithms for Snake game.
 """
 
+from .analysis import BoardAnalysis, analyze
 from .base import AdvancedSnakeAI, GameAnalyzer
+from .cache import LRUCache
+from .curriculum import CurriculumScheduler, Stage
+from .decision_cache import DecisionCache
+from .distributed import DistributedConfig, SharedParameters, SharedReplayBuffer, train_distributed
 from .dqn import DQNAI, DQNetwork, ReplayBuffer
+from .es import ESConfig, train_es
+from .expectimax import ExpectimaxAI
+from .feature_store import FeatureStore
 from .genetic import GeneticSnakeAI, Genome
+from .imitation import ImitationAI, ImitationConfig, build_dataset, train_policy
 from .neural import NeuralSnakeAI
+from .players import AStarAI, RandomAI, SafeGreedyAI, create_ai
+from .policy_table import PolicyTable, PolicyTableAI
+from .qtable import QTable
+from .quantize import QuantizedDQNAI, QuantizedDQNetwork
+from .selfplay import OpponentPool, SelfPlayArena, SelfPlayEnv
+from .sweep import SweepSpec, run_sweep
 
 __all__ = [
     "AdvancedSnakeAI",
     "GameAnalyzer",
+    "BoardAnalysis",
+    "analyze",
+    "QTable",
+    "LRUCache",
+    "DecisionCache",
     "GeneticSnakeAI",
     "Genome",
     "NeuralSnakeAI",
+    "FeatureStore",
     "DQNAI",
     "DQNetwork",
     "ReplayBuffer",
+    "DistributedConfig",
+    "SharedParameters",
+    "SharedReplayBuffer",
+    "train_distributed",
+    "ESConfig",
+    "train_es",
+    "QuantizedDQNAI",
+    "QuantizedDQNetwork",
+    "ExpectimaxAI",
+    "PolicyTable",
+    "PolicyTableAI",
+    "ImitationAI",
+    "ImitationConfig",
+    "build_dataset",
+    "train_policy",
+    "SweepSpec",
+    "run_sweep",
+    "CurriculumScheduler",
+    "Stage",
+    "SelfPlayArena",
+    "SelfPlayEnv",
+    "OpponentPool",
+    "create_ai",
+    "RandomAI",
+    "AStarAI",
+    "SafeGreedyAI",
 ]
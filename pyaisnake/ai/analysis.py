@@ -0,0 +1,221 @@
+"""
+Per-tick board analysis shared by every AI.
+
+Several players used to flood-fill, count free cells and probe safe moves on
+their own, several times per tick. BoardAnalysis computes these facts once on
+NumPy grids - occupancy, a BFS distance field from the head, the reachable area
+behind each candidate move, the distance to the tail and the choke cells whose
+removal splits the free space. analyze(game) caches the result on the game's
+tick counter, so every consumer within one tick reads the same object;
+analyze_board() does the same for callers that only hold coordinate lists,
+keyed on a board hash.
+
+Occupied cells follow the engine's collision rule: the whole snake, tail
+included, plus obstacles. wrap_around boards are analysed without wrapping.
+"""
+
+import weakref
+from collections.abc import Iterable
+from functools import cached_property
+
+import numpy as np
+
+from ..engine import Direction, SnakeGame
+from .cache import LRUCache, board_key
+
+DELTAS = {
+    Direction.UP: (0, -1),
+    Direction.DOWN: (0, 1),
+    Direction.LEFT: (-1, 0),
+    Direction.RIGHT: (1, 0),
+}
+
+_game_cache: "weakref.WeakKeyDictionary[SnakeGame, BoardAnalysis]" = weakref.WeakKeyDictionary()
+_board_cache = LRUCache(max_entries=256)
+
+
+class BoardAnalysis:
+    """Board facts for one snapshot of the field, computed lazily and once"""
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        snake: list[tuple[int, int]],
+        obstacles: Iterable[tuple[int, int]],
+        tick: int | None = None,
+    ):
+        self.width = width
+        self.height = height
+        self.head = snake[0]
+        self.tail = snake[-1]
+        self.tick = tick
+
+        self.blocked = np.zeros((height, width), dtype=bool)
+        cells = np.array([*snake, *obstacles], dtype=np.int64).reshape(-1, 2)
+        inside = (
+            (cells[:, 0] >= 0) & (cells[:, 0] < width) & (cells[:, 1] >= 0) & (cells[:, 1] < height)
+        )
+        self.blocked[cells[inside, 1], cells[inside, 0]] = True
+
+        # Component id per free cell, filled lazily by reachable_area
+        self._component = np.zeros((height, width), dtype=np.int32)
+        self._areas: list[int] = [0]
+
+    def in_bounds(self, pos: tuple[int, int]) -> bool:
+        return 0 <= pos[0] < self.width and 0 <= pos[1] < self.height
+
+    def is_free(self, pos: tuple[int, int]) -> bool:
+        return self.in_bounds(pos) and not self.blocked[pos[1], pos[0]]
+
+    def next_position(self, direction: Direction) -> tuple[int, int]:
+        dx, dy = DELTAS[direction]
+        return (self.head[0] + dx, self.head[1] + dy)
+
+    @cached_property
+    def free_cells(self) -> int:
+        return int(self.blocked.size - np.count_nonzero(self.blocked))
+
+    @cached_property
+    def safe_directions(self) -> list[Direction]:
+        """Moves that do not collide on this tick"""
+        return [d for d in DELTAS if self.is_free(self.next_position(d))]
+
+    def _flood(self, start: tuple[int, int]) -> np.ndarray:
+        """BFS distances from start through free cells (-1 where unreachable)"""
+        free = ~self.blocked
+        distance = np.full(self.blocked.shape, -1, dtype=np.int32)
+        frontier = np.zeros(self.blocked.shape, dtype=bool)
+        frontier[start[1], start[0]] = True
+        reached = frontier.copy()
+        distance[frontier] = 0
+
+        step = 0
+        while frontier.any():
+            step += 1
+            grown = np.zeros_like(frontier)
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            frontier = grown & free & ~reached
+            reached |= frontier
+            distance[frontier] = step
+        return distance
+
+    @cached_property
+    def head_distance(self) -> np.ndarray:
+        """(height, width) BFS step counts from the head, -1 if unreachable"""
+        return self._flood(self.head)
+
+    def reachable_area(self, direction: Direction) -> int:
+        """Free cells reachable after moving in direction (0 if the move collides)"""
+        pos = self.next_position(direction)
+        if not self.is_free(pos):
+            return 0
+
+        component = self._component[pos[1], pos[0]]
+        if component == 0:
+            reached = self._flood(pos) >= 0
+            component = len(self._areas)
+            self._component[reached] = component
+            self._areas.append(int(np.count_nonzero(reached)))
+        return self._areas[component]
+
+    @cached_property
+    def tail_distance(self) -> int | None:
+        """Moves needed for the head to reach the tail's cell, None if walled off"""
+        best = None
+        for dx, dy in DELTAS.values():
+            pos = (self.tail[0] + dx, self.tail[1] + dy)
+            if not self.in_bounds(pos):
+                continue
+            steps = self.head_distance[pos[1], pos[0]]
+            if steps >= 0 and (best is None or steps + 1 < best):
+                best = int(steps) + 1
+        return best
+
+    def _free_neighbours(self, pos: tuple[int, int]):
+        for dx, dy in DELTAS.values():
+            neighbour = (pos[0] + dx, pos[1] + dy)
+            if self.is_free(neighbour):
+                yield neighbour
+
+    @cached_property
+    def choke_cells(self) -> set[tuple[int, int]]:
+        """Free cells whose occupation would split their free region (articulation points)"""
+        discovered: dict[tuple[int, int], int] = {}
+        low: dict[tuple[int, int], int] = {}
+        result: set[tuple[int, int]] = set()
+        timer = 0
+
+        for y, x in zip(*np.nonzero(~self.blocked)):
+            root = (int(x), int(y))
+            if root in discovered:
+                continue
+
+            discovered[root] = low[root] = timer
+            timer += 1
+            root_children = 0
+            stack = [(root, None, self._free_neighbours(root))]
+
+            # Iterative Tarjan DFS; a 40x40 board would overflow recursion
+            while stack:
+                node, parent, neighbours = stack[-1]
+                for neighbour in neighbours:
+                    if neighbour not in discovered:
+                        discovered[neighbour] = low[neighbour] = timer
+                        timer += 1
+                        stack.append((neighbour, node, self._free_neighbours(neighbour)))
+                        break
+                    if neighbour != parent:
+                        low[node] = min(low[node], discovered[neighbour])
+                else:
+                    stack.pop()
+                    if parent is None:
+                        continue
+                    low[parent] = min(low[parent], low[node])
+                    if parent == root:
+                        root_children += 1
+                    elif low[node] >= discovered[parent]:
+                        result.add(parent)
+
+            if root_children > 1:
+                result.add(root)
+
+        return result
+
+
+def analyze(game: SnakeGame) -> BoardAnalysis:
+    """Analysis of the game's current tick, shared by every caller until it moves"""
+    analysis = _game_cache.get(game)
+    if analysis is None or analysis.tick != game.tick:
+        analysis = BoardAnalysis(
+            game.config.width,
+            game.config.height,
+            game.snake,
+            game.obstacles,
+            tick=game.tick,
+        )
+        _game_cache[game] = analysis
+    return analysis
+
+
+def analyze_board(
+    snake: list[tuple[int, int]],
+    obstacles: Iterable[tuple[int, int]],
+    width: int,
+    height: int,
+    cell_size: int = 1,
+) -> BoardAnalysis:
+    """Analysis of a board given as coordinate lists (pixels when cell_size > 1)"""
+    # Food does not change any board fact, so boards differing only in food share one entry
+    key = (board_key(snake, None, obstacles), width, height, cell_size)
+    analysis = _board_cache.get(key)
+    if analysis is None:
+        if cell_size != 1:
+            snake = [(x // cell_size, y // cell_size) for x, y in snake]
+            obstacles = [(x // cell_size, y // cell_size) for x, y in obstacles]
+        analysis = BoardAnalysis(width, height, snake, obstacles)
+        _board_cache.put(key, analysis)
+    return analysis
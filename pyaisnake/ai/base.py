@@ -1,19 +1,29 @@
 import heapq
 import math
 import random
+import sys
 import time
-from functools import lru_cache
+
+from .analysis import analyze_board
+from .cache import LRUCache, board_key
+from .qtable import QTable, pack_bits
 
 
 class AdvancedSnakeAI:
     """Продвинутый ИИ для игры Snake с различными алгоритмами"""
 
-    def __init__(self):
-        self.memory = {}  # Кэш для запоминания решений
+    DIRECTIONS = ["Up", "Down", "Left", "Right"]
+    # Биты ключа состояния: еда (2), опасность по 4 направлениям (4),
+    # ближайшее препятствие (1 + 2), длина змеи до 63 (6)
+    STATE_BITS = 15
+
+    def __init__(self, cache_size_limit=1000, cache_memory_limit=None):
         self.learning_rate = 0.1
+        self.q_table = QTable(1 << self.STATE_BITS, len(self.DIRECTIONS), self.learning_rate)
         self.exploration_rate = 0.2
-        self.path_cache = {}  # Кэш для путей
-        self.cache_size_limit = 1000
+        # LRU-кэш путей с ограничением по числу записей и (опционально) по памяти
+        self.path_cache = LRUCache(cache_size_limit, cache_memory_limit, sizeof=self._path_nbytes)
+        self.cache_size_limit = cache_size_limit
 
     def a_star_pathfinding_optimized(self, snake, food, obstacles, max_iterations=500):
         """Оптимизированный A* с приоритетной очередью и кэшированием"""
@@ -25,8 +35,9 @@ class AdvancedSnakeAI:
 
         # Проверяем кэш
         cache_key = self.create_cache_key(snake, food, obstacles)
-        if cache_key in self.path_cache:
-            return self.path_cache[cache_key]
+        cached = self.path_cache.get(cache_key, False)
+        if cached is not False:
+            return cached
 
         # Используем heapq для эффективной работы с приоритетной очередью
         open_set = [(0, start)]  # (f_score, position)
@@ -49,8 +60,7 @@ class AdvancedSnakeAI:
             if current == goal:
                 path = self.reconstruct_path(came_from, current)
                 # Сохраняем в кэш
-                self.path_cache[cache_key] = path
-                self.manage_cache_size()
+                self.path_cache.put(cache_key, path)
                 return path
 
             # Оптимизация: проверяем только валидные соседние позиции
@@ -73,29 +83,28 @@ class AdvancedSnakeAI:
                     heapq.heappush(open_set, (f_score[neighbor], neighbor))
 
         # Путь не найден
-        self.path_cache[cache_key] = None
-        self.manage_cache_size()
+        self.path_cache.put(cache_key, None)
         return None
 
     def create_cache_key(self, snake, food, obstacles):
         """Создание ключа для кэширования путей"""
-        head = snake[0]
-        # Упрощенный ключ для экономии памяти
-        return f"{head}_{food}_{len(obstacles)}"
-
-    def manage_cache_size(self):
-        """Управление размером кэша"""
-        if len(self.path_cache) > self.cache_size_limit:
-            # Удаляем старые записи
-            old_keys = list(self.path_cache.keys())[:self.cache_size_limit // 2]
-            for key in old_keys:
-                del self.path_cache[key]
-
-    # pylint: disable=no-self-argument
+        # Путь зависит от всего тела змеи, а не только от головы
+        return board_key(snake, food, obstacles)
+
+    @staticmethod
+    def _path_nbytes(path):
+        """Приблизительный размер пути в памяти"""
+        if path is None:
+            return sys.getsizeof(None)
+        return sys.getsizeof(path) + sum(sys.getsizeof(pos) for pos in path)
+
+    def cache_stats(self):
+        """Счётчики попаданий, промахов и вытеснений кэша путей"""
+        return self.path_cache.stats()
+
     @staticmethod
-    @lru_cache(maxsize=1000)
     def cached_heuristic(pos1, pos2):
-        """Кэшированная эвристическая функция"""
+        """Манхэттенское расстояние (дешевле, чем кэш по паре позиций)"""
         return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
 
     def a_star_pathfinding(self, snake, food, obstacles, max_iterations=1000):
@@ -215,9 +224,7 @@ class AdvancedSnakeAI:
 
     def calculate_free_space(self, snake, obstacles):
         """Подсчет свободного пространства"""
-        total_cells = (400 // 10) * (400 // 10)  # Общее количество клеток
-        occupied = len(snake) + len(obstacles)
-        return total_cells - occupied
+        return self.analyze_board(snake, obstacles).free_cells
 
     def adaptive_difficulty_analysis(self, snake, food, obstacles, score):
         """Адаптивный анализ сложности с учетом счета"""
@@ -250,49 +257,57 @@ class AdvancedSnakeAI:
 
     def get_safe_directions(self, snake, food, obstacles):
         """Получить безопасные направления движения"""
-        head = snake[0]
-        safe_dirs = []
+        return [d.value for d in self.analyze_board(snake, obstacles).safe_directions]
 
-        for direction in ["Up", "Down", "Left", "Right"]:
-            next_pos = self.get_next_position(head, direction)
-            if self.is_valid_position(next_pos, snake, obstacles):
-                safe_dirs.append(direction)
-
-        return safe_dirs
+    def analyze_board(self, snake, obstacles):
+        """Общий анализ поля 400×400 с клеткой 10, кэшируемый по хэшу доски"""
+        return analyze_board(list(snake), obstacles, 40, 40, cell_size=10)
 
     def reinforcement_learning_decision(self, snake, food, obstacles, state_key):
         """Принятие решения на основе простого обучения с подкреплением"""
-        if state_key not in self.memory:
-            self.memory[state_key] = {'Up': 0, 'Down': 0, 'Left': 0, 'Right': 0}
+        safe_dirs = self.get_safe_directions(snake, food, obstacles)
+        if not safe_dirs:
+            return None
 
         # Выбор действия (exploration vs exploitation)
         if random.random() < self.exploration_rate:
             # Исследование - случайный выбор
-            safe_dirs = self.get_safe_directions(snake, food, obstacles)
-            if safe_dirs:
-                return random.choice(safe_dirs)
-        else:
-            # Эксплуатация - выбор лучшего действия
-            safe_dirs = self.get_safe_directions(snake, food, obstacles)
-            if safe_dirs:
-                best_action = max(safe_dirs, key=lambda d: self.memory[state_key][d])
-                return best_action
+            return random.choice(safe_dirs)
 
-        return None
+        # Эксплуатация - выбор лучшего действия одним индексом в таблице
+        allowed = [self.DIRECTIONS.index(d) for d in safe_dirs]
+        return self.DIRECTIONS[self.q_table.best_action(state_key, allowed)]
 
     def update_memory(self, state_key, action, reward):
         """Обновление памяти на основе полученной награды"""
-        if state_key in self.memory and action in self.memory[state_key]:
-            current_value = self.memory[state_key][action]
-            self.memory[state_key][action] = current_value + self.learning_rate * (reward - current_value)
+        if action in self.DIRECTIONS:
+            self.q_table.update([state_key], [self.DIRECTIONS.index(action)], [reward])
+
+    def learn_episode(self, state_keys, actions, rewards, discount=0.9):
+        """Пакетное обновление по траектории эпизода (дисконтированные возвраты)"""
+        action_indices = [self.DIRECTIONS.index(action) for action in actions]
+        self.q_table.update_episode(state_keys, action_indices, rewards, discount)
 
     def create_state_key(self, snake, food, obstacles):
-        """Создание ключа состояния для обучения"""
+        """Создание целочисленного ключа состояния для обучения"""
         head = snake[0]
-        food_direction = self.get_relative_direction(head, food)
-        obstacle_directions = [self.get_relative_direction(head, obs) for obs in obstacles[:3]]
+        food_direction = self.DIRECTIONS.index(self.get_relative_direction(head, food))
+        fields = [(food_direction, 2)]
+
+        for direction in self.DIRECTIONS:
+            next_pos = self.get_next_position(head, direction)
+            fields.append((not self.is_valid_position(next_pos, snake, obstacles), 1))
+
+        # Препятствия могут быть множеством, поэтому берём ближайшее, а не первые
+        nearest = min(obstacles, key=lambda obs: self.heuristic(head, obs), default=None)
+        if nearest is None:
+            fields.extend([(0, 1), (0, 2)])
+        else:
+            obstacle_direction = self.DIRECTIONS.index(self.get_relative_direction(head, nearest))
+            fields.extend([(1, 1), (obstacle_direction, 2)])
 
-        return f"{food_direction}_{'_'.join(obstacle_directions)}_{len(snake)}"
+        fields.append((min(len(snake), 63), 6))
+        return pack_bits(fields)
 
     def get_relative_direction(self, from_pos, to_pos):
         """Получить относительное направление между двумя точками"""
@@ -0,0 +1,96 @@
+"""
+Bounded LRU cache with hit/miss/eviction counters.
+
+Entries live in an OrderedDict, so a hit is a move_to_end and an eviction is a
+popitem from the front - both O(1), with no periodic rebuild of the key list.
+The cache is bounded by entry count and optionally by an approximate byte
+budget computed with a caller-supplied sizeof.
+"""
+
+import sys
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+_MISSING = object()
+
+
+def board_key(snake: Iterable, food, obstacles: Iterable) -> tuple:
+    """
+    Key of everything a path search depends on: ordered snake, food and obstacles.
+
+    The board itself is the key rather than its hash(), so two boards whose hashes
+    collide never share a cache entry.
+    """
+    return (tuple(snake), food, frozenset(obstacles))
+
+
+class LRUCache:
+    """Least-recently-used mapping with size limits and usage counters"""
+
+    def __init__(
+        self,
+        max_entries: int = 1000,
+        max_bytes: int | None = None,
+        sizeof: Callable[[Any], int] = sys.getsizeof,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self._data: OrderedDict[Hashable, tuple[Any, int]] = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._data
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        size = self.sizeof(value) if self.max_bytes is not None else 0
+        old = self._data.pop(key, None)
+        if old is not None:
+            self.nbytes -= old[1]
+
+        self._data[key] = (value, size)
+        self.nbytes += size
+        self._evict()
+
+    def _evict(self) -> None:
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self.nbytes > self.max_bytes and len(self._data) > 1
+        ):
+            _, (_, size) = self._data.popitem(last=False)
+            self.nbytes -= size
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.nbytes = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._data),
+            "bytes": self.nbytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hit_rate,
+        }
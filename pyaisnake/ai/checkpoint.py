@@ -0,0 +1,228 @@
+"""
+Asynchronous, versioned checkpoints for AI models.
+
+Snapshots are plain NumPy ``.npz`` archives written on a background thread. Each
+file is written under a temporary name and moved into place with an atomic rename,
+so a job killed mid-write never leaves a truncated checkpoint behind. The manager
+keeps the last N versions plus the best-scoring one and can memory-map weights
+back without reading them into RAM.
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+META_KEY = "__meta__"
+
+
+def load_npz(path: str | Path, mmap: bool = False) -> tuple[dict[str, np.ndarray], dict]:
+    """
+    Load arrays and metadata from a checkpoint archive.
+
+    With mmap=True the arrays are read-only np.memmap views into the file, which
+    works because np.savez stores members uncompressed.
+    """
+    path = Path(path)
+    arrays: dict[str, np.ndarray] = {}
+    metadata: dict = {}
+
+    if not mmap:
+        with np.load(path, allow_pickle=False) as data:
+            for key in data.files:
+                if key == META_KEY:
+                    metadata = json.loads(str(data[key]))
+                else:
+                    arrays[key] = data[key]
+        return arrays, metadata
+
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as raw:
+        for info in archive.infolist():
+            key = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if key == META_KEY or info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    value = np.lib.format.read_array(member, allow_pickle=False)
+                if key == META_KEY:
+                    metadata = json.loads(str(value))
+                else:
+                    arrays[key] = value
+                continue
+
+            # Skip the local file header to reach the raw .npy bytes
+            raw.seek(info.header_offset)
+            header = raw.read(30)
+            name_len, extra_len = struct.unpack("<HH", header[26:30])
+            raw.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(raw)
+            if version == (1, 0):
+                shape, fortran, dtype = np.lib.format.read_array_header_1_0(raw)
+            else:
+                shape, fortran, dtype = np.lib.format.read_array_header_2_0(raw)
+
+            arrays[key] = np.memmap(
+                path,
+                dtype=dtype,
+                mode="r",
+                offset=raw.tell(),
+                shape=shape,
+                order="F" if fortran else "C",
+            )
+
+    return arrays, metadata
+
+
+class CheckpointManager:
+    """Versioned .npz checkpoints written on a background thread"""
+
+    def __init__(self, directory: str | Path, prefix: str = "model", keep_last: int = 3):
+        self.directory = Path(directory)
+        self.prefix = prefix
+        self.keep_last = keep_last
+
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._error: BaseException | None = None
+
+        index = self._read_index()
+        self._versions: list[int] = index.get("versions", [])
+        self._best: dict | None = index.get("best")
+        self._next_version = max(self._versions, default=0) + 1
+
+    @property
+    def index_path(self) -> Path:
+        return self.directory / f"{self.prefix}-index.json"
+
+    def path_for(self, version: int) -> Path:
+        return self.directory / f"{self.prefix}-{version:06d}.npz"
+
+    def save(
+        self,
+        arrays: dict[str, np.ndarray],
+        metadata: dict | None = None,
+        score: float | None = None,
+    ) -> int:
+        """
+        Snapshot arrays and queue them for writing.
+
+        Arrays are copied immediately, so training may keep mutating its weights.
+        Returns the version number assigned to the checkpoint.
+        """
+        if self._error is not None:
+            raise RuntimeError("Checkpoint writer failed") from self._error
+
+        snapshot = {key: np.array(value, copy=True) for key, value in arrays.items()}
+        with self._lock:
+            version = self._next_version
+            self._next_version += 1
+
+        self._ensure_thread()
+        self._queue.put((version, snapshot, dict(metadata or {}), score))
+        return version
+
+    def flush(self) -> None:
+        """Block until every queued checkpoint is on disk"""
+        self._queue.join()
+        if self._error is not None:
+            raise RuntimeError("Checkpoint writer failed") from self._error
+
+    def close(self) -> None:
+        """Flush pending checkpoints and stop the writer thread"""
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def versions(self) -> list[int]:
+        """Versions currently retained on disk, oldest first"""
+        with self._lock:
+            return list(self._versions)
+
+    def latest(self) -> Path | None:
+        """Path of the newest retained checkpoint"""
+        versions = self.versions()
+        return self.path_for(versions[-1]) if versions else None
+
+    def best(self) -> Path | None:
+        """Path of the best-scoring checkpoint"""
+        with self._lock:
+            best = self._best
+        return self.path_for(best["version"]) if best else None
+
+    def load(
+        self, path: str | Path | None = None, mmap: bool = False
+    ) -> tuple[dict[str, np.ndarray], dict] | None:
+        """Load a checkpoint (the latest one by default) for resuming"""
+        if path is None:
+            path = self.latest()
+        if path is None or not Path(path).exists():
+            return None
+        return load_npz(path, mmap=mmap)
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._writer_loop, name=f"checkpoint-{self.prefix}", daemon=True
+            )
+            self._thread.start()
+
+    def _writer_loop(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                self._write(*item)
+            except BaseException as e:  # surfaced on the next save/flush
+                self._error = e
+            finally:
+                self._queue.task_done()
+
+    def _write(self, version: int, arrays: dict, metadata: dict, score: float | None) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+        metadata = {**metadata, "version": version, "score": score}
+        path = self.path_for(version)
+        self._atomic_write(
+            path,
+            lambda f: np.savez(f, **arrays, **{META_KEY: np.array(json.dumps(metadata))}),
+        )
+
+        with self._lock:
+            self._versions.append(version)
+            if score is not None and (self._best is None or score > self._best["score"]):
+                self._best = {"version": version, "score": score}
+
+            best_version = self._best["version"] if self._best else None
+            stale = [v for v in self._versions[: -self.keep_last or None] if v != best_version]
+            self._versions = [v for v in self._versions if v not in stale]
+            index = {"versions": list(self._versions), "best": self._best}
+
+        self._atomic_write(self.index_path, lambda f: f.write(json.dumps(index).encode()))
+
+        for old in stale:
+            self.path_for(old).unlink(missing_ok=True)
+
+    @staticmethod
+    def _atomic_write(path: Path, write) -> None:
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "wb") as f:
+            write(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _read_index(self) -> dict:
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
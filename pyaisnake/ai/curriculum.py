@@ -0,0 +1,160 @@
+"""
+Curriculum training across board sizes, difficulties and modes.
+
+A curriculum is a list of stages, each a board (size, DIFFICULTY_CONFIG
+preset, game mode, step cap) and a promotion threshold: once the mean score
+of the last `window` episodes reaches `promote_score`, training moves on to
+the next stage. `max_episodes` optionally promotes a stage that never gets
+there. Small, empty boards end episodes quickly and put food within a few
+moves, so early learning costs few simulation steps; later stages only have
+to adapt the policy.
+
+The DQN observation (dangers, heading, food direction) does not depend on
+the board size, so one network carries over from stage to stage.
+
+Games are cached per board configuration and reset between episodes instead
+of being rebuilt, and a configuration that appears in several stages keeps
+its game.
+"""
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+
+from ..engine import Difficulty, GameConfig, GameMode, SnakeGame
+
+
+@dataclass(frozen=True)
+class Stage:
+    """One board configuration and the score needed to leave it"""
+
+    width: int
+    height: int
+    difficulty: Difficulty = Difficulty.EASY
+    game_mode: GameMode = GameMode.CLASSIC
+    max_steps: int = 1000
+    promote_score: float = 5.0
+    window: int = 20
+    max_episodes: int | None = None
+
+    @property
+    def board(self) -> tuple[int, int, Difficulty, GameMode]:
+        return (self.width, self.height, self.difficulty, self.game_mode)
+
+    def game_config(self) -> GameConfig:
+        return GameConfig(
+            width=self.width,
+            height=self.height,
+            speed_ms=0,
+            difficulty=self.difficulty,
+            game_mode=self.game_mode,
+        )
+
+    def describe(self) -> str:
+        return (
+            f"{self.width}x{self.height} {self.difficulty.value} {self.game_mode.value}, "
+            f"promote at {self.promote_score:g}"
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Stage":
+        data = dict(data)
+        if "difficulty" in data:
+            data["difficulty"] = Difficulty(data["difficulty"])
+        if "game_mode" in data:
+            data["game_mode"] = GameMode(data["game_mode"])
+        return cls(**data)
+
+
+# Thresholds suit the NumPy DQN, which learns slowly; the episode caps make
+# sure a run always reaches the 20x20 boards
+DEFAULT_CURRICULUM = [
+    Stage(8, 8, Difficulty.EASY, max_steps=200, promote_score=1.5, max_episodes=300),
+    Stage(12, 12, Difficulty.EASY, max_steps=400, promote_score=2, max_episodes=300),
+    Stage(16, 16, Difficulty.NORMAL, max_steps=700, promote_score=2.5, max_episodes=400),
+    Stage(20, 20, Difficulty.NORMAL, max_steps=1000, promote_score=3, max_episodes=500),
+    Stage(20, 20, Difficulty.HARD, max_steps=1000, promote_score=3),
+]
+
+
+def load_curriculum(path: str | Path) -> list[Stage]:
+    """Stages from a JSON list of Stage fields; enums are given by value"""
+    with open(path, encoding="utf-8") as f:
+        stages = [Stage.from_dict(item) for item in json.load(f)]
+    if not stages:
+        raise ValueError(f"{path} defines no stages")
+    return stages
+
+
+class EnvironmentCache:
+    """One game per board configuration, reset for every episode"""
+
+    def __init__(self):
+        self._games: dict[tuple, SnakeGame] = {}
+        self.created = 0
+        self.reused = 0
+
+    def get(self, stage: Stage) -> SnakeGame:
+        game = self._games.get(stage.board)
+        if game is None:
+            game = self._games[stage.board] = SnakeGame(stage.game_config())
+            self.created += 1
+        else:
+            game.reset()
+            self.reused += 1
+        return game
+
+    def __len__(self) -> int:
+        return len(self._games)
+
+
+class CurriculumScheduler:
+    """Tracks the current stage and promotes once its threshold is met"""
+
+    def __init__(self, stages: list[Stage], start: int = 0, envs: EnvironmentCache | None = None):
+        if not stages:
+            raise ValueError("Curriculum has no stages")
+        self.stages = stages
+        self.stage_index = min(start, len(stages))
+        self.envs = envs or EnvironmentCache()
+        self.scores: list[int] = []
+        self.episodes = 0  # in the current stage
+        self.total_steps = 0
+        # (stage index, episodes, steps) of every finished stage
+        self.history: list[tuple[int, int, int]] = []
+        self._stage_steps = 0
+
+    @property
+    def finished(self) -> bool:
+        return self.stage_index >= len(self.stages)
+
+    @property
+    def stage(self) -> Stage:
+        return self.stages[self.stage_index]
+
+    def next_game(self) -> SnakeGame:
+        return self.envs.get(self.stage)
+
+    def recent_mean(self) -> float:
+        recent = self.scores[-self.stage.window :]
+        return sum(recent) / len(recent) if recent else 0.0
+
+    def record(self, score: int, steps: int) -> bool:
+        """Log a finished episode of the current stage; True if it promoted"""
+        stage = self.stage
+        self.scores.append(score)
+        self.episodes += 1
+        self._stage_steps += steps
+        self.total_steps += steps
+
+        passed = len(self.scores) >= stage.window and self.recent_mean() >= stage.promote_score
+        exhausted = stage.max_episodes is not None and self.episodes >= stage.max_episodes
+        if not (passed or exhausted):
+            return False
+
+        self.history.append((self.stage_index, self.episodes, self._stage_steps))
+        self.stage_index += 1
+        self.scores = []
+        self.episodes = 0
+        self._stage_steps = 0
+        return True
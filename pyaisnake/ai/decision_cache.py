@@ -0,0 +1,87 @@
+"""
+Memoized play decisions for observation-based players.
+
+A player whose greedy move is a pure function of a small observation vector
+recomputes the same forward pass every time it sees a familiar situation. The
+DQN state has 11 binary features, so at most 2**11 distinct decisions exist
+and the whole policy fits in the cache. DecisionCache sits between the game
+loop and such a player: it packs the observation into a key, looks the
+greedy move up in an LRUCache and only sends misses to the model, batched
+when several games ask at once. Entries are dropped whenever the player's
+model_version changes.
+
+Players opt in by providing observe(game), decide_batch(observations),
+model_version, epsilon and a cacheable flag (False while training, when every
+move also feeds the learner). Exploration is applied on top of the cached
+greedy move, as DQNAI.get_directions does.
+"""
+
+from collections.abc import Hashable
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from .cache import LRUCache
+
+if TYPE_CHECKING:
+    from ..engine import Direction, SnakeGame
+
+
+def observation_key(observation: np.ndarray) -> Hashable:
+    """One bit per feature when every feature is 0 or 1, the raw bytes otherwise"""
+    if np.all((observation == 0) | (observation == 1)):
+        return (observation.size, np.packbits(observation.astype(bool)).tobytes())
+    return observation.tobytes()
+
+
+class DecisionCache:
+    """LRU memo of a player's greedy moves keyed on its packed observation"""
+
+    def __init__(self, ai: Any, max_entries: int = 4096, cache: LRUCache | None = None):
+        # Pass cache to share entries between players of the same model
+        self.ai = ai
+        self.cache = cache if cache is not None else LRUCache(max_entries=max_entries)
+        self._version = ai.model_version
+
+    @property
+    def game(self) -> "SnakeGame":
+        return self.ai.game
+
+    def get_direction(self, deadline: float | None = None) -> "Direction | None":
+        if not self.ai.cacheable:
+            return self.ai.get_direction(deadline)
+        return self.get_directions([self.ai.game])[0]
+
+    def get_directions(self, games: "list[SnakeGame]") -> "list[Direction]":
+        if not self.ai.cacheable:
+            return self.ai.get_directions(games)
+
+        if self.ai.model_version != self._version:
+            self.cache.clear()
+            self._version = self.ai.model_version
+
+        observations = [self.ai.observe(game) for game in games]
+        keys = [observation_key(observation) for observation in observations]
+        directions = [self.cache.get(key) for key in keys]
+
+        # Games that share an unseen observation need one decision between them
+        missing: dict[Hashable, list[int]] = {}
+        for i, direction in enumerate(directions):
+            if direction is None:
+                missing.setdefault(keys[i], []).append(i)
+        if missing:
+            first = [indices[0] for indices in missing.values()]
+            decided = self.ai.decide_batch(np.stack([observations[i] for i in first]))
+            for (key, indices), direction in zip(missing.items(), decided):
+                self.cache.put(key, direction)
+                for i in indices:
+                    directions[i] = direction
+
+        if self.ai.epsilon > 0:
+            explore = np.random.random(len(games)) < self.ai.epsilon
+            for i in np.flatnonzero(explore):
+                directions[i] = self.ai.random_direction()
+        return directions
+
+    def stats(self) -> dict:
+        return self.cache.stats()
@@ -0,0 +1,420 @@
+"""
+Distributed actor-learner training for the DQN AI.
+
+Several actor processes play their own games with a periodically refreshed copy of
+``policy_net`` and write transitions straight into a replay buffer that lives in
+``multiprocessing.shared_memory``. A single learner (the calling process) samples
+from that buffer, trains the network and broadcasts new weights through a shared
+parameter block. Transitions never travel through pipes; only episode scores do.
+"""
+
+import multiprocessing as mp
+import queue
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .dqn import DQNAI, DQNetwork
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block; the creating process stays responsible for unlinking"""
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # type: ignore[call-arg]
+    except TypeError:
+        # Python < 3.13: actors share the parent's resource tracker, so the extra
+        # registration is harmless and is cleared when the owner unlinks the block.
+        return shared_memory.SharedMemory(name=name)
+
+
+class SharedReplayBuffer:
+    """Ring buffer of transitions stored column-wise in one shared memory block"""
+
+    HEADER_SIZE = 2  # position, size
+
+    def __init__(
+        self,
+        capacity: int,
+        state_size: int,
+        name: str | None = None,
+        lock=None,
+    ):
+        self.capacity = capacity
+        self.state_size = state_size
+        self.lock = lock if lock is not None else mp.Lock()
+
+        layout = self._layout(capacity, state_size)
+        total = layout[-1][1] + layout[-1][3]
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=total)
+            self._owner = True
+        else:
+            self._shm = _attach_shared_memory(name)
+            self._owner = False
+
+        views = {
+            key: np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=offset)
+            for key, offset, shape, _nbytes, dtype in layout
+        }
+        self._header = views["header"]
+        self.states = views["states"]
+        self.actions = views["actions"]
+        self.rewards = views["rewards"]
+        self.next_states = views["next_states"]
+        self.dones = views["dones"]
+
+        if self._owner:
+            self._header[:] = 0
+
+    @staticmethod
+    def _layout(capacity: int, state_size: int) -> list[tuple]:
+        """(name, offset, shape, nbytes, dtype) for each column, 8-byte aligned"""
+        columns = [
+            ("header", (SharedReplayBuffer.HEADER_SIZE,), np.int64),
+            ("states", (capacity, state_size), np.float32),
+            ("actions", (capacity,), np.int64),
+            ("rewards", (capacity,), np.float32),
+            ("next_states", (capacity, state_size), np.float32),
+            ("dones", (capacity,), np.float32),
+        ]
+        layout = []
+        offset = 0
+        for key, shape, dtype in columns:
+            nbytes = int(np.prod(shape)) * np.dtype(dtype).itemsize
+            layout.append((key, offset, shape, nbytes, dtype))
+            offset += (nbytes + 7) // 8 * 8
+        return layout
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def spec(self) -> tuple[str, int, int]:
+        """Arguments needed to attach to this buffer from another process"""
+        return (self.name, self.capacity, self.state_size)
+
+    def push_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray,
+    ) -> None:
+        """Write a block of transitions, wrapping around when the buffer is full"""
+        count = len(states)
+        with self.lock:
+            position = int(self._header[0])
+            indices = (position + np.arange(count)) % self.capacity
+            self.states[indices] = states
+            self.actions[indices] = actions
+            self.rewards[indices] = rewards
+            self.next_states[indices] = next_states
+            self.dones[indices] = dones
+            self._header[0] = (position + count) % self.capacity
+            self._header[1] = min(self.capacity, int(self._header[1]) + count)
+
+    def sample(
+        self, batch_size: int, rng: np.random.Generator
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Uniformly sample a batch of transitions as arrays"""
+        # Under the writers' lock, so no row mixes columns of two transitions;
+        # fancy indexing copies, so the batch is safe to use after release
+        with self.lock:
+            size = len(self)
+            indices = rng.integers(0, size, size=min(batch_size, size))
+            return (
+                self.states[indices],
+                self.actions[indices],
+                self.rewards[indices],
+                self.next_states[indices],
+                self.dones[indices],
+            )
+
+    def __len__(self) -> int:
+        return int(self._header[1])
+
+    def close(self) -> None:
+        # Views must be dropped before the mapping can be closed
+        del self._header, self.states, self.actions, self.rewards, self.next_states, self.dones
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class SharedParameters:
+    """Flat DQNetwork weights plus a version counter in shared memory"""
+
+    def __init__(self, num_parameters: int, name: str | None = None, lock=None):
+        self.num_parameters = num_parameters
+        self.lock = lock if lock is not None else mp.Lock()
+
+        size = (num_parameters + 1) * 8
+        if name is None:
+            self._shm = shared_memory.SharedMemory(create=True, size=size)
+            self._owner = True
+        else:
+            self._shm = _attach_shared_memory(name)
+            self._owner = False
+
+        self._version = np.ndarray((1,), dtype=np.int64, buffer=self._shm.buf)
+        self._params = np.ndarray(
+            (num_parameters,), dtype=np.float64, buffer=self._shm.buf, offset=8
+        )
+        if self._owner:
+            self._version[0] = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def version(self) -> int:
+        return int(self._version[0])
+
+    def spec(self) -> tuple[str, int]:
+        return (self.name, self.num_parameters)
+
+    def publish(self, net: DQNetwork) -> int:
+        """Write new weights and bump the version"""
+        with self.lock:
+            net.get_flat(out=self._params)
+            self._version[0] += 1
+            return int(self._version[0])
+
+    def refresh(self, net: DQNetwork, known_version: int) -> int:
+        """Copy weights into net if a newer version was published"""
+        if self.version == known_version:
+            return known_version
+        with self.lock:
+            net.set_flat(self._params)
+            return int(self._version[0])
+
+    def close(self) -> None:
+        del self._version, self._params
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+@dataclass
+class DistributedConfig:
+    """Settings for an actor-learner run"""
+
+    num_actors: int = 4
+    episodes: int = 1000
+    width: int = 20
+    height: int = 20
+    max_steps: int = 1000
+    buffer_capacity: int = 200_000
+    batch_size: int = 64
+    warmup: int = 1000
+    refresh_interval: int = 200  # actor steps between weight refreshes
+    publish_interval: int = 50  # learner updates between weight broadcasts
+    flush_size: int = 64  # transitions an actor buffers locally before writing
+    base_epsilon: float = 0.4
+    epsilon_alpha: float = 7.0
+    seed: int = 0
+
+
+def actor_epsilon(actor_id: int, num_actors: int, base: float = 0.4, alpha: float = 7.0) -> float:
+    """Fixed per-actor exploration rate, spread geometrically across actors"""
+    if num_actors <= 1:
+        return base
+    return base ** (1 + alpha * actor_id / (num_actors - 1))
+
+
+def _actor_loop(
+    actor_id: int,
+    config: DistributedConfig,
+    replay_spec: tuple[str, int, int],
+    replay_lock,
+    params_spec: tuple[str, int],
+    params_lock,
+    stop_event,
+    results,
+) -> None:
+    """Play games forever, feeding the shared replay buffer, until told to stop"""
+    from ..engine import Direction, GameConfig, GameState, SnakeGame
+
+    seed = config.seed + actor_id
+    random.seed(seed)
+    rng = np.random.default_rng(seed)
+
+    replay = SharedReplayBuffer(*replay_spec[1:], name=replay_spec[0], lock=replay_lock)
+    params = SharedParameters(params_spec[1], name=params_spec[0], lock=params_lock)
+
+    game_config = GameConfig(width=config.width, height=config.height, speed_ms=0)
+    ai = DQNAI(SnakeGame(game_config))
+    epsilon = actor_epsilon(actor_id, config.num_actors, config.base_epsilon, config.epsilon_alpha)
+    version = params.refresh(ai.policy_net, -1)
+
+    state_size = DQNAI.STATE_SIZE
+    states = np.empty((config.flush_size, state_size), dtype=np.float32)
+    actions = np.empty(config.flush_size, dtype=np.int64)
+    rewards = np.empty(config.flush_size, dtype=np.float32)
+    next_states = np.empty((config.flush_size, state_size), dtype=np.float32)
+    dones = np.empty(config.flush_size, dtype=np.float32)
+    pending = 0
+    total_steps = 0
+
+    try:
+        while not stop_event.is_set():
+            game = SnakeGame(game_config)
+            ai.game = game
+            steps = 0
+            state = ai.get_state()
+
+            while not stop_event.is_set():
+                if rng.random() < epsilon:
+                    action = int(rng.integers(0, DQNAI.ACTION_SIZE))
+                else:
+                    action = ai.policy_net.predict(state)
+
+                food_before = game.stats.food_eaten
+                game.set_direction(getattr(Direction, DQNAI.ACTIONS[action]))
+                game.update()
+                steps += 1
+                total_steps += 1
+
+                ai._last_state = state
+                if game.stats.food_eaten > food_before:
+                    reward = 10.0
+                else:
+                    reward = ai._calculate_reward()
+                next_state = ai.get_state()
+                done = game.state != GameState.RUNNING or steps >= config.max_steps
+
+                states[pending] = state
+                actions[pending] = action
+                rewards[pending] = reward
+                next_states[pending] = next_state
+                dones[pending] = 1.0 if game.state == GameState.GAME_OVER else 0.0
+                pending += 1
+                if pending == config.flush_size:
+                    replay.push_batch(states, actions, rewards, next_states, dones)
+                    pending = 0
+
+                if total_steps % config.refresh_interval == 0:
+                    version = params.refresh(ai.policy_net, version)
+
+                if done:
+                    break
+                state = next_state
+
+            if steps:
+                results.put((actor_id, game.stats.score, steps))
+    finally:
+        if pending:
+            replay.push_batch(
+                states[:pending],
+                actions[:pending],
+                rewards[:pending],
+                next_states[:pending],
+                dones[:pending],
+            )
+        replay.close()
+        params.close()
+
+
+def train_distributed(
+    ai: DQNAI,
+    config: DistributedConfig,
+    on_episode: Callable[[int, int, int], None] | None = None,
+) -> dict:
+    """
+    Train ai.policy_net with config.num_actors actor processes.
+
+    The calling process acts as the learner. on_episode(episode, actor_id, score) is
+    invoked for every finished actor game. Returns summary statistics.
+    """
+    ctx = mp.get_context()
+    rng = np.random.default_rng(config.seed)
+
+    replay = SharedReplayBuffer(config.buffer_capacity, DQNAI.STATE_SIZE, lock=ctx.Lock())
+    params = SharedParameters(ai.policy_net.num_parameters(), lock=ctx.Lock())
+    params.publish(ai.policy_net)
+
+    stop_event = ctx.Event()
+    results = ctx.Queue()
+    actors = [
+        ctx.Process(
+            target=_actor_loop,
+            args=(
+                actor_id,
+                config,
+                replay.spec(),
+                replay.lock,
+                params.spec(),
+                params.lock,
+                stop_event,
+                results,
+            ),
+            daemon=True,
+        )
+        for actor_id in range(config.num_actors)
+    ]
+
+    scores: list[int] = []
+    env_steps = 0
+    updates = 0
+    start = time.time()
+
+    try:
+        for actor in actors:
+            actor.start()
+
+        while len(scores) < config.episodes:
+            received = 0
+            while True:
+                try:
+                    actor_id, score, steps = results.get_nowait()
+                except queue.Empty:
+                    break
+                received += 1
+                scores.append(score)
+                env_steps += steps
+                if on_episode:
+                    on_episode(len(scores), actor_id, score)
+
+            # Without live actors no more episodes arrive and the loop would never end
+            if not received and not any(actor.is_alive() for actor in actors):
+                raise RuntimeError(
+                    f"All DQN actors exited after {len(scores)} of {config.episodes} episodes"
+                )
+
+            if len(replay) < max(config.warmup, config.batch_size):
+                time.sleep(0.01)
+                continue
+
+            ai.trainer.train_batch(*replay.sample(config.batch_size, rng))
+            updates += 1
+            if updates % config.publish_interval == 0:
+                params.publish(ai.policy_net)
+    finally:
+        stop_event.set()
+        for actor in actors:
+            actor.join(timeout=5)
+            if actor.is_alive():
+                actor.terminate()
+        results.close()
+        replay.close()
+        params.close()
+
+    ai.target_net.copy_from(ai.policy_net)
+    ai._total_steps += env_steps
+    ai.model_version += 1
+    elapsed = time.time() - start
+
+    return {
+        "episodes": len(scores),
+        "env_steps": env_steps,
+        "updates": updates,
+        "best_score": max(scores) if scores else 0,
+        "avg_score": sum(scores) / len(scores) if scores else 0.0,
+        "steps_per_second": env_steps / elapsed if elapsed > 0 else 0.0,
+    }
@@ -14,6 +14,7 @@ import numpy as np
 
 if TYPE_CHECKING:
     from ..engine import Direction, SnakeGame
+    from .inference import DQNInferenceEngine
 
 
 @dataclass
@@ -52,6 +53,8 @@ class ReplayBuffer:
 class DQNetwork:
     """Simple neural network for DQN"""
 
+    PARAM_NAMES = ("w1", "b1", "w2", "b2", "w3", "b3")
+
     def __init__(self, input_size: int, hidden_size: int, output_size: int):
         self.w1 = np.random.randn(input_size, hidden_size) * 0.1
         self.b1 = np.zeros(hidden_size)
@@ -80,6 +83,29 @@ class DQNetwork:
         self.w3 = other.w3.copy()
         self.b3 = other.b3.copy()
 
+    def num_parameters(self) -> int:
+        """Total number of weights and biases"""
+        return sum(getattr(self, name).size for name in self.PARAM_NAMES)
+
+    def get_flat(self, out: np.ndarray | None = None) -> np.ndarray:
+        """Copy all parameters into a single flat vector"""
+        if out is None:
+            out = np.empty(self.num_parameters())
+        offset = 0
+        for name in self.PARAM_NAMES:
+            param = getattr(self, name)
+            out[offset : offset + param.size] = param.ravel()
+            offset += param.size
+        return out
+
+    def set_flat(self, flat: np.ndarray) -> None:
+        """Load all parameters from a flat vector produced by get_flat"""
+        offset = 0
+        for name in self.PARAM_NAMES:
+            param = getattr(self, name)
+            param[...] = flat[offset : offset + param.size].reshape(param.shape)
+            offset += param.size
+
 
 class DQNTrainer:
     """Trainer for DQN"""
@@ -104,16 +130,23 @@ class DQNTrainer:
         rewards = np.array([e.reward for e in batch])
         next_states = np.array([e.next_state for e in batch])
         dones = np.array([e.done for e in batch], dtype=np.float32)
+        return self.train_batch(states, actions, rewards, next_states, dones)
 
+    def train_batch(
+        self,
+        states: np.ndarray,
+        actions: np.ndarray,
+        rewards: np.ndarray,
+        next_states: np.ndarray,
+        dones: np.ndarray,
+    ) -> float:
+        """Train on a batch already laid out as arrays (one row per transition)"""
         current_q = self.policy_net.forward(states)
         next_q = self.target_net.forward(next_states)
         target_q = current_q.copy()
 
-        for i in range(len(batch)):
-            if dones[i]:
-                target_q[i, actions[i]] = rewards[i]
-            else:
-                target_q[i, actions[i]] = rewards[i] + self.gamma * np.max(next_q[i])
+        rows = np.arange(len(states))
+        target_q[rows, actions] = rewards + self.gamma * np.max(next_q, axis=1) * (1 - dones)
 
         loss = self._update_weights(states, target_q)
         self._soft_update()
@@ -194,19 +227,25 @@ class DQNAI:
         self._training_mode = False
         self._total_steps = 0
 
-    def get_state(self) -> np.ndarray:
-        """Extract state representation from game"""
-        head = self.game.snake[0]
-        food = self.game.food or (0, 0)
+        # Bumped whenever policy weights change; play-time caches key on it
+        self.model_version = 0
+        self._inference: DQNInferenceEngine | None = None
+        self._inference_version = -1
+
+    def get_state(self, game: "SnakeGame | None" = None) -> np.ndarray:
+        """Extract state representation from game (self.game by default)"""
+        game = game or self.game
+        head = game.snake[0]
+        food = game.food or (0, 0)
 
         danger_straight = 0
         danger_right = 0
         danger_left = 0
 
-        dir_idx = self._get_direction_index()
+        dir_idx = self._get_direction_index(game)
         for i, danger_idx in enumerate([(dir_idx) % 4, (dir_idx + 1) % 4, (dir_idx + 3) % 4]):
             new_pos = self._get_next_position(head, self.ACTIONS[danger_idx])
-            if not self._is_safe(new_pos):
+            if not self._is_safe(new_pos, game):
                 if i == 0:
                     danger_straight = 1
                 elif i == 1:
@@ -214,10 +253,10 @@ class DQNAI:
                 else:
                     danger_left = 1
 
-        moving_up = 1 if self.game.direction.value == "Up" else 0
-        moving_down = 1 if self.game.direction.value == "Down" else 0
-        moving_left = 1 if self.game.direction.value == "Left" else 0
-        moving_right = 1 if self.game.direction.value == "Right" else 0
+        moving_up = 1 if game.direction.value == "Up" else 0
+        moving_down = 1 if game.direction.value == "Down" else 0
+        moving_left = 1 if game.direction.value == "Left" else 0
+        moving_right = 1 if game.direction.value == "Right" else 0
 
         food_left = 1 if food[0] < head[0] else 0
         food_right = 1 if food[0] > head[0] else 0
@@ -241,8 +280,9 @@ class DQNAI:
             dtype=np.float32,
         )
 
-    def _get_direction_index(self) -> int:
-        return self.ACTIONS.index(self.game.direction.value.upper())
+    def _get_direction_index(self, game: "SnakeGame | None" = None) -> int:
+        game = game or self.game
+        return self.ACTIONS.index(game.direction.value.upper())
 
     def _get_next_position(self, pos: tuple[int, int], action: str) -> tuple[int, int]:
         x, y = pos
@@ -255,18 +295,19 @@ class DQNAI:
         else:
             return (x + 1, y)
 
-    def _is_safe(self, pos: tuple[int, int]) -> bool:
+    def _is_safe(self, pos: tuple[int, int], game: "SnakeGame | None" = None) -> bool:
+        game = game or self.game
         x, y = pos
-        if x < 0 or x >= self.game.config.width:
+        if x < 0 or x >= game.config.width:
             return False
-        if y < 0 or y >= self.game.config.height:
+        if y < 0 or y >= game.config.height:
             return False
-        if pos in set(self.game.snake[:-1]):
+        if pos in set(game.snake[:-1]):
             return False
-        return pos not in self.game.obstacles
+        return pos not in game.obstacles
 
-    def get_direction(self) -> "Direction | None":
-        """Get next direction using DQN"""
+    def get_direction(self, deadline: float | None = None) -> "Direction | None":
+        """Get next direction using DQN (one forward pass, well inside any deadline)"""
         from ..engine import Direction
 
         state = self.get_state()
@@ -285,8 +326,10 @@ class DQNAI:
 
         if random.random() < self.epsilon:
             action = random.randint(0, 3)
-        else:
+        elif self._training_mode:
             action = self.policy_net.predict(state)
+        else:
+            action = self.inference_engine().predict(state)
 
         self._last_state = state
         self._last_action = action
@@ -295,11 +338,59 @@ class DQNAI:
         if self._training_mode and len(self.memory) >= 100:
             batch = self.memory.sample(32)
             self.trainer.train_step(batch)
+            self.model_version += 1
 
             self.epsilon = max(self.epsilon_end, self.epsilon * self.epsilon_decay)
 
         return getattr(Direction, self.ACTIONS[action])
 
+    def get_directions(self, games: "list[SnakeGame]") -> "list[Direction]":
+        """Decide for many games at once with a single batched forward pass"""
+        from ..engine import Direction
+
+        states = np.stack([self.get_state(game) for game in games])
+        actions = self.inference_engine(len(games)).predict_batch(states).copy()
+
+        if self.epsilon > 0:
+            explore = np.random.random(len(games)) < self.epsilon
+            actions[explore] = np.random.randint(0, self.ACTION_SIZE, int(explore.sum()))
+
+        return [getattr(Direction, self.ACTIONS[action]) for action in actions]
+
+    # Observation protocol used by DecisionCache
+    @property
+    def cacheable(self) -> bool:
+        """Greedy play decisions depend only on the state while not training"""
+        return not self._training_mode
+
+    def observe(self, game: "SnakeGame") -> np.ndarray:
+        return self.get_state(game)
+
+    def decide_batch(self, states: np.ndarray) -> "list[Direction]":
+        """Greedy directions for a (batch, STATE_SIZE) matrix of states"""
+        from ..engine import Direction
+
+        actions = self.inference_engine(len(states)).predict_batch(states)
+        return [getattr(Direction, self.ACTIONS[action]) for action in actions]
+
+    def random_direction(self) -> "Direction":
+        from ..engine import Direction
+
+        return getattr(Direction, self.ACTIONS[np.random.randint(0, self.ACTION_SIZE)])
+
+    def inference_engine(self, max_batch: int = 1) -> "DQNInferenceEngine":
+        """Float32 play-time engine, rebuilt only when weights or batch size change"""
+        from .inference import DQNInferenceEngine
+
+        engine = self._inference
+        if engine is None or engine.max_batch < max_batch:
+            engine = DQNInferenceEngine(self.policy_net, max_batch=max_batch)
+            self._inference = engine
+        elif self._inference_version != self.model_version:
+            engine.load(self.policy_net)
+        self._inference_version = self.model_version
+        return engine
+
     def _calculate_reward(self) -> float:
         """Calculate reward based on game state"""
         if self.game.state.value == "game_over":
@@ -349,6 +440,32 @@ class DQNAI:
         with open(path, "wb") as f:
             pickle.dump(data, f)
 
+    def checkpoint_arrays(self) -> dict[str, np.ndarray]:
+        """Policy weights keyed by parameter name, for CheckpointManager"""
+        return {name: getattr(self.policy_net, name) for name in DQNetwork.PARAM_NAMES}
+
+    def checkpoint_metadata(self) -> dict:
+        """Scalar training state stored alongside the weights"""
+        return {"epsilon": self.epsilon, "total_steps": self._total_steps}
+
+    def load_checkpoint(
+        self, arrays: dict[str, np.ndarray], metadata: dict, copy: bool = True
+    ) -> None:
+        """
+        Restore weights from a checkpoint.
+
+        With copy=False memory-mapped arrays are used as-is, which is enough for
+        play but not for further training.
+        """
+        for name in DQNetwork.PARAM_NAMES:
+            value = arrays[name]
+            setattr(self.policy_net, name, np.array(value) if copy else value)
+        self.target_net.copy_from(self.policy_net)
+
+        self.epsilon = metadata.get("epsilon", self.epsilon)
+        self._total_steps = metadata.get("total_steps", self._total_steps)
+        self.model_version += 1
+
     def load_model(self, path: str) -> None:
         """Load model from file"""
         model_path = Path(path)
@@ -369,3 +486,4 @@ class DQNAI:
 
         self.epsilon = data.get("epsilon", 0.01)
         self._total_steps = data.get("total_steps", 0)
+        self.model_version += 1
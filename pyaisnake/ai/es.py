@@ -0,0 +1,209 @@
+"""
+Evolution Strategies training for DQNetwork policies.
+
+Every worker process keeps its own replica of the flat parameter vector. For each
+generation the trainer hands out noise seeds; a worker regenerates the Gaussian
+perturbation from the seed, plays headless games with theta + sigma * eps and
+theta - sigma * eps, and sends back only (seed, return+, return-). The update is
+broadcast as (seeds, weights), and every replica applies it identically, so after
+start-up no parameter vector ever crosses a process boundary.
+"""
+
+import multiprocessing as mp
+import queue
+import random
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+from .dqn import DQNAI
+
+
+@dataclass
+class ESConfig:
+    """Settings for an Evolution Strategies run"""
+
+    generations: int = 100
+    population: int = 32  # antithetic pairs per generation
+    sigma: float = 0.05
+    learning_rate: float = 0.02
+    workers: int = 4
+    games_per_eval: int = 2
+    width: int = 20
+    height: int = 20
+    max_steps: int = 1000
+    seed: int = 0
+    result_timeout: float = 600.0  # seconds without any result before giving up
+
+
+def centered_ranks(values: np.ndarray) -> np.ndarray:
+    """Rank-transform values into [-0.5, 0.5], making the update scale-free"""
+    ranks = np.empty(values.size, dtype=np.float64)
+    ranks[values.ravel().argsort(kind="stable")] = np.arange(values.size)
+    if values.size > 1:
+        ranks /= values.size - 1
+    return (ranks - 0.5).reshape(values.shape)
+
+
+def perturbation(seed: int, size: int) -> np.ndarray:
+    """Gaussian noise vector reproducible from its seed"""
+    return np.random.default_rng(seed).standard_normal(size)
+
+
+def apply_update(
+    theta: np.ndarray, seeds: np.ndarray, weights: np.ndarray, config: ESConfig
+) -> None:
+    """In-place ES gradient step; bit-identical in every process for equal inputs"""
+    step = np.zeros_like(theta)
+    for seed, weight in zip(seeds, weights):
+        step += weight * perturbation(int(seed), theta.size)
+    theta += config.learning_rate / (len(seeds) * config.sigma) * step
+
+
+def play_episodes(ai: DQNAI, config: ESConfig, generation: int) -> float:
+    """Mean return of ai.policy_net over the generation's fixed set of games"""
+    from ..engine import Direction, GameConfig, GameState, SnakeGame
+
+    game_config = GameConfig(width=config.width, height=config.height, speed_ms=0)
+    engine = ai.inference_engine()
+    total = 0.0
+
+    for episode in range(config.games_per_eval):
+        # Every perturbation in a generation sees the same food spawns
+        random.seed(config.seed * 1_000_003 + generation * 1_000 + episode)
+        game = SnakeGame(game_config)
+        steps = 0
+        while game.state == GameState.RUNNING and steps < config.max_steps:
+            action = engine.predict(ai.get_state(game))
+            game.set_direction(getattr(Direction, DQNAI.ACTIONS[action]))
+            game.update()
+            steps += 1
+        total += game.stats.score + steps / config.max_steps
+
+    return total / config.games_per_eval
+
+
+def _worker_loop(theta: np.ndarray, config: ESConfig, tasks, updates, results) -> None:
+    """Evaluate antithetic pairs, applying broadcast updates to the local replica"""
+    from ..engine import GameConfig, SnakeGame
+
+    ai = DQNAI(SnakeGame(GameConfig(width=config.width, height=config.height)))
+    generation = 0
+
+    while True:
+        task = tasks.get()
+        if task is None:
+            return
+        task_generation, seed = task
+
+        while generation < task_generation:
+            seeds, weights = updates.get()
+            apply_update(theta, seeds, weights, config)
+            generation += 1
+
+        eps = perturbation(seed, theta.size)
+        returns = []
+        for sign in (1.0, -1.0):
+            ai.policy_net.set_flat(theta + sign * config.sigma * eps)
+            ai.model_version += 1
+            returns.append(play_episodes(ai, config, generation))
+        results.put((seed, returns[0], returns[1]))
+
+
+def train_es(
+    ai: DQNAI,
+    config: ESConfig,
+    on_generation: Callable[[int, dict], None] | None = None,
+) -> dict:
+    """
+    Train ai.policy_net with Evolution Strategies across config.workers processes.
+
+    ai.policy_net holds the updated weights whenever on_generation(generation, stats)
+    is invoked, so the callback may checkpoint them. Returns summary statistics.
+    """
+    ctx = mp.get_context()
+    rng = np.random.default_rng(config.seed)
+    theta = ai.policy_net.get_flat()
+
+    tasks = ctx.Queue()
+    results = ctx.Queue()
+    update_queues = [ctx.Queue() for _ in range(config.workers)]
+    workers = [
+        ctx.Process(
+            target=_worker_loop,
+            args=(theta, config, tasks, update_queues[i], results),
+            daemon=True,
+        )
+        for i in range(config.workers)
+    ]
+
+    history: list[float] = []
+    start = time.time()
+
+    try:
+        for worker in workers:
+            worker.start()
+
+        for generation in range(config.generations):
+            seeds = rng.choice(2**31 - 1, size=config.population, replace=False)
+            for seed in seeds:
+                tasks.put((generation, int(seed)))
+
+            collected: dict[int, tuple[float, float]] = {}
+            waited = 0.0
+            while len(collected) < config.population:
+                try:
+                    seed, plus, minus = results.get(timeout=1.0)
+                except queue.Empty:
+                    # A dead worker's pair never arrives, so the generation cannot finish
+                    dead = [i for i, worker in enumerate(workers) if not worker.is_alive()]
+                    if dead:
+                        raise RuntimeError(
+                            f"ES workers {dead} exited during generation {generation + 1}"
+                        ) from None
+                    waited += 1.0
+                    if waited >= config.result_timeout:
+                        raise RuntimeError(
+                            f"No ES results for {config.result_timeout:.0f}s "
+                            f"in generation {generation + 1}"
+                        ) from None
+                    continue
+                waited = 0.0
+                collected[seed] = (plus, minus)
+
+            returns = np.array([collected[int(seed)] for seed in seeds])
+            ranks = centered_ranks(returns)
+            weights = ranks[:, 0] - ranks[:, 1]
+
+            apply_update(theta, seeds, weights, config)
+            for update_queue in update_queues:
+                update_queue.put((seeds, weights))
+
+            history.append(float(returns.mean()))
+            ai.policy_net.set_flat(theta)
+            ai.model_version += 1
+            if on_generation:
+                on_generation(
+                    generation + 1,
+                    {"mean_return": history[-1], "best_return": float(returns.max())},
+                )
+    finally:
+        for _ in workers:
+            tasks.put(None)
+        for worker in workers:
+            worker.join(timeout=5)
+            if worker.is_alive():
+                worker.terminate()
+
+    ai.target_net.copy_from(ai.policy_net)
+    elapsed = time.time() - start
+    evaluations = config.generations * config.population * 2 * config.games_per_eval
+
+    return {
+        "generations": config.generations,
+        "mean_return": history[-1] if history else 0.0,
+        "best_mean_return": max(history) if history else 0.0,
+        "games_per_second": evaluations / elapsed if elapsed > 0 else 0.0,
+    }
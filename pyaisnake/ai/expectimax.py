@@ -0,0 +1,259 @@
+"""
+Depth-limited expectimax player with food spawns as chance nodes.
+
+Max nodes choose a move. When the snake eats, a chance node averages over
+where the next food appears and what it is: the engine draws the position
+uniformly from the free cells and, with the difficulty's power-up frequency,
+the kind from SnakeGame.POWER_UP_WEIGHTS. The player samples a few
+(position, kind) outcomes from that distribution with its own RNG, so the
+game's global random stream is never touched and the branching factor stays
+small.
+
+The search runs on compact tuples instead of SnakeGame clones. Moves that
+collide, or that leave the head in a cell with no exit, are pruned as losses
+without expansion. Leaves are scored with one bounded BFS: distance to food,
+reachable area and whether the tail can still be reached. Values are cached
+by board state together with the depth they were searched to. Given a
+deadline, the search deepens iteratively and returns the deepest completed
+answer.
+
+Speed effects (STAR, FREEZE) do not change the board and are not modelled;
+walls are walls even on wrap_around boards.
+"""
+
+import random
+import time
+from collections import deque
+
+from ..engine import Direction, PowerUpType, SnakeGame
+from .analysis import DELTAS, analyze
+from .cache import LRUCache
+
+# (snake, food, food kind, shields, score multiplier)
+State = tuple[tuple[tuple[int, int], ...], tuple[int, int] | None, PowerUpType | None, int, float]
+
+LOSS = -1_000_000.0
+WIN = 1_000_000.0
+FOOD_REWARD = 100.0
+TRAP_PENALTY = 500.0
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+class ExpectimaxAI:
+    """Expectimax over moves and sampled food spawns"""
+
+    # Node expansions between deadline checks
+    DEADLINE_CHECK_INTERVAL = 32
+
+    def __init__(
+        self,
+        game: SnakeGame,
+        max_depth: int = 3,
+        samples: int = 3,
+        bfs_limit: int = 400,
+        cache_size: int = 20_000,
+        seed: int | None = None,
+    ):
+        self.game = game
+        self.max_depth = max_depth
+        self.samples = samples
+        self.bfs_limit = bfs_limit
+        self.rng = random.Random(seed)
+        self.cache = LRUCache(max_entries=cache_size)
+        self.nodes = 0
+        self.pruned = 0
+        self._deadline: float | None = None
+        self._obstacles: frozenset[tuple[int, int]] = frozenset()
+
+    def get_direction(self, deadline: float | None = None) -> Direction | None:
+        game = self.game
+        if frozenset(game.obstacles) != self._obstacles:
+            self._obstacles = frozenset(game.obstacles)
+            self.cache.clear()
+
+        kind = game.current_power_up.type if game.current_power_up else PowerUpType.APPLE
+        root: State = (
+            tuple(game.snake),
+            game.food,
+            kind,
+            game.shield_count,
+            game.score_multiplier,
+        )
+
+        self._deadline = deadline
+        best = None
+        for depth in range(1, self.max_depth + 1):
+            try:
+                best = self._best_move(root, depth)
+            except _OutOfTime:
+                break
+
+        if best is None:
+            # Every move loses within the horizon: keep the most room
+            safe = analyze(game).safe_directions
+            return max(safe, key=analyze(game).reachable_area) if safe else None
+        return best
+
+    def _best_move(self, state: State, depth: int) -> Direction | None:
+        best, best_value = None, LOSS
+        for direction, (dx, dy) in DELTAS.items():
+            value = self._move_value(state, dx, dy, depth)
+            if value is not None and value > best_value:
+                best, best_value = direction, value
+        return best
+
+    def _tick(self) -> None:
+        self.nodes += 1
+        if (
+            self._deadline is not None
+            and self.nodes % self.DEADLINE_CHECK_INTERVAL == 0
+            and time.perf_counter() > self._deadline
+        ):
+            raise _OutOfTime
+
+    def _step(self, state: State, dx: int, dy: int) -> tuple[State | None, float]:
+        """Apply one move with the engine's rules; None if the snake dies"""
+        snake, food, kind, shields, multiplier = state
+        head = snake[0]
+        new_head = (head[0] + dx, head[1] + dy)
+        width, height = self.game.config.width, self.game.config.height
+
+        if (
+            not (0 <= new_head[0] < width and 0 <= new_head[1] < height)
+            or new_head in snake
+            or new_head in self._obstacles
+        ):
+            # A shield absorbs the collision and the snake stays put
+            if shields:
+                return (snake, food, kind, shields - 1, multiplier), 0.0
+            return None, 0.0
+
+        if new_head != food:
+            return ((new_head, *snake[:-1]), food, kind, shields, multiplier), 0.0
+
+        reward = FOOD_REWARD * int(multiplier)
+        body = (new_head, *snake)
+        if kind == PowerUpType.MUSHROOM:
+            body = body[:3]
+        elif kind == PowerUpType.SHIELD:
+            shields += 1
+        elif kind == PowerUpType.DIAMOND:
+            multiplier = 2.0
+        return (body, None, None, shields, multiplier), reward
+
+    def _has_exit(self, state: State) -> bool:
+        # Same rule as _step and the engine: the tail still blocks on the next move
+        snake = state[0]
+        head = snake[0]
+        width, height = self.game.config.width, self.game.config.height
+        for dx, dy in DELTAS.values():
+            pos = (head[0] + dx, head[1] + dy)
+            if (
+                0 <= pos[0] < width
+                and 0 <= pos[1] < height
+                and pos not in snake
+                and pos not in self._obstacles
+            ):
+                return True
+        return False
+
+    def _move_value(self, state: State, dx: int, dy: int, depth: int) -> float | None:
+        """Value of moving by (dx, dy) and searching depth - 1 further; None if fatal"""
+        child, reward = self._step(state, dx, dy)
+        if child is None:
+            return None
+        if not child[3] and not self._has_exit(child):
+            self.pruned += 1
+            return None
+        if child[1] is None:
+            return reward + self._chance(child, depth - 1)
+        return reward + self._search(child, depth - 1)
+
+    def _search(self, state: State, depth: int) -> float:
+        cached = self.cache.get(state)
+        if cached is not None and cached[0] >= depth:
+            return cached[1]
+
+        self._tick()
+        if depth == 0:
+            value = self._evaluate(state)
+        else:
+            value = LOSS
+            for dx, dy in DELTAS.values():
+                move_value = self._move_value(state, dx, dy, depth)
+                if move_value is not None:
+                    value = max(value, move_value)
+
+        self.cache.put(state, (depth, value))
+        return value
+
+    def _chance(self, state: State, depth: int) -> float:
+        """Average over sampled food spawns after the snake has eaten"""
+        if depth == 0:
+            return self._evaluate(state)
+
+        snake, _, _, shields, multiplier = state
+        game = self.game
+        occupied = set(snake) | self._obstacles
+        free = [
+            (x, y)
+            for x in range(game.config.width)
+            for y in range(game.config.height)
+            if (x, y) not in occupied
+        ]
+        if not free:
+            return WIN
+
+        total = 0.0
+        positions = self.rng.sample(free, min(self.samples, len(free)))
+        for position in positions:
+            total += self._search(
+                (snake, position, self._sample_kind(), shields, multiplier), depth
+            )
+        return total / len(positions)
+
+    def _sample_kind(self) -> PowerUpType:
+        game = self.game
+        if game.config.power_ups_enabled and self.rng.random() < game._power_up_frequency:
+            weights = SnakeGame.POWER_UP_WEIGHTS
+            return self.rng.choices(list(weights), weights=list(weights.values()))[0]
+        return PowerUpType.APPLE
+
+    def _evaluate(self, state: State) -> float:
+        """Heuristic leaf value from one BFS of at most bfs_limit cells"""
+        snake, food = state[0], state[1]
+        head, tail = snake[0], snake[-1]
+        width, height = self.game.config.width, self.game.config.height
+        blocked = set(snake) | self._obstacles
+
+        food_distance = None
+        tail_reachable = len(snake) == 1
+        seen = {head}
+        queue = deque([(head, 0)])
+        while queue and len(seen) < self.bfs_limit:
+            (x, y), steps = queue.popleft()
+            for dx, dy in DELTAS.values():
+                pos = (x + dx, y + dy)
+                if pos == tail and steps > 0:
+                    tail_reachable = True
+                if pos in seen or pos in blocked:
+                    continue
+                if not (0 <= pos[0] < width and 0 <= pos[1] < height):
+                    continue
+                if pos == food:
+                    food_distance = steps + 1
+                seen.add(pos)
+                queue.append((pos, steps + 1))
+
+        value = 0.0
+        if food is not None:
+            if food_distance is None:
+                food_distance = abs(food[0] - head[0]) + abs(food[1] - head[1]) + width + height
+            value -= food_distance
+        if not tail_reachable:
+            # Cut off from the tail: risky, and fatal if the room is shorter than the body
+            value -= TRAP_PENALTY if len(seen) - 1 < len(snake) else TRAP_PENALTY / 2
+        return value
@@ -0,0 +1,94 @@
+"""
+Columnar ring buffer of extracted training samples.
+
+NeuralSnakeAI used to keep every sample as a tuple holding copies of the snake
+and obstacle lists and re-extracted features on every retrain. FeatureStore
+extracts once on insert and keeps fixed-width float32 feature rows, an int8
+action and a float32 reward per sample - about a hundred bytes instead of
+kilobytes. With a directory the columns are memory-mapped .npy files, so the
+buffer survives restarts and does not count against the process heap.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+
+class FeatureStore:
+    """Fixed-capacity ring buffer of (features, action, reward) samples"""
+
+    def __init__(self, capacity: int, n_features: int, path: str | Path | None = None):
+        self.capacity = capacity
+        self.n_features = n_features
+        self.path = Path(path) if path is not None else None
+
+        if self.path is None:
+            self.features = np.zeros((capacity, n_features), dtype=np.float32)
+            self.actions = np.zeros(capacity, dtype=np.int8)
+            self.rewards = np.zeros(capacity, dtype=np.float32)
+            # [samples ever added, write position]
+            self._cursor = np.zeros(2, dtype=np.int64)
+            return
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._recreated = False
+        self.features = self._open("features", (capacity, n_features), np.float32)
+        self.actions = self._open("actions", (capacity,), np.int8)
+        self.rewards = self._open("rewards", (capacity,), np.float32)
+        self._cursor = self._open("cursor", (2,), np.int64)
+        # A fresh column holds no samples, so the others no longer line up with it
+        if self._recreated:
+            self._cursor[:] = 0
+
+    def _open(self, name: str, shape: tuple[int, ...], dtype) -> np.ndarray:
+        file = self.path / f"{name}.npy"
+        if file.exists():
+            column = np.lib.format.open_memmap(file, mode="r+")
+            if column.shape == shape and column.dtype == dtype:
+                return column
+            del column
+        self._recreated = True
+        return np.lib.format.open_memmap(file, mode="w+", dtype=dtype, shape=shape)
+
+    def __len__(self) -> int:
+        return int(min(self._cursor[0], self.capacity))
+
+    @property
+    def total(self) -> int:
+        """Samples ever appended, including ones since overwritten"""
+        return int(self._cursor[0])
+
+    @property
+    def nbytes(self) -> int:
+        return self.features.nbytes + self.actions.nbytes + self.rewards.nbytes
+
+    def append(self, features: np.ndarray, action: int, reward: float) -> None:
+        """Store one sample; action -1 marks a move outside the action set"""
+        position = int(self._cursor[1])
+        self.features[position] = features
+        self.actions[position] = action
+        self.rewards[position] = reward
+        self._cursor[0] += 1
+        self._cursor[1] = (position + 1) % self.capacity
+
+    def since(self, total: int) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Samples appended after the store held `total`, oldest first"""
+        count = min(self.total - total, len(self))
+        if count <= 0:
+            empty = np.empty(0, dtype=np.int64)
+            return self.features[empty], self.actions[empty], self.rewards[empty]
+
+        indices = (int(self._cursor[1]) - count + np.arange(count)) % self.capacity
+        return self.features[indices], self.actions[indices], self.rewards[indices]
+
+    def arrays(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Every retained sample, oldest first"""
+        return self.since(0)
+
+    def clear(self) -> None:
+        self._cursor[:] = 0
+
+    def flush(self) -> None:
+        if self.path is not None:
+            for column in (self.features, self.actions, self.rewards, self._cursor):
+                column.flush()
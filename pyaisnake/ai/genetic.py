@@ -2,39 +2,75 @@ import math
 import os
 import pickle
 import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .checkpoint import CheckpointManager, load_npz
+
+_rng = np.random.default_rng()
+
+# Оценщик рабочего процесса, создаётся один раз на процесс
+_evaluator: "GeneticSnakeAI | None" = None
+
+# Смещения (dx, dy) в порядке GeneticSnakeAI.DIRECTIONS
+_DELTAS = np.array([(0, -1), (0, 1), (-1, 0), (1, 0)])
+
+# Раскладка генома: на каждое направление — веса пяти признаков, последний
+# из них ещё и вес путей отхода; оценки всех направлений требуют DECISION_GENES
+GENES_PER_DIRECTION = 5
+DECISION_GENES = len(_DELTAS) * GENES_PER_DIRECTION
 
 
 class Genome:
-    """Геном для генетического алгоритма"""
+    """
+    Геном для генетического алгоритма.
 
-    def __init__(self, size: int = 100):
-        self.genes: list[float] = [random.uniform(-1, 1) for _ in range(size)]
-        self.fitness: float = 0.0
+    Гены — строка float32; в популяции это представление (view) строки общей
+    матрицы, а fitness хранится в одноэлементном срезе вектора приспособленности.
+    """
 
-    def mutate(self, mutation_rate: float = 0.1) -> None:
+    def __init__(
+        self,
+        size: int = 100,
+        genes: np.ndarray | None = None,
+        fitness: np.ndarray | None = None,
+    ):
+        if genes is None:
+            genes = _rng.uniform(-1, 1, size).astype(np.float32)
+        self.genes: np.ndarray = genes
+        self._fitness: np.ndarray = fitness if fitness is not None else np.zeros(1)
+
+    @property
+    def decides_all_directions(self) -> bool:
+        """Хватает ли генов на веса всех направлений (раскладка DECISION_GENES)"""
+        return len(self.genes) >= DECISION_GENES
+
+    @property
+    def fitness(self) -> float:
+        return float(self._fitness[0])
+
+    @fitness.setter
+    def fitness(self, value: float) -> None:
+        self._fitness[0] = value
+
+    def mutate(self, mutation_rate: float = 0.1, rng: np.random.Generator | None = None) -> None:
         """Мутация генома"""
-        for i in range(len(self.genes)):
-            if random.random() < mutation_rate:
-                self.genes[i] += random.gauss(0, 0.5)
-                self.genes[i] = max(-1, min(1, self.genes[i]))
+        rng = rng or _rng
+        mask = rng.random(len(self.genes)) < mutation_rate
+        self.genes[mask] += rng.normal(0, 0.5, int(mask.sum())).astype(np.float32)
+        np.clip(self.genes, -1, 1, out=self.genes)
 
-    def crossover(self, partner: "Genome") -> "Genome":
+    def crossover(self, partner: "Genome", rng: np.random.Generator | None = None) -> "Genome":
         """Скрещивание с другим геномом"""
-        child = Genome(len(self.genes))
-        midpoint = random.randint(0, len(self.genes) - 1)
-        for i in range(len(self.genes)):
-            if i < midpoint:
-                child.genes[i] = self.genes[i]
-            else:
-                child.genes[i] = partner.genes[i]
-        return child
+        rng = rng or _rng
+        midpoint = int(rng.integers(0, len(self.genes)))
+        genes = np.concatenate([self.genes[:midpoint], partner.genes[midpoint:]])
+        return Genome(genes=genes)
 
     def copy(self) -> "Genome":
         """Создать копию генома"""
-        new_genome = Genome(len(self.genes))
-        new_genome.genes = self.genes.copy()
-        new_genome.fitness = self.fitness
-        return new_genome
+        return Genome(genes=self.genes.copy(), fitness=np.array([self.fitness]))
 
 
 class GeneticSnakeAI:
@@ -51,6 +87,11 @@ class GeneticSnakeAI:
         mutation_rate: float = 0.1,
         crossover_rate: float = 0.7,
         elite_size: int = 5,
+        checkpoints: CheckpointManager | None = None,
+        seed: int | None = None,
+        cell_size: int = CELL_SIZE,
+        field_size: int = FIELD_SIZE,
+        field_height: int | None = None,
     ):
         self.population_size = population_size
         self.genome_size = genome_size
@@ -58,6 +99,18 @@ class GeneticSnakeAI:
         self.crossover_rate = crossover_rate
         self.elite_size = elite_size
 
+        self.seed = seed if seed is not None else 0
+
+        # Геометрия поля: по умолчанию пиксели 400×400 с клеткой 10,
+        # для координат движка — cell_size=1 и размеры поля в клетках
+        self.cell_size = cell_size
+        self.field_size = field_size
+        self.field_height = field_height if field_height is not None else field_size
+        self.rng = np.random.default_rng(seed)
+
+        # Популяция — матрица (population_size × genome_size); Genome лишь view строки
+        self.genes = np.empty((population_size, genome_size), dtype=np.float32)
+        self.fitness = np.zeros(population_size)
         self.population: list[Genome] = []
         self.generation: int = 0
         self.best_fitness: float = 0.0
@@ -68,28 +121,50 @@ class GeneticSnakeAI:
         self.current_genome_index = 0
         self.genome_scores: list[int] = []
 
+        # Без CheckpointManager контрольные точки не сохраняются
+        self.checkpoints = checkpoints
+
         self._initialize_population()
 
     def _initialize_population(self) -> None:
         """Инициализация популяции"""
-        self.population = [Genome(self.genome_size) for _ in range(self.population_size)]
+        self._set_population(
+            self.rng.uniform(-1, 1, (self.population_size, self.genome_size)),
+            np.zeros(self.population_size),
+        )
         self.generation = 0
         self.current_genome_index = 0
         self.genome_scores = []
 
+    @property
+    def geometry(self) -> tuple[int, int, int]:
+        """(cell_size, field_size, field_height) поля модели"""
+        return (self.cell_size, self.field_size, self.field_height)
+
+    def _set_population(self, genes: np.ndarray, fitness: np.ndarray) -> None:
+        """Заменить матрицу популяции и пересоздать представления Genome"""
+        self.genes = np.array(genes, dtype=np.float32)
+        self.fitness = np.array(fitness, dtype=np.float64)
+        self.population_size, self.genome_size = self.genes.shape
+        self._next_genes = np.empty_like(self.genes)
+        self.population = [
+            Genome(genes=self.genes[i], fitness=self.fitness[i : i + 1])
+            for i in range(self.population_size)
+        ]
+
     def extract_features(self, snake: list, food: tuple, obstacles: list) -> list[float]:
         """Извлечение признаков из игрового состояния"""
         head = snake[0]
 
         features = [
-            math.sqrt((food[0] - head[0]) ** 2 + (food[1] - head[1]) ** 2) / self.FIELD_SIZE,
+            math.sqrt((food[0] - head[0]) ** 2 + (food[1] - head[1]) ** 2) / self.field_size,
             len(snake) / 100,
             len(obstacles) / 50,
             self._calculate_free_space(snake, obstacles) / 1600,
-            head[0] / self.FIELD_SIZE,
-            head[1] / self.FIELD_SIZE,
-            (food[0] - head[0]) / self.FIELD_SIZE,
-            (food[1] - head[1]) / self.FIELD_SIZE,
+            head[0] / self.field_size,
+            head[1] / self.field_size,
+            (food[0] - head[0]) / self.field_size,
+            (food[1] - head[1]) / self.field_size,
         ]
 
         for direction in self.DIRECTIONS:
@@ -103,7 +178,7 @@ class GeneticSnakeAI:
         for direction in self.DIRECTIONS:
             next_pos = self._get_next_position(head, direction)
             new_dist = math.sqrt((food[0] - next_pos[0]) ** 2 + (food[1] - next_pos[1]) ** 2)
-            features.append(new_dist / self.FIELD_SIZE)
+            features.append(new_dist / self.field_size)
 
         for direction in self.DIRECTIONS:
             escape_count = self._count_escape_routes(
@@ -117,13 +192,13 @@ class GeneticSnakeAI:
         """Получить следующую позицию"""
         x, y = pos
         if direction == "Up":
-            return (x, y - self.CELL_SIZE)
+            return (x, y - self.cell_size)
         elif direction == "Down":
-            return (x, y + self.CELL_SIZE)
+            return (x, y + self.cell_size)
         elif direction == "Left":
-            return (x - self.CELL_SIZE, y)
+            return (x - self.cell_size, y)
         elif direction == "Right":
-            return (x + self.CELL_SIZE, y)
+            return (x + self.cell_size, y)
         return pos
 
     def _count_escape_routes(self, pos: tuple, snake: list, obstacles: list) -> int:
@@ -141,7 +216,7 @@ class GeneticSnakeAI:
     def _is_valid_position(self, pos: tuple, snake: list, obstacles: list) -> bool:
         """Проверка валидности позиции"""
         x, y = pos
-        if x < 0 or x >= self.FIELD_SIZE or y < 0 or y >= self.FIELD_SIZE:
+        if x < 0 or x >= self.field_size or y < 0 or y >= self.field_height:
             return False
         if pos in snake:
             return False
@@ -149,7 +224,7 @@ class GeneticSnakeAI:
 
     def _calculate_free_space(self, snake: list, obstacles: list) -> int:
         """Подсчет свободного пространства"""
-        total_cells = (self.FIELD_SIZE // self.CELL_SIZE) ** 2
+        total_cells = (self.field_size // self.cell_size) * (self.field_height // self.cell_size)
         occupied = len(snake) + len(obstacles)
         return total_cells - occupied
 
@@ -158,13 +233,13 @@ class GeneticSnakeAI:
         x, y = pos
 
         if direction == "Up":
-            return y // self.CELL_SIZE
+            return y // self.cell_size
         elif direction == "Down":
-            return (self.FIELD_SIZE - y) // self.CELL_SIZE
+            return (self.field_height - y) // self.cell_size
         elif direction == "Left":
-            return x // self.CELL_SIZE
+            return x // self.cell_size
         elif direction == "Right":
-            return (self.FIELD_SIZE - x) // self.CELL_SIZE
+            return (self.field_size - x) // self.cell_size
         return 0
 
     def _is_dangerous_direction(
@@ -188,10 +263,11 @@ class GeneticSnakeAI:
         scores: dict[str, float] = {}
 
         for i, direction in enumerate(self.DIRECTIONS):
-            base_idx = i * 5
-            if base_idx + 4 < len(genome.genes):
+            base_idx = i * GENES_PER_DIRECTION
+            if base_idx + GENES_PER_DIRECTION <= len(genome.genes):
                 score = sum(
-                    features[j] * genome.genes[base_idx + j] for j in range(min(5, len(features)))
+                    features[j] * genome.genes[base_idx + j]
+                    for j in range(min(GENES_PER_DIRECTION, len(features)))
                 )
 
                 if self._is_dangerous_direction(snake[0], direction, snake, obstacles):
@@ -200,11 +276,7 @@ class GeneticSnakeAI:
                 escape_routes = self._count_escape_routes(
                     self._get_next_position(snake[0], direction), snake, obstacles
                 )
-                score += (
-                    escape_routes * 5 * genome.genes[base_idx + 4]
-                    if base_idx + 4 < len(genome.genes)
-                    else 0
-                )
+                score += escape_routes * 5 * genome.genes[base_idx + GENES_PER_DIRECTION - 1]
 
                 scores[direction] = score
 
@@ -253,6 +325,174 @@ class GeneticSnakeAI:
 
         return max(0, fitness)
 
+    def evaluate_population(
+        self,
+        n_games: int = 3,
+        workers: int | None = None,
+        max_steps: int = 1000,
+        lockstep: bool = True,
+    ) -> np.ndarray:
+        """
+        Оценить всю популяцию в пуле процессов.
+
+        Каждый геном играет n_games безголовых игр с одинаковыми для поколения
+        сидами; fitness усредняется по играм и записывается в self.fitness.
+        При lockstep каждый процесс играет свой блок геномов одновременно
+        (play_lockstep), иначе — по одному геному через get_decision.
+        Возвращает копию вектора fitness для последующего evolve().
+        """
+        seeds = np.random.SeedSequence([self.seed, self.generation]).generate_state(n_games)
+        seeds = seeds.tolist()
+        workers = workers if workers is not None else os.cpu_count() or 1
+
+        if lockstep:
+            blocks = np.array_split(np.arange(self.population_size), max(1, workers))
+            tasks = [
+                (self.genes[block], seeds, max_steps, self.geometry)
+                for block in blocks
+                if len(block)
+            ]
+            play = _play_block
+        else:
+            tasks = [
+                (self.genes[i], seeds, max_steps, self.geometry)
+                for i in range(self.population_size)
+            ]
+            play = _play_genome
+
+        if workers <= 1:
+            results = list(map(play, tasks))
+        else:
+            chunksize = 1 if lockstep else max(1, self.population_size // (workers * 4))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(play, tasks, chunksize=chunksize))
+
+        if lockstep:
+            fitness = np.concatenate([block_fitness for block_fitness, _ in results])
+            scores = np.concatenate([block_scores for _, block_scores in results]).tolist()
+        else:
+            fitness = np.array([genome_fitness for genome_fitness, _ in results])
+            scores = [score for _, score in results]
+
+        self.fitness[:] = fitness
+        self.genome_scores = scores
+        self.current_genome_index = 0
+        return self.fitness.copy()
+
+    def batch_direction_scores(self, genes: np.ndarray, games: list) -> np.ndarray:
+        """
+        Оценки направлений для пар (геном, игра) одним матричным произведением.
+
+        genes — матрица (n × ≥DECISION_GENES) генов, games — n объектов SnakeGame в клетках
+        поля. Результат (n × 4) совпадает с оценками get_decision.
+        """
+        n = len(games)
+        width, height = games[0].config.width, games[0].config.height
+        scale = self.cell_size / self.field_size
+
+        # Занятость с рамкой в две клетки: стены, тела змеек и препятствия
+        blocked = np.ones((n, height + 4, width + 4), dtype=bool)
+        blocked[:, 2:-2, 2:-2] = False
+        lengths = np.array([len(game.snake) for game in games])
+        body = np.array([cell for game in games for cell in game.snake])
+        owner = np.repeat(np.arange(n), lengths)
+        blocked[owner, body[:, 1] + 2, body[:, 0] + 2] = True
+
+        obstacle_counts = np.array([len(game.obstacles) for game in games])
+        if obstacle_counts.any():
+            cells = np.array([cell for game in games for cell in game.obstacles])
+            owner = np.repeat(np.arange(n), obstacle_counts)
+            blocked[owner, cells[:, 1] + 2, cells[:, 0] + 2] = True
+
+        heads = body[np.cumsum(lengths) - lengths]
+        foods = np.array(
+            [game.food if game.food else game.snake[0] for game in games], dtype=np.float64
+        )
+
+        rows = np.arange(n)[:, None]
+        moves = heads[:, None, :] + _DELTAS
+        danger = blocked[rows, moves[..., 1] + 2, moves[..., 0] + 2]
+
+        neighbours = moves[:, :, None, :] + _DELTAS
+        free = ~blocked[rows[:, :, None], neighbours[..., 1] + 2, neighbours[..., 0] + 2]
+        escape = np.where(danger, 0, free.sum(axis=2))
+
+        total_cells = (self.field_size // self.cell_size) * (self.field_height // self.cell_size)
+        features = np.empty((n, 5))
+        features[:, 0] = np.hypot(*(foods - heads).T) * scale
+        features[:, 1] = lengths / 100
+        features[:, 2] = obstacle_counts / 50
+        features[:, 3] = (total_cells - lengths - obstacle_counts) / 1600
+        features[:, 4] = heads[:, 0] * scale
+
+        weights = np.asarray(genes[:, :DECISION_GENES], dtype=np.float64).reshape(
+            n, len(self.DIRECTIONS), GENES_PER_DIRECTION
+        )
+        scores = (features[:, None, :] * weights).sum(axis=2)
+        scores -= 100 * danger
+        scores += escape * 5 * weights[:, :, 4]
+        return scores
+
+    def play_lockstep(
+        self, genes: np.ndarray, seeds: list[int], max_steps: int = 1000
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Сыграть все геномы одновременно, по игре на каждую пару (геном, сид).
+
+        Каждая игра хранит своё состояние random, поэтому результаты совпадают
+        с последовательной игрой через get_decision. Возвращает средние fitness
+        и счёт каждого генома.
+        """
+        from ..engine import Direction, GameConfig, GameState, SnakeGame
+
+        if genes.shape[1] < DECISION_GENES:
+            raise ValueError(
+                f"Lockstep evaluation needs genomes of at least {DECISION_GENES} genes"
+            )
+
+        directions = [Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT]
+        config = GameConfig(
+            width=self.field_size // self.cell_size,
+            height=self.field_height // self.cell_size,
+            speed_ms=0,
+        )
+        genome_of = np.repeat(np.arange(len(genes)), len(seeds))
+
+        # Игра k принадлежит геному k // len(seeds) и играет с сидом seeds[k % len(seeds)]
+        games = []
+        states = []
+        for seed in seeds * len(genes):
+            random.seed(seed)
+            games.append(SnakeGame(config))
+            states.append(random.getstate())
+        steps = [0] * len(games)
+
+        weights = genes[:, :DECISION_GENES]
+        live = list(range(len(games)))
+        while live:
+            scores = self.batch_direction_scores(weights[genome_of[live]], [games[i] for i in live])
+            best = (scores == scores.max(axis=1, keepdims=True)).tolist()
+            for i, mask in zip(live, best):
+                random.setstate(states[i])
+                choice = random.choice([k for k in range(4) if mask[k]])
+                games[i].set_direction(directions[choice])
+                games[i].update()
+                states[i] = random.getstate()
+                steps[i] += 1
+            live = [i for i in live if games[i].state == GameState.RUNNING and steps[i] < max_steps]
+
+        fitness = np.array(
+            [
+                self.calculate_fitness(
+                    game.stats.score, n, len(game.snake), game.stats.food_eaten, n
+                )
+                for game, n in zip(games, steps)
+            ]
+        )
+        scores = np.array([game.stats.score for game in games], dtype=np.float64)
+        shape = (len(genes), len(seeds))
+        return fitness.reshape(shape).mean(axis=1), scores.reshape(shape).mean(axis=1)
+
     def advance_genome(self) -> bool:
         """Переход к следующему геному"""
         self.current_genome_index += 1
@@ -267,11 +507,12 @@ class GeneticSnakeAI:
 
     def evolve(self) -> None:
         """Эволюция популяции"""
-        self.population.sort(key=lambda g: g.fitness, reverse=True)
+        order = np.argsort(-self.fitness, kind="stable")
+        best = order[0]
 
-        self.best_fitness = self.population[0].fitness
-        self.avg_fitness = sum(g.fitness for g in self.population) / len(self.population)
-        self.best_genome = self.population[0].copy()
+        self.best_fitness = float(self.fitness[best])
+        self.avg_fitness = float(self.fitness.mean())
+        self.best_genome = self.population[best].copy()
 
         self.history.append(
             {
@@ -285,40 +526,59 @@ class GeneticSnakeAI:
             }
         )
 
-        new_population: list[Genome] = []
-
-        for i in range(self.elite_size):
-            elite = self.population[i].copy()
-            elite.mutate(self.mutation_rate * 0.1)
-            new_population.append(elite)
-
-        while len(new_population) < self.population_size:
-            parent1 = self._tournament_selection()
-            parent2 = self._tournament_selection()
-
-            if random.random() < self.crossover_rate:
-                child = parent1.crossover(parent2)
-            else:
-                child = parent1.copy()
-
-            child.mutate(self.mutation_rate)
-            new_population.append(child)
+        size, genome_size = self.genes.shape
+        elite_count = min(self.elite_size, size)
+        child_count = size - elite_count
+        new_genes = self._next_genes
+
+        # Элита переносится выбором по индексам
+        new_genes[:elite_count] = self.genes[order[:elite_count]]
+
+        # Потомки: турнирная селекция и одноточечное скрещивание сразу для всех
+        parents = self._tournament_indices(2 * child_count)
+        first, second = parents[:child_count], parents[child_count:]
+        children = new_genes[elite_count:]
+        np.take(self.genes, first, axis=0, out=children)
+
+        crossed = self.rng.random(child_count) < self.crossover_rate
+        midpoints = self.rng.integers(0, genome_size, child_count)
+        mask = (np.arange(genome_size) >= midpoints[:, None]) & crossed[:, None]
+        np.copyto(children, self.genes[second], where=mask)
+
+        # Мутация: элита с пониженной вероятностью
+        rates = np.full(size, self.mutation_rate, dtype=np.float32)
+        rates[:elite_count] *= 0.1
+        mutated = np.flatnonzero(
+            self.rng.random((size, genome_size), dtype=np.float32) < rates[:, None]
+        )
+        flat = new_genes.reshape(-1)
+        flat[mutated] += self.rng.normal(0, 0.5, mutated.size).astype(np.float32)
+        np.clip(new_genes, -1, 1, out=new_genes)
 
-        self.population = new_population
+        # Копирование на место сохраняет действующими представления Genome
+        np.copyto(self.genes, new_genes)
+        self.fitness[:] = 0.0
         self.generation += 1
 
-        self.save_population("genetic_population.pkl")
+        if self.checkpoints is not None:
+            self.checkpoints.save(
+                self.checkpoint_arrays(), self.checkpoint_metadata(), score=self.best_fitness
+            )
 
-    def _tournament_selection(self, tournament_size: int = 3) -> Genome:
-        """Турнирная селекция"""
-        tournament = random.sample(self.population, tournament_size)
-        return max(tournament, key=lambda g: g.fitness)
+    def _tournament_indices(self, count: int, tournament_size: int = 3) -> np.ndarray:
+        """Турнирная селекция: индексы победителей count турниров"""
+        size = len(self.fitness)
+        # Участники турнира различны (как random.sample): k наименьших случайных ключей строки
+        keys = self.rng.random((count, size))
+        candidates = np.argsort(keys, axis=1)[:, : min(tournament_size, size)]
+        winners = np.argmax(self.fitness[candidates], axis=1)
+        return candidates[np.arange(count), winners]
 
     def get_best_genome(self) -> Genome:
         """Получить лучший геном"""
         if self.best_genome is not None:
             return self.best_genome
-        return max(self.population, key=lambda g: g.fitness)
+        return self.population[int(np.argmax(self.fitness))]
 
     def get_current_genome(self) -> Genome | None:
         """Получить текущий геном для тестирования"""
@@ -341,16 +601,62 @@ class GeneticSnakeAI:
     def save_population(self, filename: str) -> None:
         """Сохранение популяции в файл"""
         data = {
-            "population": [(g.genes, g.fitness) for g in self.population],
+            "population": [(g.genes.tolist(), g.fitness) for g in self.population],
             "generation": self.generation,
             "history": self.history,
             "best_genome": (
-                (self.best_genome.genes, self.best_genome.fitness) if self.best_genome else None
+                (self.best_genome.genes.tolist(), self.best_genome.fitness)
+                if self.best_genome
+                else None
             ),
         }
         with open(filename, "wb") as f:
             pickle.dump(data, f)
 
+    def checkpoint_arrays(self) -> dict[str, np.ndarray]:
+        """Популяция в виде массивов для CheckpointManager"""
+        arrays = {"genes": self.genes, "fitness": self.fitness}
+        if self.best_genome is not None:
+            arrays["best_genes"] = self.best_genome.genes
+            arrays["best_fitness"] = np.array(self.best_genome.fitness)
+        return arrays
+
+    def checkpoint_metadata(self) -> dict:
+        """Скалярное состояние эволюции"""
+        return {"generation": self.generation, "history": self.history}
+
+    def resume(self, path: str | None = None) -> bool:
+        """Продолжить эволюцию с последней (или указанной) контрольной точки"""
+        if self.checkpoints is not None:
+            self.checkpoints.flush()
+            loaded = self.checkpoints.load(path)
+        elif path is not None and os.path.exists(path):
+            loaded = load_npz(path)
+        else:
+            loaded = None
+        if loaded is None:
+            return False
+
+        arrays, metadata = loaded
+        self._set_population(arrays["genes"], arrays["fitness"])
+
+        if "best_genes" in arrays:
+            self.best_genome = Genome(
+                genes=np.array(arrays["best_genes"], dtype=np.float32),
+                fitness=np.array([float(arrays["best_fitness"])]),
+            )
+
+        self.generation = metadata.get("generation", 0)
+        self.history = metadata.get("history", [])
+        self.current_genome_index = 0
+        self.genome_scores = []
+        return True
+
+    def close(self) -> None:
+        """Запись ожидающих контрольных точек и остановка потока записи"""
+        if self.checkpoints is not None:
+            self.checkpoints.close()
+
     def load_population(self, filename: str) -> bool:
         """Загрузка популяции из файла"""
         if not os.path.exists(filename):
@@ -360,22 +666,84 @@ class GeneticSnakeAI:
             with open(filename, "rb") as f:
                 data = pickle.load(f)
 
-            self.population = []
-            for genes, fitness in data["population"]:
-                genome = Genome(len(genes))
-                genome.genes = genes
-                genome.fitness = fitness
-                self.population.append(genome)
+            genes, fitness = zip(*data["population"])
+            self._set_population(np.array(genes), np.array(fitness))
 
             self.generation = data.get("generation", 0)
             self.history = data.get("history", [])
 
             if data.get("best_genome"):
                 genes, fitness = data["best_genome"]
-                self.best_genome = Genome(len(genes))
-                self.best_genome.genes = genes
-                self.best_genome.fitness = fitness
+                self.best_genome = Genome(
+                    genes=np.array(genes, dtype=np.float32), fitness=np.array([fitness])
+                )
 
             return True
         except Exception:
             return False
+
+
+def _get_evaluator(genome_size: int, geometry: tuple[int, int, int]) -> GeneticSnakeAI:
+    """Оценщик текущего процесса для геномов заданного размера и геометрии поля"""
+    global _evaluator
+    if (
+        _evaluator is None
+        or _evaluator.genome_size != genome_size
+        or _evaluator.geometry != geometry
+    ):
+        cell_size, field_size, field_height = geometry
+        _evaluator = GeneticSnakeAI(
+            population_size=1,
+            genome_size=genome_size,
+            cell_size=cell_size,
+            field_size=field_size,
+            field_height=field_height,
+        )
+    return _evaluator
+
+
+def _play_block(task: tuple) -> tuple[np.ndarray, np.ndarray]:
+    """Сыграть блок геномов одновременно (play_lockstep)"""
+    genes, seeds, max_steps, geometry = task
+    return _get_evaluator(genes.shape[1], geometry).play_lockstep(genes, seeds, max_steps)
+
+
+def _play_genome(task: tuple) -> tuple[float, float]:
+    """Сыграть серию игр одним геномом; возвращает средние fitness и счёт"""
+    from ..engine import Direction, GameConfig, GameState, SnakeGame
+
+    genes, seeds, max_steps, geometry = task
+    ai = _get_evaluator(len(genes), geometry)
+    genome = Genome(genes=genes)
+    cell = ai.cell_size
+    config = GameConfig(width=ai.field_size // cell, height=ai.field_height // cell, speed_ms=0)
+    directions = {
+        "Up": Direction.UP,
+        "Down": Direction.DOWN,
+        "Left": Direction.LEFT,
+        "Right": Direction.RIGHT,
+    }
+
+    total_fitness = 0.0
+    total_score = 0
+    for seed in seeds:
+        random.seed(seed)
+        game = SnakeGame(config)
+        steps = 0
+        while game.state == GameState.RUNNING and steps < max_steps:
+            snake = [(x * cell, y * cell) for x, y in game.snake]
+            food = (game.food[0] * cell, game.food[1] * cell) if game.food else snake[0]
+            obstacles = [(x * cell, y * cell) for x, y in game.obstacles]
+
+            decision = ai.get_decision(genome, snake, food, obstacles)
+            if decision:
+                game.set_direction(directions[decision])
+            game.update()
+            steps += 1
+
+        total_fitness += ai.calculate_fitness(
+            game.stats.score, steps, len(game.snake), game.stats.food_eaten, steps
+        )
+        total_score += game.stats.score
+
+    return total_fitness / len(seeds), total_score / len(seeds)
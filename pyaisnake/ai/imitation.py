@@ -0,0 +1,226 @@
+"""
+Imitation learning: distil a search player into a small policy network.
+
+build_dataset plays seeded headless games with a teacher - any player create_ai
+knows, A* by default - across worker processes and records what it saw
+and what it did: a compact observation (observe) and the action index. The
+pairs are stored as float16/uint8 arrays in an .npz archive.
+
+train_policy fits a one-hidden-layer softmax classifier to the pairs with
+plain NumPy and returns an MLPInference, so the student plays through the same
+float32 forward pass as the exported neural model: one small matmul per move
+instead of a search. Observations are normalised by the board size, so a
+student trained on one board plays on others.
+"""
+
+import json
+import multiprocessing as mp
+import random
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from ..engine import Direction, GameConfig, GameState, SnakeGame
+from .analysis import DELTAS
+from .checkpoint import META_KEY, load_npz
+from .inference import MLPInference
+from .players import create_ai
+
+ACTIONS = list(DELTAS)
+N_FEATURES = 15
+
+
+@dataclass
+class ImitationConfig:
+    """Settings for building a dataset and training the student"""
+
+    teacher: str = "a_star"
+    games: int = 200
+    workers: int = 4
+    width: int = 20
+    height: int = 20
+    max_steps: int = 1000
+    seed: int = 0
+    hidden_size: int = 64
+    epochs: int = 20
+    batch_size: int = 256
+    learning_rate: float = 0.05
+    momentum: float = 0.9
+
+
+def observe(game: SnakeGame) -> np.ndarray:
+    """
+    Observation vector for the player to move.
+
+    [0:4]   free run from the head towards UP, DOWN, LEFT, RIGHT / board size
+            (0 means that move collides)
+    [4:8]   current direction, one-hot
+    [8:10]  food offset from the head / board size
+    [10:14] food is left, right, above, below the head
+    [14]    snake length / board cells
+    """
+    width, height = game.config.width, game.config.height
+    size = max(width, height)
+    head = game.snake[0]
+    blocked = set(game.snake) | game.obstacles
+    obs = np.zeros(N_FEATURES, dtype=np.float32)
+
+    for i, (dx, dy) in enumerate(DELTAS.values()):
+        x, y = head[0] + dx, head[1] + dy
+        run = 0
+        while 0 <= x < width and 0 <= y < height and (x, y) not in blocked:
+            run += 1
+            x, y = x + dx, y + dy
+        obs[i] = run / size
+
+    obs[4 + ACTIONS.index(game.direction)] = 1.0
+
+    if game.food:
+        dx, dy = game.food[0] - head[0], game.food[1] - head[1]
+        obs[8] = dx / size
+        obs[9] = dy / size
+        obs[10:14] = (dx < 0, dx > 0, dy < 0, dy > 0)
+
+    obs[14] = len(game.snake) / (width * height)
+    return obs
+
+
+def play_teacher(config: ImitationConfig, game_ids: list[int]) -> tuple[np.ndarray, np.ndarray]:
+    """Observations and teacher actions from the given games, each seeded by its id"""
+    game_config = GameConfig(width=config.width, height=config.height, speed_ms=0)
+    observations: list[np.ndarray] = []
+    actions: list[int] = []
+
+    for game_id in game_ids:
+        random.seed(config.seed * 1_000_003 + game_id)
+        game = SnakeGame(game_config)
+        teacher = create_ai(config.teacher, game)
+        steps = 0
+        while game.state == GameState.RUNNING and steps < config.max_steps:
+            direction = teacher.get_direction()
+            if direction is None:
+                break
+            observations.append(observe(game))
+            actions.append(ACTIONS.index(direction))
+            game.set_direction(direction)
+            game.update()
+            steps += 1
+
+    return (
+        np.array(observations, dtype=np.float32).reshape(-1, N_FEATURES),
+        np.array(actions, dtype=np.uint8),
+    )
+
+
+def _play_teacher_task(task: tuple[ImitationConfig, list[int]]) -> tuple[np.ndarray, np.ndarray]:
+    return play_teacher(*task)
+
+
+def build_dataset(config: ImitationConfig) -> tuple[np.ndarray, np.ndarray]:
+    """Teacher play from config.games seeded games, split across config.workers processes"""
+    workers = max(1, min(config.workers, config.games))
+    chunks = [list(range(i, config.games, workers)) for i in range(workers)]
+
+    if workers == 1:
+        results = [play_teacher(config, chunks[0])]
+    else:
+        with mp.get_context().Pool(workers) as pool:
+            results = pool.map(_play_teacher_task, [(config, chunk) for chunk in chunks])
+
+    observations = np.concatenate([obs for obs, _ in results])
+    actions = np.concatenate([act for _, act in results])
+    return observations, actions
+
+
+def save_dataset(
+    path: str | Path, observations: np.ndarray, actions: np.ndarray, config: ImitationConfig
+) -> None:
+    metadata = {
+        "teacher": config.teacher,
+        "games": config.games,
+        "width": config.width,
+        "height": config.height,
+        "seed": config.seed,
+    }
+    np.savez(
+        path,
+        observations=observations.astype(np.float16),
+        actions=actions.astype(np.uint8),
+        **{META_KEY: np.array(json.dumps(metadata))},
+    )
+
+
+def load_dataset(path: str | Path, mmap: bool = False) -> tuple[np.ndarray, np.ndarray, dict]:
+    arrays, metadata = load_npz(path, mmap=mmap)
+    return arrays["observations"], arrays["actions"], metadata
+
+
+def train_policy(
+    observations: np.ndarray, actions: np.ndarray, config: ImitationConfig
+) -> tuple[MLPInference, float]:
+    """Fit a softmax policy with SGD and momentum; returns it and its training accuracy"""
+    rng = np.random.default_rng(config.seed)
+    x = np.asarray(observations, dtype=np.float32)
+    y = np.asarray(actions, dtype=np.int64)
+
+    mean = x.mean(axis=0)
+    scale = x.std(axis=0)
+    scale[scale == 0] = 1.0
+    x = (x - mean) / scale
+
+    n_in, n_out = x.shape[1], len(ACTIONS)
+    params = [
+        rng.standard_normal((n_in, config.hidden_size)).astype(np.float32) * np.sqrt(2 / n_in),
+        np.zeros(config.hidden_size, dtype=np.float32),
+        rng.standard_normal((config.hidden_size, n_out)).astype(np.float32)
+        * np.sqrt(1 / config.hidden_size),
+        np.zeros(n_out, dtype=np.float32),
+    ]
+    velocity = [np.zeros_like(p) for p in params]
+
+    for _ in range(config.epochs):
+        order = rng.permutation(len(x))
+        for start in range(0, len(x), config.batch_size):
+            batch = order[start : start + config.batch_size]
+            w1, b1, w2, b2 = params
+
+            z1 = x[batch] @ w1 + b1
+            a1 = np.maximum(z1, 0)
+            logits = a1 @ w2 + b2
+            logits -= logits.max(axis=1, keepdims=True)
+            probs = np.exp(logits)
+            probs /= probs.sum(axis=1, keepdims=True)
+
+            # Cross-entropy gradient
+            d_logits = probs
+            d_logits[np.arange(len(batch)), y[batch]] -= 1
+            d_logits /= len(batch)
+            d_z1 = (d_logits @ w2.T) * (z1 > 0)
+            grads = [x[batch].T @ d_z1, d_z1.sum(axis=0), a1.T @ d_logits, d_logits.sum(axis=0)]
+
+            for param, grad, vel in zip(params, grads, velocity):
+                vel *= config.momentum
+                vel -= config.learning_rate * grad
+                param += vel
+
+    w1, b1, w2, b2 = params
+    policy = MLPInference.from_arrays([w1, w2], [b1, b2], mean, scale, "relu", "identity")
+    accuracy = float(np.mean(np.argmax(policy.predict(observations), axis=1) == y))
+    return policy, accuracy
+
+
+class ImitationAI:
+    """Plays the distilled policy; moves that collide on this tick are masked out"""
+
+    def __init__(self, game: SnakeGame, policy: MLPInference):
+        self.game = game
+        self.policy = policy
+
+    def get_direction(self, deadline: float | None = None) -> Direction | None:
+        obs = observe(self.game)
+        safe = obs[:4] > 0
+        if not safe.any():
+            return None
+        logits = np.where(safe, self.policy.predict(obs), -np.inf)
+        return ACTIONS[int(np.argmax(logits))]
@@ -0,0 +1,206 @@
+"""
+Inference-only execution of trained policies.
+
+DQNetwork.forward allocates every intermediate array and works on one state at a
+time, which is fine for training but wasteful during play. DQNInferenceEngine
+keeps float32 copies of the weights and preallocated activation buffers for a
+fixed maximum batch, so a forward pass over many games performs no allocations.
+
+MLPInference does the same for NeuralSnakeAI's sklearn MLPRegressor: the
+StandardScaler is folded into the first layer and the network is stored as a
+plain .npz archive that loads without importing sklearn.
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from .checkpoint import META_KEY, load_npz
+from .dqn import DQNetwork
+
+_ACTIVATIONS = {
+    "identity": lambda h: h,
+    "relu": lambda h: np.maximum(h, 0, out=h),
+    "tanh": lambda h: np.tanh(h, out=h),
+    "logistic": lambda h: np.reciprocal(1 + np.exp(-h, out=h), out=h),
+}
+
+
+class DQNInferenceEngine:
+    """Batched, allocation-free forward pass for a DQNetwork"""
+
+    def __init__(self, net: DQNetwork, max_batch: int = 64):
+        self.max_batch = max_batch
+        self.input_size, self.hidden_size = net.w1.shape
+        self.output_size = net.w3.shape[1]
+
+        self._x = np.empty((max_batch, self.input_size), dtype=np.float32)
+        self._h1 = np.empty((max_batch, self.hidden_size), dtype=np.float32)
+        self._h2 = np.empty((max_batch, self.hidden_size), dtype=np.float32)
+        self._q = np.empty((max_batch, self.output_size), dtype=np.float32)
+        self._actions = np.empty(max_batch, dtype=np.intp)
+
+        self.w1 = np.empty((self.input_size, self.hidden_size), dtype=np.float32)
+        self.b1 = np.empty(self.hidden_size, dtype=np.float32)
+        self.w2 = np.empty((self.hidden_size, self.hidden_size), dtype=np.float32)
+        self.b2 = np.empty(self.hidden_size, dtype=np.float32)
+        self.w3 = np.empty((self.hidden_size, self.output_size), dtype=np.float32)
+        self.b3 = np.empty(self.output_size, dtype=np.float32)
+        self.load(net)
+
+    def load(self, net: DQNetwork) -> None:
+        """Copy (and cast) weights from a network, reusing existing storage"""
+        for name in DQNetwork.PARAM_NAMES:
+            getattr(self, name)[...] = getattr(net, name)
+
+    def q_values(self, states: np.ndarray) -> np.ndarray:
+        """
+        Q-values for up to max_batch states.
+
+        The result is a view into an internal buffer and is overwritten by the
+        next call; copy it if it must outlive that.
+        """
+        states = np.asarray(states)
+        if states.ndim == 1:
+            states = states[None, :]
+
+        n = len(states)
+        if n > self.max_batch:
+            raise ValueError(f"Batch of {n} exceeds max_batch={self.max_batch}")
+
+        x = self._x[:n]
+        h1 = self._h1[:n]
+        h2 = self._h2[:n]
+        q = self._q[:n]
+
+        x[...] = states
+        np.matmul(x, self.w1, out=h1)
+        h1 += self.b1
+        np.maximum(h1, 0, out=h1)
+        np.matmul(h1, self.w2, out=h2)
+        h2 += self.b2
+        np.maximum(h2, 0, out=h2)
+        np.matmul(h2, self.w3, out=q)
+        q += self.b3
+        return q
+
+    def predict_batch(self, states: np.ndarray) -> np.ndarray:
+        """Greedy action for every state; batches larger than max_batch are chunked"""
+        states = np.asarray(states)
+        n = len(states)
+        if n <= self.max_batch:
+            actions = self._actions[:n]
+            np.argmax(self.q_values(states), axis=1, out=actions)
+            return actions
+
+        actions = np.empty(n, dtype=np.intp)
+        for start in range(0, n, self.max_batch):
+            chunk = states[start : start + self.max_batch]
+            np.argmax(self.q_values(chunk), axis=1, out=actions[start : start + len(chunk)])
+        return actions
+
+    def predict(self, state: np.ndarray) -> int:
+        """Greedy action for a single state"""
+        q = self.q_values(state)
+        return int(np.argmax(q[0]))
+
+
+class MLPInference:
+    """float32 forward pass of a trained MLPRegressor with its scaler folded in"""
+
+    def __init__(
+        self,
+        coefs: list[np.ndarray],
+        intercepts: list[np.ndarray],
+        activation: str = "relu",
+        out_activation: str = "identity",
+    ):
+        if activation not in _ACTIVATIONS or out_activation not in _ACTIVATIONS:
+            raise ValueError(f"Unsupported activation: {activation}/{out_activation}")
+        self.coefs = [np.asarray(c, dtype=np.float32) for c in coefs]
+        self.intercepts = [np.asarray(b, dtype=np.float32) for b in intercepts]
+        self.activation = activation
+        self.out_activation = out_activation
+
+    @classmethod
+    def from_arrays(
+        cls,
+        coefs: list[np.ndarray],
+        intercepts: list[np.ndarray],
+        mean: np.ndarray,
+        scale: np.ndarray,
+        activation: str = "relu",
+        out_activation: str = "identity",
+    ) -> "MLPInference":
+        """
+        Fold (x - mean) / scale into the first layer.
+
+        (x - m) / s @ W + b == x @ (W / s[:, None]) + (b - (m / s) @ W)
+        """
+        first = np.asarray(coefs[0], dtype=np.float64)
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+
+        folded_coef = first / scale[:, None]
+        folded_intercept = np.asarray(intercepts[0], dtype=np.float64) - (mean / scale) @ first
+        return cls(
+            [folded_coef, *coefs[1:]],
+            [folded_intercept, *intercepts[1:]],
+            activation,
+            out_activation,
+        )
+
+    @classmethod
+    def from_sklearn(cls, model, scaler) -> "MLPInference":
+        """Compile a fitted MLPRegressor and StandardScaler"""
+        return cls.from_arrays(
+            model.coefs_,
+            model.intercepts_,
+            scaler.mean_,
+            scaler.scale_,
+            model.activation,
+            model.out_activation_,
+        )
+
+    def save(self, path: str | Path) -> None:
+        arrays = {}
+        for i, (coef, intercept) in enumerate(zip(self.coefs, self.intercepts)):
+            arrays[f"coef_{i}"] = coef
+            arrays[f"intercept_{i}"] = intercept
+        metadata = {
+            "n_layers": len(self.coefs),
+            "activation": self.activation,
+            "out_activation": self.out_activation,
+        }
+        np.savez(path, **arrays, **{META_KEY: np.array(json.dumps(metadata))})
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = False) -> "MLPInference":
+        arrays, metadata = load_npz(path, mmap=mmap)
+        n_layers = metadata["n_layers"]
+        return cls(
+            [arrays[f"coef_{i}"] for i in range(n_layers)],
+            [arrays[f"intercept_{i}"] for i in range(n_layers)],
+            metadata["activation"],
+            metadata["out_activation"],
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self.coefs + self.intercepts)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """Outputs for one feature vector or a (batch, features) matrix"""
+        x = np.asarray(features, dtype=np.float32)
+        single = x.ndim == 1
+        h = x[None, :] if single else x
+
+        hidden = _ACTIVATIONS[self.activation]
+        last = len(self.coefs) - 1
+        for i, (coef, intercept) in enumerate(zip(self.coefs, self.intercepts)):
+            h = h @ coef
+            h += intercept
+            h = _ACTIVATIONS[self.out_activation](h) if i == last else hidden(h)
+
+        return h[0] if single else h
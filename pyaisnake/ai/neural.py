@@ -1,13 +1,14 @@
 import math
 import os
 import pickle
-import random
+import threading
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
-from sklearn.metrics import mean_squared_error
-from sklearn.model_selection import train_test_split
-from sklearn.neural_network import MLPRegressor
-from sklearn.preprocessing import StandardScaler
+
+from .checkpoint import load_npz
+from .feature_store import FeatureStore
+from .inference import MLPInference
 
 
 class NeuralSnakeAI:
@@ -15,40 +16,75 @@ class NeuralSnakeAI:
 
     DIRECTIONS = ["Up", "Down", "Left", "Right"]
     DIRECTION_TO_INDEX = {"Up": 0, "Down": 1, "Left": 2, "Right": 3}
-
-    def __init__(self, hidden_layers=(100, 50, 25)):
-        self.model = MLPRegressor(
-            hidden_layer_sizes=hidden_layers,
-            max_iter=1000,
-            random_state=42,
-            learning_rate="adaptive",
-            early_stopping=True,
-            validation_fraction=0.1,
-        )
-        self.scaler = StandardScaler()
-        self.training_data: list = []
+    CELL_SIZE = 10
+    FIELD_SIZE = 400
+    # 9 общих + 4 препятствия + 2 тело + 4 оценки направлений
+    N_FEATURES = 19
+
+    def __init__(
+        self,
+        hidden_layers=(100, 50, 25),
+        checkpoints=None,
+        cell_size=CELL_SIZE,
+        field_size=FIELD_SIZE,
+        field_height=None,
+        store_path=None,
+    ):
+        # sklearn импортируется лениво: для игры достаточно скомпилированной
+        # NumPy-модели (self.inference), MLPRegressor нужен только для обучения
+        self.hidden_layers = hidden_layers
+        self.model = None
+        self.scaler = None
+        self.inference = None
         self.is_trained = False
         self.model_file = "neural_snake_model.pkl"
         self.scaler_file = "neural_snake_scaler.pkl"
+        self.inference_file = "neural_model.npz"
 
         self.min_training_samples = 100
         self.max_training_samples = 10000
         self.retrain_threshold = 0.1
+        self.batch_size = 200
+
+        # Признаки извлекаются один раз при добавлении примера; с store_path
+        # столбцы лежат в memory-mapped .npy и переживают перезапуск
+        self.store = FeatureStore(self.max_training_samples, self.N_FEATURES, store_path)
+        self._fitted_total = 0
+
+        # Фоновое обучение: процесс создаётся при первом retrain_async,
+        # каждая опубликованная модель увеличивает model_version
+        self.model_version = 0
+        self._executor = None
+        self._retrain_done = threading.Event()
+        self._retrain_done.set()
+
+        # Без CheckpointManager контрольные точки не сохраняются
+        self.checkpoints = checkpoints
+
+        # Геометрия поля: по умолчанию пиксели 400×400 с клеткой 10,
+        # для координат движка — cell_size=1 и размеры поля в клетках
+        self.cell_size = cell_size
+        self.field_size = field_size
+        self.field_height = field_height if field_height is not None else field_size
 
     def extract_features(self, snake, food, obstacles):
         """Извлечение признаков для нейросети"""
         head = snake[0]
+        size = self.field_size
+        # Множества дают O(1) проверку занятости клеток
+        snake_cells = set(snake)
+        obstacle_cells = set(obstacles)
 
         features = [
-            math.sqrt((food[0] - head[0]) ** 2 + (food[1] - head[1]) ** 2) / 400,
+            math.sqrt((food[0] - head[0]) ** 2 + (food[1] - head[1]) ** 2) / size,
             len(snake) / 100,
             len(obstacles) / 50,
             self.calculate_free_space(snake, obstacles) / 1600,
-            len(self.get_safe_directions(snake, food, obstacles)) / 4,
-            head[0] / 400,
-            head[1] / 400,
-            (food[0] - head[0]) / 400,
-            (food[1] - head[1]) / 400,
+            len(self.get_safe_directions(snake_cells, food, obstacle_cells, head)) / 4,
+            head[0] / size,
+            head[1] / size,
+            (food[0] - head[0]) / size,
+            (food[1] - head[1]) / size,
         ]
 
         obstacle_features = self.get_obstacle_features(head, obstacles)
@@ -57,7 +93,7 @@ class NeuralSnakeAI:
         body_features = self.get_body_features(snake)
         features.extend(body_features)
 
-        direction_features = self.get_direction_scores(head, food, snake, obstacles)
+        direction_features = self.get_direction_scores(head, food, snake_cells, obstacle_cells)
         features.extend(direction_features)
 
         return np.array(features)
@@ -73,76 +109,62 @@ class NeuralSnakeAI:
                 new_distance = math.sqrt(
                     (food[0] - next_pos[0]) ** 2 + (food[1] - next_pos[1]) ** 2
                 )
-                scores.append(1.0 - new_distance / 400)
+                scores.append(1.0 - new_distance / self.field_size)
         return scores
 
     def get_obstacle_features(self, head, obstacles):
         """Получение признаков препятствий"""
+        if not obstacles:
+            return [1.0] * len(self.DIRECTIONS)
+
+        cells = np.asarray(list(obstacles), dtype=np.float64).reshape(-1, 2)
+        dx = cells[:, 0] - head[0]
+        dy = cells[:, 1] - head[1]
+        same_column = dx == 0
+        same_row = dy == 0
+
         features = []
-        for direction in self.DIRECTIONS:
-            distance = self.get_distance_to_obstacle(head, obstacles, direction)
-            features.append(distance / 400)
+        for along, offsets in (
+            (same_column, -dy),  # Up
+            (same_column, dy),  # Down
+            (same_row, -dx),  # Left
+            (same_row, dx),  # Right
+        ):
+            ahead = offsets[along & (offsets > 0)]
+            distance = ahead.min() if ahead.size else self.field_size
+            features.append(distance / self.field_size)
         return features
 
     def get_body_features(self, snake):
         """Получение признаков тела змеи"""
-        head = snake[0]
-        features = []
-
-        min_distance = float("inf")
-        for segment in snake[1:]:
-            distance = math.sqrt((segment[0] - head[0]) ** 2 + (segment[1] - head[1]) ** 2)
-            min_distance = min(min_distance, distance)
-
-        features.append(min_distance / 400 if min_distance != float("inf") else 1.0)
-
-        radius = 50
-        nearby_segments = 0
-        for segment in snake[1:]:
-            distance = math.sqrt((segment[0] - head[0]) ** 2 + (segment[1] - head[1]) ** 2)
-            if distance <= radius:
-                nearby_segments += 1
+        if len(snake) < 2:
+            return [1.0, 0.0]
 
-        features.append(nearby_segments / 10)
+        head = snake[0]
+        body = np.asarray(snake[1:], dtype=np.float64)
+        distances = np.hypot(body[:, 0] - head[0], body[:, 1] - head[1])
 
-        return features
+        radius = 5 * self.cell_size
+        return [
+            float(distances.min()) / self.field_size,
+            int(np.count_nonzero(distances <= radius)) / 10,
+        ]
 
     def get_distance_to_obstacle(self, head, obstacles, direction):
         """Получение расстояния до ближайшего препятствия в направлении"""
-        x, y = head
-        cell_size = 10
-        dx, dy = 0, 0
-
-        if direction == "Up":
-            dx, dy = 0, -cell_size
-        elif direction == "Down":
-            dx, dy = 0, cell_size
-        elif direction == "Left":
-            dx, dy = -cell_size, 0
-        elif direction == "Right":
-            dx, dy = cell_size, 0
-
-        distance = 0
-        current_pos = (x, y)
-
-        while 0 <= current_pos[0] < 400 and 0 <= current_pos[1] < 400:
-            current_pos = (current_pos[0] + dx, current_pos[1] + dy)
-            distance += cell_size
-
-            if current_pos in obstacles:
-                return distance
-
-        return 400
+        # Тот же векторный расчёт, что и в get_obstacle_features, без пошагового луча
+        index = self.DIRECTION_TO_INDEX[direction]
+        return self.get_obstacle_features(head, obstacles)[index] * self.field_size
 
     def calculate_free_space(self, snake, obstacles):
         """Подсчет свободного пространства"""
-        total_cells = (400 // 10) * (400 // 10)
+        total_cells = (self.field_size // self.cell_size) * (self.field_height // self.cell_size)
         occupied = len(snake) + len(obstacles)
         return total_cells - occupied
 
-    def get_safe_directions(self, snake, food, obstacles):
+    def get_safe_directions(self, snake, food, obstacles, head=None):
         """Получить безопасные направления движения"""
-        head = snake[0]
+        head = head if head is not None else snake[0]
         safe_dirs = []
 
         for direction in self.DIRECTIONS:
@@ -155,7 +177,7 @@ class NeuralSnakeAI:
     def get_next_position(self, pos, direction):
         """Получить следующую позицию при движении"""
         x, y = pos
-        cell_size = 10
+        cell_size = self.cell_size
 
         if direction == "Up":
             return (x, y - cell_size)
@@ -171,7 +193,7 @@ class NeuralSnakeAI:
         """Проверка валидности позиции"""
         x, y = pos
 
-        if x < 0 or x >= 400 or y < 0 or y >= 400:
+        if x < 0 or x >= self.field_size or y < 0 or y >= self.field_height:
             return False
 
         if pos in snake:
@@ -185,7 +207,7 @@ class NeuralSnakeAI:
             return self._heuristic_fallback(snake, food, obstacles)
 
         try:
-            safe_dirs = self.get_safe_directions(snake, food, obstacles)
+            safe_dirs = self.get_safe_directions(set(snake), food, set(obstacles), snake[0])
             if not safe_dirs:
                 return None
 
@@ -193,27 +215,37 @@ class NeuralSnakeAI:
                 return safe_dirs[0]
 
             features = self.extract_features(snake, food, obstacles)
+            predicted = self.predict_action_values(features)
 
-            direction_scores = features[-4:]
+            return max(safe_dirs, key=lambda d: predicted[self.DIRECTION_TO_INDEX[d]])
 
-            best_dir = None
-            best_score = float("-inf")
+        except Exception as e:
+            print(f"Ошибка предсказания: {e}")
+            return self._heuristic_fallback(snake, food, obstacles)
 
-            for direction in safe_dirs:
-                idx = self.DIRECTION_TO_INDEX[direction]
-                score = direction_scores[idx]
-                if score > best_score:
-                    best_score = score
-                    best_dir = direction
+    def predict_action_values(self, features):
+        """Ожидаемая награда каждого направления по обученной модели"""
+        return self.inference.predict(features)
 
-            if best_dir and best_score > 0:
-                return best_dir
+    @staticmethod
+    def _create_model(hidden_layers, activation="relu"):
+        """Новый MLPRegressor с настройками обучения проекта"""
+        from sklearn.neural_network import MLPRegressor
 
-            return self._heuristic_fallback(snake, food, obstacles)
+        return MLPRegressor(
+            hidden_layer_sizes=hidden_layers,
+            activation=activation,
+            max_iter=1000,
+            random_state=42,
+            learning_rate="adaptive",
+            early_stopping=True,
+            validation_fraction=0.1,
+        )
 
-        except Exception as e:
-            print(f"Ошибка предсказания: {e}")
-            return self._heuristic_fallback(snake, food, obstacles)
+    def compile_inference(self):
+        """Сборка NumPy-модели из обученных MLPRegressor и StandardScaler"""
+        self.inference = MLPInference.from_sklearn(self.model, self.scaler)
+        return self.inference
 
     def _heuristic_fallback(self, snake, food, obstacles):
         """Эвристический fallback при отсутствии обученной модели"""
@@ -240,58 +272,135 @@ class NeuralSnakeAI:
 
         return best_dir or safe_dirs[0]
 
-    def train(self, training_data):
-        """Обучение нейросети с улучшенной подготовкой данных"""
-        if len(training_data) < self.min_training_samples:
+    def train(self, training_data=None):
+        """Полное обучение нейросети на всех примерах хранилища"""
+        if training_data is not None:
+            for state, action, reward in training_data:
+                self.store.append(
+                    self.extract_features(*state), self.DIRECTION_TO_INDEX.get(action, -1), reward
+                )
+
+        if len(self.store) < self.min_training_samples:
             print(
-                f"Недостаточно данных для обучения: {len(training_data)} < {self.min_training_samples}"
+                f"Недостаточно данных для обучения: {len(self.store)} < {self.min_training_samples}"
             )
             return False
 
         try:
-            X = []
-            y = []
-
-            for state, action, reward in training_data:
-                features = self.extract_features(*state)
-                X.append(features)
-
-                action_score = np.zeros(4)
-                if action in self.DIRECTION_TO_INDEX:
-                    idx = self.DIRECTION_TO_INDEX[action]
-                    action_score[idx] = reward
-                y.append(action_score)
+            task = self._retrain_task(full=True)
+            self._publish(*_run_retrain(task), task[-1])
+            return True
 
-            if len(X) > self.max_training_samples:
-                indices = random.sample(range(len(X)), self.max_training_samples)
-                X = [X[i] for i in indices]
-                y = [y[i] for i in indices]
+        except Exception as e:
+            print(f"Ошибка обучения: {e}")
+            return False
 
-            X = np.array(X)
-            y = np.array(y)
+    def partial_train(self):
+        """Дообучение на примерах, добавленных после последнего обучения"""
+        if self._needs_full_fit():
+            return self.train()
+        if self.store.total == self._fitted_total:
+            return False
 
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.2, random_state=42
-            )
+        try:
+            task = self._retrain_task(full=False)
+            self._publish(*_run_retrain(task), task[-1])
+            return True
 
-            X_train_scaled = self.scaler.fit_transform(X_train)
-            X_test_scaled = self.scaler.transform(X_test)
+        except Exception as e:
+            print(f"Ошибка дообучения: {e}")
+            return False
 
-            self.model.fit(X_train_scaled, y_train)
+    def _needs_full_fit(self):
+        # Модель из контрольной точки не хранит состояние оптимизатора
+        return not self.is_trained or not hasattr(self.model, "loss_curve_")
+
+    def _retrain_task(self, full):
+        """Снимок данных и модели для обучения, в том числе в другом процессе"""
+        if full:
+            features, actions, rewards = self.store.arrays()
+        else:
+            features, actions, rewards = self.store.since(self._fitted_total)
+
+        return (
+            full,
+            None if full else self.model,
+            None if full else self.scaler,
+            self.hidden_layers,
+            features,
+            self._targets(actions, rewards),
+            self.batch_size,
+            self.store.total,
+        )
 
-            y_pred = self.model.predict(X_test_scaled)
-            mse = mean_squared_error(y_test, y_pred)
+    def _publish(self, model, scaler, mse, fitted_total):
+        """Атомарная замена модели: игра видит либо старую, либо новую версию"""
+        inference = MLPInference.from_sklearn(model, scaler)
+
+        self.model = model
+        self.scaler = scaler
+        self._fitted_total = fitted_total
+        # Одно присваивание ссылки: predict_action_values читает self.inference один раз
+        self.inference = inference
+        self.model_version += 1
+        self.is_trained = True
+
+        print(f"Модель обучена (версия {self.model_version}). MSE: {mse:.4f}")
+        if self.checkpoints is not None:
+            self.checkpoints.save(self.checkpoint_arrays(), self.checkpoint_metadata(), score=-mse)
+
+    def retrain_async(self):
+        """
+        Запуск обучения в фоновом процессе без остановки игры.
+
+        По завершении новая версия модели подменяется атомарно; возвращает False,
+        если обучение уже идёт или новых данных недостаточно.
+        """
+        if not self._retrain_done.is_set():
+            return False
 
-            print(f"Модель обучена. MSE: {mse:.4f}")
-            self.is_trained = True
+        full = self._needs_full_fit()
+        if full and len(self.store) < self.min_training_samples:
+            return False
+        if not full and self.store.total - self._fitted_total < self.min_training_samples:
+            return False
 
-            self.save_model()
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=1)
 
-            return True
+        task = self._retrain_task(full)
+        self._retrain_done.clear()
+        future = self._executor.submit(_run_retrain, task)
+        future.add_done_callback(lambda done: self._finish_retrain(done, task[-1]))
+        return True
 
+    def _finish_retrain(self, future, fitted_total):
+        """Публикация результата фонового обучения (поток обратного вызова)"""
+        try:
+            self._publish(*future.result(), fitted_total)
         except Exception as e:
-            print(f"Ошибка обучения: {e}")
-            return False
+            print(f"Ошибка фонового обучения: {e}")
+        finally:
+            self._retrain_done.set()
+
+    def wait_retrain(self, timeout=None):
+        """Ожидание публикации фонового обучения; True, если оно завершилось"""
+        return self._retrain_done.wait(timeout)
+
+    def close(self):
+        """Остановка фонового обучения и запись ожидающих контрольных точек"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self.checkpoints is not None:
+            self.checkpoints.close()
+
+    def _targets(self, actions, rewards):
+        """Целевые значения: награда в позиции выбранного направления"""
+        y = np.zeros((len(actions), len(self.DIRECTIONS)), dtype=np.float32)
+        known = np.flatnonzero(actions >= 0)
+        y[known, actions[known]] = rewards[known]
+        return y
 
     def add_training_data(self, snake, food, obstacles, action, reward):
         """Добавление данных для обучения с автоматическим расчётом награды"""
@@ -318,10 +427,11 @@ class NeuralSnakeAI:
                 elif escape_routes == 1:
                     reward -= 2
 
-        self.training_data.append(((list(snake), food, list(obstacles)), action, reward))
-
-        if len(self.training_data) > self.max_training_samples:
-            self.training_data = self.training_data[-self.max_training_samples :]
+        self.store.append(
+            self.extract_features(snake, food, obstacles),
+            self.DIRECTION_TO_INDEX.get(action, -1),
+            reward,
+        )
 
     def save_model(self):
         """Сохранение обученной модели"""
@@ -332,6 +442,7 @@ class NeuralSnakeAI:
             with open(self.scaler_file, "wb") as f:
                 pickle.dump(self.scaler, f)
 
+            self.store.flush()
             print("Модель сохранена")
         except Exception as e:
             print(f"Ошибка сохранения модели: {e}")
@@ -346,6 +457,7 @@ class NeuralSnakeAI:
                 with open(self.scaler_file, "rb") as f:
                     self.scaler = pickle.load(f)
 
+                self.compile_inference()
                 self.is_trained = True
                 print("Модель загружена")
                 return True
@@ -354,22 +466,174 @@ class NeuralSnakeAI:
 
         return False
 
+    def export_inference(self, path=None):
+        """Сохранение NumPy-модели в .npz для игры без sklearn"""
+        if self.inference is None:
+            raise RuntimeError("Модель не обучена")
+        self.inference.save(path or self.inference_file)
+
+    def load_inference(self, path=None, mmap=False):
+        """Загрузка NumPy-модели; sklearn при этом не импортируется"""
+        path = path or self.inference_file
+        if not os.path.exists(path):
+            return False
+
+        self.inference = MLPInference.load(path, mmap=mmap)
+        self.is_trained = True
+        return True
+
+    def checkpoint_arrays(self):
+        """Веса сети и параметры нормализации в виде массивов"""
+        arrays = {
+            "scaler_mean": self.scaler.mean_,
+            "scaler_scale": self.scaler.scale_,
+        }
+        for i, (coef, intercept) in enumerate(zip(self.model.coefs_, self.model.intercepts_)):
+            arrays[f"coef_{i}"] = coef
+            arrays[f"intercept_{i}"] = intercept
+        return arrays
+
+    def checkpoint_metadata(self):
+        """Архитектура сети для восстановления модели"""
+        return {
+            "n_layers": len(self.model.coefs_),
+            "hidden_layer_sizes": list(self.model.hidden_layer_sizes),
+            "activation": self.model.activation,
+            "out_activation": self.model.out_activation_,
+        }
+
+    def load_checkpoint(self, path=None, mmap=False):
+        """Восстановление обученной модели из контрольной точки"""
+        if self.checkpoints is not None:
+            self.checkpoints.flush()
+            loaded = self.checkpoints.load(path, mmap=mmap)
+        elif path is not None and os.path.exists(path):
+            loaded = load_npz(path, mmap=mmap)
+        else:
+            loaded = None
+        if loaded is None:
+            return False
+
+        arrays, metadata = loaded
+        n_layers = metadata["n_layers"]
+        coefs = [arrays[f"coef_{i}"] for i in range(n_layers)]
+        intercepts = [arrays[f"intercept_{i}"] for i in range(n_layers)]
+
+        self.inference = MLPInference.from_arrays(
+            coefs,
+            intercepts,
+            arrays["scaler_mean"],
+            arrays["scaler_scale"],
+            metadata["activation"],
+            metadata["out_activation"],
+        )
+        self.is_trained = True
+
+        # Для дообучения восстанавливаем и объекты sklearn, если он установлен
+        try:
+            from sklearn.preprocessing import StandardScaler
+        except ImportError:
+            return True
+
+        model = self._create_model(
+            tuple(metadata["hidden_layer_sizes"]), activation=metadata["activation"]
+        )
+        model.coefs_ = coefs
+        model.intercepts_ = intercepts
+        model.n_layers_ = n_layers + 1
+        model.n_outputs_ = model.coefs_[-1].shape[1]
+        model.n_features_in_ = model.coefs_[0].shape[0]
+        model.out_activation_ = metadata["out_activation"]
+
+        scaler = StandardScaler()
+        scaler.mean_ = arrays["scaler_mean"]
+        scaler.scale_ = arrays["scaler_scale"]
+        scaler.var_ = arrays["scaler_scale"] ** 2
+        scaler.n_features_in_ = len(scaler.mean_)
+
+        self.model = model
+        self.scaler = scaler
+        return True
+
     def get_training_stats(self):
         """Получение статистики обучения"""
         return {
             "is_trained": self.is_trained,
-            "training_samples": len(self.training_data),
+            "training_samples": len(self.store),
+            "pending_samples": self.store.total - self._fitted_total,
             "model_file_exists": os.path.exists(self.model_file),
             "scaler_file_exists": os.path.exists(self.scaler_file),
         }
 
-    def retrain_if_needed(self, performance_threshold=0.1):
-        """Переобучение при необходимости"""
-        if not self.is_trained or len(self.training_data) < self.min_training_samples:
+    def retrain_if_needed(self, performance_threshold=0.1, background=False):
+        """Дообучение, когда накопилось достаточно новых примеров"""
+        if not self.is_trained or len(self.store) < self.min_training_samples:
             return False
 
-        if len(self.training_data) > self.min_training_samples * 2:
-            print("Переобучение модели...")
-            return self.train(self.training_data)
+        if background:
+            return self.retrain_async()
+
+        # Пока идёт фоновое обучение, его публикация перезаписала бы результат
+        if not self._retrain_done.is_set():
+            return False
+
+        if self.store.total - self._fitted_total >= self.min_training_samples:
+            print("Дообучение модели...")
+            return self.partial_train()
 
         return False
+
+
+def _run_retrain(task):
+    """Обучение по снимку из _retrain_task; выполняется и в фоновом процессе"""
+    full, model, scaler, hidden_layers, features, targets, batch_size, _ = task
+    if full:
+        return _fit_full(hidden_layers, features, targets)
+    return _fit_partial(model, scaler, features, targets, batch_size)
+
+
+def _fit_full(hidden_layers, features, targets):
+    """Новая модель: разбиение, нормализация и fit с нуля"""
+    from sklearn.metrics import mean_squared_error
+    from sklearn.model_selection import train_test_split
+    from sklearn.preprocessing import StandardScaler
+
+    model = NeuralSnakeAI._create_model(hidden_layers)
+    scaler = StandardScaler()
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        features, targets, test_size=0.2, random_state=42
+    )
+
+    X_train_scaled = scaler.fit_transform(X_train)
+    X_test_scaled = scaler.transform(X_test)
+
+    model.fit(X_train_scaled, y_train)
+
+    mse = mean_squared_error(y_test, model.predict(X_test_scaled))
+    return model, scaler, float(mse)
+
+
+def _fit_partial(model, scaler, features, targets, batch_size):
+    """partial_fit по мини-батчам новых примеров"""
+    # Нормализация зафиксирована при полном обучении, чтобы веса первого
+    # слоя оставались согласованы с ней
+    X = scaler.transform(features)
+
+    # Ошибка на новых данных до обновления — честная оценка модели
+    mse = float(np.mean((model.predict(X) - targets) ** 2))
+
+    # partial_fit не поддерживает early_stopping, он нужен только fit;
+    # после fit с early_stopping best_loss_ не заполнен
+    early_stopping = model.early_stopping
+    model.set_params(early_stopping=False)
+    if model.best_loss_ is None:
+        model.best_loss_ = np.inf
+    try:
+        for start in range(0, len(X), batch_size):
+            batch = slice(start, start + batch_size)
+            model.partial_fit(X[batch], targets[batch])
+    finally:
+        model.set_params(early_stopping=early_stopping)
+
+    return model, scaler, mse
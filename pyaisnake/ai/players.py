@@ -0,0 +1,420 @@
+"""
+Named players for headless games.
+
+create_ai maps the algorithm names used by the CLI to player objects: the search
+players defined here, adapters around trained models (loaded once per board size
+and shared by every game) and the players of the other ai modules. Anything that
+plays games without the CLI - imitation teachers, tournaments, benchmarks - gets
+its players from here.
+"""
+
+import functools
+import random
+import time
+from pathlib import Path
+
+from ..engine import Direction, SnakeGame
+
+IMITATION_MODEL_FILE = "imitation_model.npz"
+QUANTIZED_DQN_FILE = "dqn_model.int8.npz"
+CHECKPOINT_DIR = "checkpoints"
+
+
+class RandomAI:
+    """Simple random AI"""
+
+    def __init__(self, game: SnakeGame):
+        self.game = game
+
+    def get_direction(self, deadline: float | None = None) -> Direction | None:
+        safe = self.game.get_safe_directions()
+        return random.choice(safe) if safe else None
+
+
+class AStarAI:
+    """
+    A* pathfinding AI with trap avoidance.
+
+    Anytime: given a time.perf_counter() deadline, a search that runs out of time
+    steps towards the closest cell found so far and searches again next tick.
+    """
+
+    # Expansions between deadline checks
+    DEADLINE_CHECK_INTERVAL = 64
+
+    def __init__(self, game: SnakeGame):
+        self.game = game
+        self._path: list[tuple[int, int]] = []
+        self._last_food: tuple[int, int] | None = None
+
+    def get_direction(self, deadline: float | None = None) -> Direction | None:
+        if not self.game.food:
+            return self._get_safe_direction()
+
+        head = self.game.snake[0]
+        food = self.game.food
+
+        if food != self._last_food or not self._path:
+            path, complete = self._find_path(head, food, deadline)
+            if not complete:
+                self._path, self._last_food = [], None
+                if path:
+                    return self._pos_to_direction(head, path[0])
+                return self._get_safe_direction()
+            self._path = path
+            self._last_food = food
+
+        if self._path:
+            next_pos = self._path[0]
+            self._path = self._path[1:]
+            return self._pos_to_direction(head, next_pos)
+
+        return self._get_safe_direction()
+
+    def discard_plan(self) -> None:
+        """Forget the cached path, e.g. after a decision was computed but not played"""
+        self._path, self._last_food = [], None
+
+    def _find_path(
+        self, start: tuple[int, int], goal: tuple[int, int], deadline: float | None = None
+    ) -> tuple[list[tuple[int, int]], bool]:
+        """Path to goal and whether the search finished before the deadline"""
+        import heapq
+
+        snake_set = set(self.game.snake)
+        obstacles = self.game.obstacles
+        width = self.game.config.width
+        height = self.game.config.height
+
+        open_set: list[tuple[int, tuple[int, int]]] = [(0, start)]
+        came_from: dict[tuple[int, int], tuple[int, int]] = {}
+        g_score: dict[tuple[int, int], int] = {start: 0}
+
+        # Best answer so far: the expanded cell closest to the goal
+        closest = start
+        closest_h = abs(start[0] - goal[0]) + abs(start[1] - goal[1])
+        expanded = 0
+
+        while open_set:
+            _, current = heapq.heappop(open_set)
+
+            if current == goal:
+                return self._reconstruct_path(came_from, current), True
+
+            h = abs(current[0] - goal[0]) + abs(current[1] - goal[1])
+            if h < closest_h:
+                closest, closest_h = current, h
+
+            expanded += 1
+            if (
+                deadline is not None
+                and expanded % self.DEADLINE_CHECK_INTERVAL == 0
+                and time.perf_counter() > deadline
+            ):
+                return self._reconstruct_path(came_from, closest), False
+
+            for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+                neighbor = (current[0] + dx, current[1] + dy)
+
+                if not (0 <= neighbor[0] < width and 0 <= neighbor[1] < height):
+                    continue
+
+                if neighbor in snake_set and neighbor != self.game.snake[-1]:
+                    continue
+
+                if neighbor in obstacles:
+                    continue
+
+                tentative_g = g_score[current] + 1
+
+                if neighbor not in g_score or tentative_g < g_score[neighbor]:
+                    came_from[neighbor] = current
+                    g_score[neighbor] = tentative_g
+                    f_score = tentative_g + abs(neighbor[0] - goal[0]) + abs(neighbor[1] - goal[1])
+                    heapq.heappush(open_set, (f_score, neighbor))
+
+        return [], True
+
+    def _reconstruct_path(
+        self, came_from: dict[tuple[int, int], tuple[int, int]], current: tuple[int, int]
+    ) -> list[tuple[int, int]]:
+        path = []
+        while current in came_from:
+            path.append(current)
+            current = came_from[current]
+        path.reverse()
+        return path
+
+    def _pos_to_direction(self, head: tuple[int, int], next_pos: tuple[int, int]) -> Direction:
+        dx = next_pos[0] - head[0]
+        dy = next_pos[1] - head[1]
+
+        if dy < 0:
+            return Direction.UP
+        elif dy > 0:
+            return Direction.DOWN
+        elif dx < 0:
+            return Direction.LEFT
+        else:
+            return Direction.RIGHT
+
+    def _get_safe_direction(self) -> Direction | None:
+        safe = self.game.get_safe_directions()
+        if not safe:
+            return None
+
+        best_dir = None
+        best_space = -1
+
+        for direction in safe:
+            space = self._count_accessible_space(direction)
+            if space > best_space:
+                best_space = space
+                best_dir = direction
+
+        return best_dir
+
+    def _count_accessible_space(self, direction: Direction) -> int:
+        from .analysis import analyze
+
+        # Shared per-tick flood fill; components are computed once per tick
+        return analyze(self.game).reachable_area(direction)
+
+
+class SafeGreedyAI(AStarAI):
+    """
+    Shortest-path player that only eats when it can still reach its tail.
+
+    The BFS path to food is replayed on a clone of the game; it is taken only
+    if the head can reach the tail afterwards, otherwise the snake follows its
+    tail and tries again next tick. About two BFS runs per food. Tail-following
+    can cycle forever, so after more idle moves than the board has cells an
+    unverified path is accepted.
+    """
+
+    def __init__(self, game: SnakeGame):
+        super().__init__(game)
+        self._idle_limit = game.config.width * game.config.height
+        self._idle_moves = 0
+        self._last_eaten = game.stats.food_eaten
+
+    def get_direction(self, deadline: float | None = None) -> Direction | None:
+        game = self.game
+        head = game.snake[0]
+
+        if game.stats.food_eaten != self._last_eaten:
+            self._last_eaten = game.stats.food_eaten
+            self._idle_moves = 0
+        self._idle_moves += 1
+
+        if game.food and (game.food != self._last_food or not self._path):
+            self._path, self._last_food = [], None
+            path = game.find_path(game.food)
+            if path and self._idle_moves <= self._idle_limit:
+                virtual = game.clone()
+                virtual.advance_virtual(path)
+                if not virtual.path_to_tail():
+                    path = []
+            if path:
+                self._path, self._last_food = path, game.food
+
+        if self._path:
+            next_pos = self._path.pop(0)
+            return self._pos_to_direction(head, next_pos)
+
+        tail_path = game.path_to_tail()
+        if tail_path:
+            return self._pos_to_direction(head, tail_path[0])
+
+        return self._get_safe_direction()
+
+
+_DECISION_DIRECTIONS = {
+    "Up": Direction.UP,
+    "Down": Direction.DOWN,
+    "Left": Direction.LEFT,
+    "Right": Direction.RIGHT,
+}
+
+
+@functools.cache
+def _load_neural_model(width: int, height: int):
+    """Trained NeuralSnakeAI in grid coordinates, shared by every game of that size"""
+    try:
+        from .checkpoint import CheckpointManager
+        from .neural import NeuralSnakeAI
+    except ImportError:
+        return None
+
+    # Play-only: no checkpoint manager, so nothing is ever written from here
+    model = NeuralSnakeAI(cell_size=1, field_size=width, field_height=height)
+    if (
+        model.load_inference()
+        or model.load_model()
+        or model.load_checkpoint(CheckpointManager(CHECKPOINT_DIR, prefix="neural").best())
+    ):
+        return model
+    return None
+
+
+@functools.cache
+def _load_imitation_model():
+    """Distilled policy network, memory-mapped and shared by every game"""
+    from .inference import MLPInference
+
+    path = Path(IMITATION_MODEL_FILE)
+    return MLPInference.load(path, mmap=True) if path.exists() else None
+
+
+@functools.cache
+def _load_genetic_model(width: int, height: int):
+    """Evolved GeneticSnakeAI in grid coordinates, shared by every game of that size"""
+    from .checkpoint import CheckpointManager
+    from .genetic import GeneticSnakeAI
+
+    model = GeneticSnakeAI(population_size=1, cell_size=1, field_size=width, field_height=height)
+    latest = CheckpointManager(CHECKPOINT_DIR, prefix="genetic").latest()
+    if model.load_population("genetic_model.pkl") or model.resume(latest):
+        return model
+    return None
+
+
+def policy_table_file(width: int, height: int) -> str:
+    """Default file for the policy table of a board size"""
+    return f"policy_{width}x{height}.npz"
+
+
+@functools.cache
+def _load_policy_table(width: int, height: int):
+    """Memory-mapped policy table for the board size, solved in memory if no file exists"""
+    from .policy_table import PolicyTable
+
+    path = Path(policy_table_file(width, height))
+    if path.exists():
+        return PolicyTable.load(path, mmap=True)
+    try:
+        return PolicyTable.solve(width, height)
+    except ValueError:
+        return None
+
+
+class _ModelAI:
+    """
+    Base for trained-model adapters.
+
+    Learned policies can circle forever without eating; after more idle moves than
+    the board has cells the adapter hands over to a persistent A* until the next food.
+    """
+
+    def __init__(self, game: SnakeGame):
+        self.game = game
+        self._fallback = AStarAI(game)
+        self._idle_limit = game.config.width * game.config.height
+        self._idle_moves = 0
+        self._last_eaten = game.stats.food_eaten
+
+    def get_direction(self, deadline: float | None = None) -> Direction | None:
+        if self.game.stats.food_eaten != self._last_eaten:
+            self._last_eaten = self.game.stats.food_eaten
+            self._idle_moves = 0
+        self._idle_moves += 1
+
+        if self._idle_moves > self._idle_limit or not self.game.food:
+            return self._fallback.get_direction(deadline)
+        return self._model_direction(deadline)
+
+    def discard_plan(self) -> None:
+        self._fallback.discard_plan()
+
+    def _model_direction(self, deadline: float | None) -> Direction | None:
+        return self._fallback.get_direction(deadline)
+
+
+class NeuralAI(_ModelAI):
+    """Neural network AI; falls back to A* until a model is trained"""
+
+    def __init__(self, game: SnakeGame):
+        super().__init__(game)
+        self.model = _load_neural_model(game.config.width, game.config.height)
+
+    def _model_direction(self, deadline: float | None) -> Direction | None:
+        if self.model is None:
+            return self._fallback.get_direction(deadline)
+
+        decision = self.model.predict_best_action(
+            self.game.snake, self.game.food, self.game.obstacles
+        )
+        return _DECISION_DIRECTIONS.get(decision) if decision else None
+
+
+class GeneticAI(_ModelAI):
+    """Genetic algorithm AI playing the best evolved genome; falls back to A* until trained"""
+
+    def __init__(self, game: SnakeGame):
+        super().__init__(game)
+        self.model = _load_genetic_model(game.config.width, game.config.height)
+        self.genome = self.model.get_best_genome() if self.model else None
+
+    def _model_direction(self, deadline: float | None) -> Direction | None:
+        if self.genome is None:
+            return self._fallback.get_direction(deadline)
+
+        if not self.genome.decides_all_directions:
+            decision = self.model.get_decision(
+                self.genome, self.game.snake, self.game.food, self.game.obstacles
+            )
+            return _DECISION_DIRECTIONS.get(decision) if decision else None
+
+        scores = self.model.batch_direction_scores(self.genome.genes[None, :], [self.game])[0]
+        best = [i for i, score in enumerate(scores) if score == scores.max()]
+        return _DECISION_DIRECTIONS[self.model.DIRECTIONS[random.choice(best)]]
+
+
+def create_ai(algorithm: str, game: SnakeGame):
+    """
+    Player for an algorithm name, as accepted by the `ai` and `tournament` commands.
+
+    Model-backed players fall back to a search player while their model is missing;
+    unknown names play randomly.
+    """
+    if algorithm == "random":
+        return RandomAI(game)
+    elif algorithm == "a_star":
+        return AStarAI(game)
+    elif algorithm == "safe_greedy":
+        return SafeGreedyAI(game)
+    elif algorithm == "expectimax":
+        from .expectimax import ExpectimaxAI
+
+        return ExpectimaxAI(game)
+    elif algorithm == "imitation":
+        from .imitation import ImitationAI
+
+        policy = _load_imitation_model()
+        return ImitationAI(game, policy) if policy else AStarAI(game)
+    elif algorithm == "policy":
+        from .policy_table import PolicyTableAI
+
+        policy = _load_policy_table(game.config.width, game.config.height)
+        return PolicyTableAI(game, policy) if policy else SafeGreedyAI(game)
+    elif algorithm == "neural":
+        return NeuralAI(game)
+    elif algorithm == "genetic":
+        return GeneticAI(game)
+    elif algorithm == "dqn":
+        from .dqn import DQNAI
+
+        ai = DQNAI(game)
+        model_path = Path("dqn_model.pkl")
+        if model_path.exists():
+            ai.load_model(str(model_path))
+        return ai
+    elif algorithm == "dqn_int8":
+        from .quantize import QuantizedDQNAI, QuantizedDQNetwork
+
+        model_path = Path(QUANTIZED_DQN_FILE)
+        if not model_path.exists():
+            return create_ai("dqn", game)
+        return QuantizedDQNAI(game, QuantizedDQNetwork.load(model_path, mmap=True))
+    else:
+        return RandomAI(game)
@@ -0,0 +1,154 @@
+"""
+Precomputed policy tables for small obstacle-free boards.
+
+Exact dynamic programming over whole snake bodies is out of reach even on a
+6x6 board, so the table is solved over a compressed state instead: the cells
+of the head, the tail and the food. The policy behind it follows a fixed
+Hamiltonian cycle and takes a shortcut towards the food only when the
+shortcut lands strictly before the tail in cycle order and keeps the body's
+span within half the board. The body then always lies between tail and head
+along the cycle, so the policy never collides and fills the board; that
+makes it ground truth for checking heuristics in tests.
+
+The table is a (cells, cells, cells) uint8 array of action indices saved in
+an uncompressed .npz, so play memory-maps it and each move is one lookup.
+"""
+
+import json
+from functools import cached_property
+from pathlib import Path
+
+import numpy as np
+
+from ..engine import Direction, SnakeGame
+from .analysis import DELTAS, analyze
+from .checkpoint import META_KEY, load_npz
+
+ACTIONS = list(DELTAS)
+NO_ACTION = 255
+
+# (cells ** 3) bytes; 12x12 is about 3 MiB
+MAX_CELLS = 144
+
+
+def hamiltonian_cycle(width: int, height: int) -> np.ndarray:
+    """
+    Cell ids (y * width + x) along a Hamiltonian cycle of the board.
+
+    Row 0 runs left to right, the remaining rows zig-zag over columns 1..width-1
+    and column 0 leads back. The cycle is oriented so that moving right along
+    row height // 2 - the engine's starting row and direction - goes forward.
+    """
+    if height % 2 or height < 2 or width < 6:
+        raise ValueError(f"No policy cycle for a {width}x{height} board (even height, width >= 6)")
+
+    cells = [(x, 0) for x in range(width)]
+    for y in range(1, height):
+        columns = range(width - 1, 0, -1) if y % 2 else range(1, width)
+        cells.extend((x, y) for x in columns)
+    cells.extend((0, y) for y in range(height - 1, 0, -1))
+
+    if (height // 2) % 2:
+        cells.reverse()
+    return np.array([y * width + x for x, y in cells], dtype=np.int64)
+
+
+class PolicyTable:
+    """Action per (head, tail, food) cell triple for one board size"""
+
+    def __init__(self, width: int, height: int, table: np.ndarray):
+        cells = width * height
+        if table.shape != (cells, cells, cells):
+            raise ValueError(f"Policy table shape {table.shape} does not fit {width}x{height}")
+        self.width = width
+        self.height = height
+        self.table = table
+
+    @classmethod
+    def solve(cls, width: int, height: int) -> "PolicyTable":
+        """Build the table for an obstacle-free board, one head cell at a time"""
+        cells = width * height
+        if cells > MAX_CELLS:
+            raise ValueError(f"{width}x{height} is too large for a policy table")
+
+        order = hamiltonian_cycle(width, height)
+        position = np.empty(cells, dtype=np.int64)
+        position[order] = np.arange(cells)
+
+        table = np.full((cells, cells, cells), NO_ACTION, dtype=np.uint8)
+        for head in range(cells):
+            x, y = head % width, head // width
+            # Cycle distance from the head to every cell, used for tail and food
+            ahead = (position - position[head]) % cells
+            best = np.full((cells, cells), cells + 1, dtype=np.int64)
+
+            for action, (dx, dy) in enumerate(DELTAS.values()):
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < width and 0 <= ny < height):
+                    continue
+                step = ahead[ny * width + nx]
+                # Land before the tail; skip ahead only while the body spans half the board
+                allowed = (step < ahead) & ((step == 1) | (cells - ahead + 1 + step <= cells // 2))
+                remaining = np.where(allowed[:, None], (ahead - step)[None, :] % cells, cells + 1)
+
+                better = remaining < best
+                best[better] = remaining[better]
+                table[head][better] = action
+
+        return cls(width, height, table)
+
+    @cached_property
+    def successor(self) -> np.ndarray:
+        """Next cell along the policy's cycle, for every cell"""
+        order = hamiltonian_cycle(self.width, self.height)
+        successor = np.empty_like(order)
+        successor[order] = np.roll(order, -1)
+        return successor
+
+    def action(self, head: int, tail: int, food: int) -> Direction | None:
+        action = int(self.table[head, tail, food])
+        return None if action == NO_ACTION else ACTIONS[action]
+
+    @property
+    def nbytes(self) -> int:
+        return self.table.nbytes
+
+    def save(self, path: str | Path) -> None:
+        metadata = {"width": self.width, "height": self.height}
+        np.savez(path, table=self.table, **{META_KEY: np.array(json.dumps(metadata))})
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = False) -> "PolicyTable":
+        arrays, metadata = load_npz(path, mmap=mmap)
+        return cls(metadata["width"], metadata["height"], arrays["table"])
+
+
+class PolicyTableAI:
+    """Plays by table lookup; a move the table does not cover falls back to the roomiest one"""
+
+    def __init__(self, game: SnakeGame, policy: PolicyTable):
+        if (policy.width, policy.height) != (game.config.width, game.config.height):
+            raise ValueError(
+                f"Policy table is for {policy.width}x{policy.height}, "
+                f"board is {game.config.width}x{game.config.height}"
+            )
+        self.game = game
+        self.policy = policy
+
+    def get_direction(self, deadline: float | None = None) -> Direction | None:
+        game = self.game
+        width = game.config.width
+        head = game.snake[0][1] * width + game.snake[0][0]
+        tail = game.snake[-1][1] * width + game.snake[-1][0]
+        # Without food, aiming at the next cycle cell makes the table follow the cycle
+        food = (
+            game.food[1] * width + game.food[0] if game.food else int(self.policy.successor[head])
+        )
+
+        direction = self.policy.action(head, tail, food)
+        board = analyze(game)
+        if direction is not None and direction in board.safe_directions:
+            return direction
+
+        safe = board.safe_directions
+        return max(safe, key=board.reachable_area) if safe else None
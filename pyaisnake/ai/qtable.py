@@ -0,0 +1,110 @@
+"""
+Array-backed Q-table for tabular reinforcement learning.
+
+States are small integers produced by bit-packing discrete features, so a
+lookup is one row index into a float32 matrix instead of string formatting and
+two dict hops. When the state space is larger than max_states, indices are
+folded modulo the table size (a hashed table), which keeps memory bounded at
+the cost of occasional collisions.
+"""
+
+import numpy as np
+
+
+def pack_bits(fields: list[tuple[int, int]]) -> int:
+    """Pack (value, width) pairs into one integer, first field in the low bits"""
+    key = 0
+    shift = 0
+    for value, width in fields:
+        key |= (int(value) & ((1 << width) - 1)) << shift
+        shift += width
+    return key
+
+
+class QTable:
+    """Dense or hashed (states, actions) table of Q-values"""
+
+    def __init__(
+        self,
+        n_states: int,
+        n_actions: int = 4,
+        learning_rate: float = 0.1,
+        max_states: int | None = None,
+    ):
+        size = n_states if max_states is None else min(n_states, max_states)
+        self.values = np.zeros((size, n_actions), dtype=np.float32)
+        self.visits = np.zeros(size, dtype=np.uint32)
+        self.learning_rate = learning_rate
+        self.hashed = size < n_states
+
+    def __len__(self) -> int:
+        """Number of states updated at least once"""
+        return int(np.count_nonzero(self.visits))
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.visits.nbytes
+
+    def index(self, keys):
+        return np.asarray(keys, dtype=np.int64) % len(self.values)
+
+    def row(self, key: int) -> np.ndarray:
+        return self.values[key % len(self.values)]
+
+    def best_action(self, key: int, allowed: list[int] | None = None) -> int:
+        """Highest-valued action, optionally restricted to allowed indices"""
+        row = self.row(key)
+        if allowed is None:
+            return int(np.argmax(row))
+        allowed = np.asarray(allowed, dtype=np.int64)
+        return int(allowed[np.argmax(row[allowed])])
+
+    def update(self, keys, actions, targets) -> None:
+        """
+        Move Q(s, a) towards the targets by learning_rate, for a whole batch.
+
+        Gives exactly the result of applying the updates one by one in batch
+        order: the k-th of n repeats of a pair keeps a (1 - lr)^(n - k) share of
+        its step, and the old value keeps (1 - lr)^n.
+        """
+        rows = self.index(keys)
+        actions = np.asarray(actions, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.float64)
+
+        pairs, group = np.unique(rows * self.values.shape[1] + actions, return_inverse=True)
+        counts = np.bincount(group)
+        # Position of each update among the repeats of its pair, in batch order
+        order = np.argsort(group, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order)) - np.repeat(np.cumsum(counts) - counts, counts)
+
+        keep = 1.0 - self.learning_rate
+        steps = np.bincount(
+            group,
+            weights=self.learning_rate * targets * keep ** (counts[group] - 1 - rank),
+            minlength=len(pairs),
+        )
+        pair_rows, pair_actions = np.divmod(pairs, self.values.shape[1])
+        old = self.values[pair_rows, pair_actions].astype(np.float64)
+        self.values[pair_rows, pair_actions] = keep**counts * old + steps
+        np.add.at(self.visits, rows, 1)
+
+    def update_episode(self, keys, actions, rewards, discount: float = 0.9) -> None:
+        """Monte Carlo update of a trajectory towards its discounted returns"""
+        rewards = np.asarray(rewards, dtype=np.float32)
+        returns = np.empty_like(rewards)
+        running = 0.0
+        for t in range(len(rewards) - 1, -1, -1):
+            running = rewards[t] + discount * running
+            returns[t] = running
+        self.update(keys, actions, returns)
+
+    def save(self, path) -> None:
+        np.savez(path, values=self.values, visits=self.visits)
+
+    def load(self, path) -> None:
+        with np.load(path) as data:
+            if data["values"].shape != self.values.shape:
+                raise ValueError(f"Q-table shape mismatch: {data['values'].shape}")
+            self.values[:] = data["values"]
+            self.visits[:] = data["visits"]
@@ -0,0 +1,143 @@
+"""
+Int8 quantization of trained DQN weights for play-only use.
+
+Each weight matrix is stored as int8 with one float32 scale per output channel,
+cutting a 256-hidden DQNetwork to a quarter of its float32 size. The forward pass
+casts a layer into a float32 scratch buffer, runs a BLAS matmul and applies the
+per-channel scale to the (much smaller) output. There is one scratch buffer per
+weight shape and thread, shared by every network, so models never hold a float
+copy of their weights and hundreds of them stay resident at once.
+"""
+
+import threading
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from .checkpoint import load_npz
+from .dqn import DQNAI, DQNetwork
+
+if TYPE_CHECKING:
+    from ..engine import SnakeGame
+
+# Dequantization scratch keyed by weight shape, one dict per thread
+_local = threading.local()
+
+
+def _scratch(shape: tuple[int, ...]) -> np.ndarray:
+    buffers = getattr(_local, "buffers", None)
+    if buffers is None:
+        buffers = _local.buffers = {}
+    scratch = buffers.get(shape)
+    if scratch is None:
+        scratch = buffers[shape] = np.empty(shape, dtype=np.float32)
+    return scratch
+
+
+def quantize_weights(w: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Symmetric per-output-channel int8 quantization of an (in, out) matrix"""
+    max_abs = np.max(np.abs(w), axis=0)
+    scale = np.where(max_abs > 0, max_abs / 127.0, 1.0).astype(np.float32)
+    q = np.clip(np.rint(w / scale), -127, 127).astype(np.int8)
+    return q, scale
+
+
+class QuantizedDQNetwork:
+    """DQNetwork forward pass over int8 weights"""
+
+    LAYERS = (("w1", "b1"), ("w2", "b2"), ("w3", "b3"))
+
+    def __init__(self, arrays: dict[str, np.ndarray]):
+        self.layers: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = [
+            (arrays[f"{w}_q"], arrays[f"{w}_scale"], arrays[b]) for w, b in self.LAYERS
+        ]
+
+    @classmethod
+    def from_network(cls, net: DQNetwork) -> "QuantizedDQNetwork":
+        arrays: dict[str, np.ndarray] = {}
+        for w, b in cls.LAYERS:
+            arrays[f"{w}_q"], arrays[f"{w}_scale"] = quantize_weights(getattr(net, w))
+            arrays[b] = np.asarray(getattr(net, b), dtype=np.float32)
+        return cls(arrays)
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        arrays: dict[str, np.ndarray] = {}
+        for (w, b), (q, scale, bias) in zip(self.LAYERS, self.layers):
+            arrays[f"{w}_q"] = q
+            arrays[f"{w}_scale"] = scale
+            arrays[b] = bias
+        return arrays
+
+    def save(self, path: str | Path) -> None:
+        np.savez(path, **self.to_arrays(), quantized=np.array("int8"))
+
+    @classmethod
+    def load(cls, path: str | Path, mmap: bool = False) -> "QuantizedDQNetwork":
+        arrays, _ = load_npz(path, mmap=mmap)
+        if "quantized" not in arrays:
+            raise ValueError(f"{path} is not a quantized DQN model")
+        return cls(arrays)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(q.nbytes + scale.nbytes + bias.nbytes for q, scale, bias in self.layers)
+
+    def forward(self, x: np.ndarray) -> np.ndarray:
+        h = np.asarray(x, dtype=np.float32)
+        last = len(self.layers) - 1
+        for i, (q, scale, bias) in enumerate(self.layers):
+            scratch = _scratch(q.shape)
+            np.copyto(scratch, q, casting="unsafe")
+
+            h = h @ scratch
+            h *= scale
+            h += bias
+            if i != last:
+                np.maximum(h, 0, out=h)
+        return h
+
+    def predict(self, state: np.ndarray) -> int:
+        return int(np.argmax(self.forward(state)))
+
+    def predict_batch(self, states: np.ndarray) -> np.ndarray:
+        return np.argmax(self.forward(states), axis=1)
+
+
+def export_quantized(model_path: str | Path, output_path: str | Path) -> QuantizedDQNetwork:
+    """Quantize a DQN model saved by DQNAI.save_model"""
+    from ..engine import GameConfig, SnakeGame
+
+    if not Path(model_path).exists():
+        raise FileNotFoundError(model_path)
+    ai = DQNAI(SnakeGame(GameConfig(width=10, height=10)))
+    ai.load_model(str(model_path))
+
+    network = QuantizedDQNetwork.from_network(ai.policy_net)
+    network.save(output_path)
+    return network
+
+
+class QuantizedDQNAI(DQNAI):
+    """
+    Play-only DQN player backed by a QuantizedDQNetwork.
+
+    Skips DQNAI.__init__ so no float networks, trainer or replay memory are
+    allocated; state extraction and direction logic are inherited.
+    """
+
+    def __init__(self, game: "SnakeGame", network: QuantizedDQNetwork, epsilon: float = 0.0):
+        self.game = game
+        self.network = network
+        self.epsilon = epsilon
+        self._training_mode = False
+        self._last_state = None
+        self._last_action = 0
+        self._total_steps = 0
+        self.model_version = 0
+
+    def inference_engine(self, max_batch: int = 1) -> QuantizedDQNetwork:  # type: ignore[override]
+        return self.network
+
+    def start_training(self) -> None:
+        raise RuntimeError("Quantized models are play-only")
@@ -0,0 +1,392 @@
+"""
+Vectorised two-snake arenas for self-play training.
+
+SelfPlayArena steps many MultiplayerGame boards at once on NumPy arrays: an
+(arenas, cells) occupancy grid and a ring buffer of cell ids per snake. The
+rules are MultiplayerGame.update()'s: both snakes move together, a reversing
+move keeps the old heading, a head entering a wall or any body cell (tails
+included) dies, heads meeting on one cell and double deaths are draws, and
+food is eaten by player 1 first, each spawn drawn uniformly from the free
+cells. score_to_win ends an arena as in the engine; the wall-clock
+time_limit is replaced by a step cap decided on score the same way.
+
+SelfPlayEnv puts the learner in player 1's seat and fills player 2 from an
+OpponentPool of frozen past policies, sampling a new matchup whenever an
+arena finishes and resets. Opponents are batched: all arenas facing the same
+snapshot share one call. Every step returns observations for both seats.
+
+Observations are 18 float32 features per player; the first 15 have the
+layout of imitation.observe, so a single-player policy over those plays
+either seat:
+
+[0:4]   free run from the head towards UP, DOWN, LEFT, RIGHT / board size
+[4:8]   current direction, one-hot
+[8:10]  food offset from the head / board size
+[10:14] food is left, right, above, below the head
+[14]    own length / board cells
+[15:17] opponent head offset / board size
+[17]    opponent length / board cells
+"""
+
+import copy
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+
+from ..multiplayer import MultiplayerConfig, MultiplayerState
+from .analysis import DELTAS
+from .inference import MLPInference
+
+ACTIONS = list(DELTAS)
+N_FEATURES = 18
+
+_DX = np.array([dx for dx, _ in DELTAS.values()])
+_DY = np.array([dy for _, dy in DELTAS.values()])
+_UP, _DOWN, _LEFT, _RIGHT = range(4)
+_REVERSE = np.array([_DOWN, _UP, _RIGHT, _LEFT])
+
+# Outcome codes, indices into OUTCOMES
+RUNNING, P1_WINS, P2_WINS, DRAW = range(4)
+OUTCOMES = [
+    MultiplayerState.RUNNING,
+    MultiplayerState.P1_WINS,
+    MultiplayerState.P2_WINS,
+    MultiplayerState.DRAW,
+]
+
+FOOD_REWARD = 1.0
+WIN_REWARD = 10.0
+
+# observations (k, N_FEATURES) -> action indices (k,)
+Policy = Callable[[np.ndarray], np.ndarray]
+
+
+class SelfPlayArena:
+    """Many two-snake games stepped together under MultiplayerGame rules"""
+
+    def __init__(
+        self,
+        n_arenas: int,
+        config: MultiplayerConfig | None = None,
+        max_steps: int = 1000,
+        seed: int | None = None,
+    ):
+        self.config = config or MultiplayerConfig()
+        if not self.config.wall_death:
+            raise ValueError("Self-play arenas only support wall_death boards")
+        if self.config.width < 12:
+            raise ValueError("Two snakes need a board at least 12 cells wide")
+
+        self.n_arenas = n_arenas
+        self.width, self.height = self.config.width, self.config.height
+        self.cells = self.width * self.height
+        self.max_steps = max_steps
+        self.rng = np.random.default_rng(seed)
+
+        # 0 empty, 1 player 1, 2 player 2; the extra last column is an always
+        # blocked sentinel that ends every ray
+        self.grid = np.zeros((n_arenas, self.cells + 1), dtype=np.int8)
+        # Ring buffer per snake; body[a, p, head[a, p]] is the head cell
+        self.body = np.zeros((n_arenas, 2, self.cells), dtype=np.int64)
+        self.head = np.zeros((n_arenas, 2), dtype=np.int64)
+        self.length = np.zeros((n_arenas, 2), dtype=np.int64)
+        self.direction = np.zeros((n_arenas, 2), dtype=np.int64)
+        self.food = np.full(n_arenas, -1, dtype=np.int64)
+        self.scores = np.zeros((n_arenas, 2), dtype=np.int64)
+        self.steps = np.zeros(n_arenas, dtype=np.int64)
+
+        self._arange = np.arange(n_arenas)
+        self._rays = self._build_rays()
+        self.reset()
+
+    def _build_rays(self) -> np.ndarray:
+        """(4, cells, size) cells along each direction from every cell, sentinel-padded"""
+        width, height = self.width, self.height
+        size = max(width, height)
+        rays = np.full((4, self.cells, size), self.cells, dtype=np.int64)
+        x, y = np.arange(self.cells) % width, np.arange(self.cells) // width
+        for action in range(4):
+            for k in range(1, size):
+                rx, ry = x + k * _DX[action], y + k * _DY[action]
+                inside = (rx >= 0) & (rx < width) & (ry >= 0) & (ry < height)
+                rays[action, inside, k - 1] = ry[inside] * width + rx[inside]
+        return rays
+
+    def reset(self, arenas: np.ndarray | None = None) -> None:
+        """Start the given arenas (all by default) from MultiplayerGame's opening"""
+        idx = self._arange if arenas is None else np.asarray(arenas, dtype=np.int64)
+        if not len(idx):
+            return
+        w, y = self.width, self.height // 2
+        start = [
+            [y * w + x for x in (5, 4, 3)],
+            [y * w + x for x in (w - 6, w - 5, w - 4)],
+        ]
+
+        self.grid[idx] = 0
+        self.grid[idx, self.cells] = 1
+        for player, cells in enumerate(start):
+            self.body[idx, player, :3] = cells
+            self.grid[idx[:, None], cells] = player + 1
+        self.head[idx] = 0
+        self.length[idx] = 3
+        self.direction[idx] = (_RIGHT, _LEFT)
+        self.scores[idx] = 0
+        self.steps[idx] = 0
+        self._spawn_food(idx)
+
+    def _spawn_food(self, idx: np.ndarray) -> None:
+        if not len(idx):
+            return
+        free = self.grid[idx, : self.cells] == 0
+        counts = free.sum(axis=1)
+        pick = (self.rng.random(len(idx)) * counts).astype(np.int64)
+        cells = np.argmax(np.cumsum(free, axis=1) > pick[:, None], axis=1)
+        self.food[idx] = np.where(counts > 0, cells, -1)
+
+    def _push_head(self, idx: np.ndarray, player: int, cells: np.ndarray) -> None:
+        ptr = (self.head[idx, player] - 1) % self.cells
+        self.head[idx, player] = ptr
+        self.body[idx, player, ptr] = cells
+        self.grid[idx, cells] = player + 1
+        self.length[idx, player] += 1
+
+    def _pop_tail(self, idx: np.ndarray, player: int) -> None:
+        ptr = (self.head[idx, player] + self.length[idx, player] - 1) % self.cells
+        self.grid[idx, self.body[idx, player, ptr]] = 0
+        self.length[idx, player] -= 1
+
+    def heads(self) -> np.ndarray:
+        """(arenas, 2) head cell ids"""
+        return np.take_along_axis(self.body, self.head[:, :, None], axis=2)[:, :, 0]
+
+    def step(
+        self, actions1: np.ndarray, actions2: np.ndarray
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Advance every arena one tick; finished arenas must be reset before the next step.
+
+        Returns (rewards (arenas, 2), done (arenas,), outcome codes (arenas,)).
+        """
+        actions = np.stack([np.asarray(actions1), np.asarray(actions2)], axis=1)
+        self.direction = np.where(actions == _REVERSE[self.direction], self.direction, actions)
+
+        heads = self.heads()
+        x = heads % self.width + _DX[self.direction]
+        y = heads // self.width + _DY[self.direction]
+        outside = (x < 0) | (x >= self.width) | (y < 0) | (y >= self.height)
+        new = np.where(outside, 0, y * self.width + x)
+        dead = outside | (np.take_along_axis(self.grid, new, axis=1) != 0)
+
+        outcome = np.full(self.n_arenas, RUNNING, dtype=np.int8)
+        outcome[dead[:, 0]] = P2_WINS
+        outcome[dead[:, 1]] = P1_WINS
+        head_on = ~outside.any(axis=1) & (new[:, 0] == new[:, 1])
+        outcome[(dead[:, 0] & dead[:, 1]) | head_on] = DRAW
+
+        rewards = np.zeros((self.n_arenas, 2), dtype=np.float32)
+        moving = np.flatnonzero(outcome == RUNNING)
+        self._push_head(moving, 0, new[moving, 0])
+        self._push_head(moving, 1, new[moving, 1])
+
+        # Player 1 eats first; the respawn sees player 2's new head and old tail
+        for player in (0, 1):
+            ate = new[moving, player] == self.food[moving]
+            eaters, others = moving[ate], moving[~ate]
+            self.scores[eaters, player] += 1
+            rewards[eaters, player] += FOOD_REWARD
+            self._spawn_food(eaters)
+            self._pop_tail(others, player)
+
+        self.steps[moving] += 1
+        running = outcome == RUNNING
+        if self.config.score_to_win:
+            target = self.config.score_to_win
+            p1_reached = running & (self.scores[:, 0] >= target)
+            outcome[p1_reached] = P1_WINS
+            outcome[running & ~p1_reached & (self.scores[:, 1] >= target)] = P2_WINS
+            running = outcome == RUNNING
+
+        timeout = running & (self.steps >= self.max_steps)
+        ahead = np.sign(self.scores[:, 0] - self.scores[:, 1])
+        outcome[timeout] = np.choose(ahead[timeout] + 1, [P2_WINS, DRAW, P1_WINS])
+
+        rewards[outcome == P1_WINS] += (WIN_REWARD, -WIN_REWARD)
+        rewards[outcome == P2_WINS] += (-WIN_REWARD, WIN_REWARD)
+        return rewards, outcome != RUNNING, outcome
+
+    def observe(self, player: int) -> np.ndarray:
+        """(arenas, N_FEATURES) observations from one seat"""
+        width, height = self.width, self.height
+        size = max(width, height)
+        heads = self.heads()
+        hx, hy = heads[:, player] % width, heads[:, player] // width
+        obs = np.zeros((self.n_arenas, N_FEATURES), dtype=np.float32)
+
+        for action in range(4):
+            # The free run is the index of the first blocked cell along the ray
+            ray = self._rays[action, heads[:, player]]
+            blocked = np.take_along_axis(self.grid, ray, axis=1) != 0
+            obs[:, action] = np.argmax(blocked, axis=1) / size
+
+        obs[self._arange, 4 + self.direction[:, player]] = 1.0
+
+        has_food = self.food >= 0
+        dx = np.where(has_food, self.food % width - hx, 0)
+        dy = np.where(has_food, self.food // width - hy, 0)
+        obs[:, 8] = dx / size
+        obs[:, 9] = dy / size
+        obs[:, 10:14] = np.stack([dx < 0, dx > 0, dy < 0, dy > 0], axis=1)
+        obs[:, 14] = self.length[:, player] / self.cells
+
+        other = 1 - player
+        obs[:, 15] = (heads[:, other] % width - hx) / size
+        obs[:, 16] = (heads[:, other] // width - hy) / size
+        obs[:, 17] = self.length[:, other] / self.cells
+        return obs
+
+
+def greedy_policy(observations: np.ndarray) -> np.ndarray:
+    """Heads for the food among moves that do not collide, preferring open runs"""
+    safe = observations[:, 0:4] > 0
+    # UP, DOWN, LEFT, RIGHT towards food: above, below, left, right
+    towards = observations[:, [12, 13, 10, 11]]
+    return np.argmax(safe * 4.0 + towards * 2.0 + observations[:, 0:4], axis=1)
+
+
+class MLPPolicy:
+    """Argmax of an MLPInference over the first n_features, collisions masked out"""
+
+    def __init__(self, inference: MLPInference, n_features: int = N_FEATURES):
+        self.inference = inference
+        self.n_features = n_features
+
+    def __call__(self, observations: np.ndarray) -> np.ndarray:
+        logits = np.atleast_2d(self.inference.predict(observations[:, : self.n_features]))
+        safe = observations[:, 0:4] > 0
+        return np.argmax(np.where(safe, logits, -np.inf), axis=1)
+
+
+class OpponentPool:
+    """Frozen past policies with a win/loss/draw record against the learner"""
+
+    def __init__(self, capacity: int = 16, latest_weight: float = 0.5, seed: int | None = None):
+        self.capacity = capacity
+        self.latest_weight = latest_weight
+        self.rng = np.random.default_rng(seed)
+        self.policies: dict[int, Policy] = {}
+        # Learner's (wins, losses, draws) against each opponent id
+        self.records: dict[int, list[int]] = {}
+        self._next_id = 0
+
+    def add(self, policy: Policy) -> int:
+        """Store a deep copy of the policy; the oldest one is dropped when full"""
+        opponent_id = self._next_id
+        self._next_id += 1
+        self.policies[opponent_id] = copy.deepcopy(policy)
+        self.records[opponent_id] = [0, 0, 0]
+        while len(self.policies) > self.capacity:
+            oldest = min(self.policies)
+            del self.policies[oldest]
+            del self.records[oldest]
+        return opponent_id
+
+    def __len__(self) -> int:
+        return len(self.policies)
+
+    def sample(self, count: int) -> np.ndarray:
+        """Opponent ids: the newest with probability latest_weight, otherwise uniform"""
+        if not self.policies:
+            raise ValueError("Opponent pool is empty")
+        ids = np.array(sorted(self.policies))
+        picks = self.rng.choice(ids, size=count)
+        picks[self.rng.random(count) < self.latest_weight] = ids[-1]
+        return picks
+
+    def record(self, opponent_id: int, outcome: int) -> None:
+        """Count a finished game from the learner's (player 1's) side"""
+        record = self.records.get(opponent_id)
+        if record is not None:
+            record[{P1_WINS: 0, P2_WINS: 1, DRAW: 2}[outcome]] += 1
+
+    def win_rate(self, opponent_id: int) -> float:
+        wins, losses, draws = self.records[opponent_id]
+        games = wins + losses + draws
+        return (wins + 0.5 * draws) / games if games else 0.5
+
+
+@dataclass
+class StepResult:
+    """One vectorised step; finished arenas are already reset"""
+
+    obs1: np.ndarray  # (arenas, N_FEATURES) for the learner, after auto-reset
+    obs2: np.ndarray  # the same for the opponents
+    rewards: np.ndarray  # (arenas, 2)
+    dones: np.ndarray  # (arenas,)
+    outcomes: np.ndarray  # (arenas,) outcome codes, RUNNING unless done
+    scores: np.ndarray  # (arenas, 2) scores at the end of this step, before reset
+
+
+class SelfPlayEnv:
+    """Learner in player 1's seat against opponents sampled from a pool"""
+
+    def __init__(
+        self,
+        n_arenas: int,
+        pool: OpponentPool,
+        config: MultiplayerConfig | None = None,
+        max_steps: int = 1000,
+        seed: int | None = None,
+    ):
+        self.arena = SelfPlayArena(n_arenas, config, max_steps, seed)
+        self.pool = pool
+        self.matchups = np.full(n_arenas, -1, dtype=np.int64)
+        # Opponents stay playable until their games end, even if the pool evicts them
+        self._opponents: dict[int, Policy] = {}
+        self.games_played = 0
+
+    def _match(self, arenas: np.ndarray) -> None:
+        if not len(arenas):
+            return
+        self.matchups[arenas] = self.pool.sample(len(arenas))
+        active = set(self.matchups.tolist())
+        self._opponents = {i: p for i, p in self._opponents.items() if i in active}
+        for opponent_id in active - self._opponents.keys():
+            self._opponents[opponent_id] = self.pool.policies[opponent_id]
+
+    def reset(self) -> tuple[np.ndarray, np.ndarray]:
+        self.arena.reset()
+        self._match(self.arena._arange)
+        return self.arena.observe(0), self.arena.observe(1)
+
+    def opponent_actions(self, obs2: np.ndarray) -> np.ndarray:
+        """One batched call per distinct opponent"""
+        actions = np.zeros(len(obs2), dtype=np.int64)
+        for opponent_id in np.unique(self.matchups):
+            arenas = np.flatnonzero(self.matchups == opponent_id)
+            actions[arenas] = self._opponents[int(opponent_id)](obs2[arenas])
+        return actions
+
+    def step(self, actions: np.ndarray, obs2: np.ndarray | None = None) -> StepResult:
+        """Play the learner's actions; obs2 saves re-observing if the caller has it"""
+        if obs2 is None:
+            obs2 = self.arena.observe(1)
+        rewards, dones, outcomes = self.arena.step(actions, self.opponent_actions(obs2))
+        scores = self.arena.scores.copy()
+
+        finished = np.flatnonzero(dones)
+        for arena in finished:
+            self.pool.record(int(self.matchups[arena]), int(outcomes[arena]))
+        self.games_played += len(finished)
+        self.arena.reset(finished)
+        self._match(finished)
+
+        return StepResult(
+            obs1=self.arena.observe(0),
+            obs2=self.arena.observe(1),
+            rewards=rewards,
+            dones=dones,
+            outcomes=outcomes,
+            scores=scores,
+        )
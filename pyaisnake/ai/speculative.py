@@ -0,0 +1,61 @@
+"""
+Speculative next-move computation for paced play.
+
+In a visualized game the loop decides, updates, renders and sleeps in sequence,
+so a slow decision adds directly to the frame time. SpeculativeAI starts the
+next decision on a worker thread as soon as a tick is applied; it runs while
+the frame renders and the loop sleeps. The result is used only if the board is
+still on the tick it was computed for (SnakeGame.tick); otherwise it is
+discarded and the decision is recomputed synchronously.
+
+Computing a move may also advance a player's own plan (A* pops the next cell
+of its path). Players that keep such state provide discard_plan(), which is
+called before the recompute so it starts from the current board.
+
+The worker only reads the game, and get_direction waits for it before
+returning, so the engine is never updated while a decision is running.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from ..engine import Direction
+
+
+class SpeculativeAI:
+    """Wraps a player so its next decision overlaps rendering and the frame sleep"""
+
+    def __init__(self, ai: Any):
+        self.ai = ai
+        self.game = ai.game
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speculative-ai")
+        self._pending: tuple[int, Future] | None = None
+        self.hits = 0
+        self.discarded = 0
+
+    def prefetch(self, deadline: float | None = None) -> None:
+        """Start deciding the move for the game's current tick in the background"""
+        if self._pending is not None:
+            self._pending[1].result()
+        self._pending = (self.game.tick, self._executor.submit(self.ai.get_direction, deadline))
+
+    def get_direction(self, deadline: float | None = None) -> "Direction | None":
+        pending, self._pending = self._pending, None
+        if pending is not None:
+            tick, future = pending
+            direction = future.result()
+            if tick == self.game.tick:
+                self.hits += 1
+                return direction
+            self.discarded += 1
+            discard_plan = getattr(self.ai, "discard_plan", None)
+            if discard_plan is not None:
+                discard_plan()
+        return self.ai.get_direction(deadline)
+
+    def close(self) -> None:
+        if self._pending is not None:
+            self._pending[1].result()
+            self._pending = None
+        self._executor.shutdown(wait=True)
@@ -0,0 +1,492 @@
+"""
+Hyperparameter sweeps for the trainable players.
+
+A sweep spec (JSON) names the algorithm - dqn, genetic or neural - and the
+hyperparameters to vary. Method "grid" takes every combination of the listed
+values; method "random" draws spec.trials settings, choosing from lists and
+sampling {"low", "high", "log", "int"} ranges with an RNG seeded by spec.seed.
+Either way the trial list and each trial's seed depend only on the spec.
+
+Trials run in worker processes. Every trial reports its mean score every
+report_every episodes (generations for genetic, rounds for neural) to a local
+SQLite file, which also records status and final value per trial. Running the
+same spec against the same file resumes: finished and pruned trials are
+skipped, interrupted ones continue from the checkpoint written with their last
+report. A resumed trial draws a fresh random stream derived from its seed and
+that report, so it is reproducible but not identical to an uninterrupted run;
+DQN replay memory is not checkpointed, and neural trials keep the samples they
+gathered after their last report.
+
+Early stopping follows the median rule: after warmup_reports reports, a trial
+whose score is below the median of what at least min_trials other trials
+reported at the same step is pruned. Which trials have reported depends on
+timing, so with several workers pruning is not deterministic; the trial
+seeds and the training itself are.
+"""
+
+import itertools
+import json
+import math
+import multiprocessing as mp
+import random
+import sqlite3
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from ..engine import Direction, GameConfig, GameState, SnakeGame
+from .checkpoint import CheckpointManager, load_npz
+
+ALGORITHMS = ("dqn", "genetic", "neural")
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETE = "complete"
+PRUNED = "pruned"
+FAILED = "failed"
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sweep (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    CREATE TABLE IF NOT EXISTS trials (
+        id INTEGER PRIMARY KEY,
+        params TEXT NOT NULL,
+        seed INTEGER NOT NULL,
+        status TEXT NOT NULL DEFAULT 'pending',
+        value REAL,
+        error TEXT,
+        started REAL,
+        finished REAL
+    );
+    CREATE TABLE IF NOT EXISTS reports (
+        trial INTEGER NOT NULL,
+        step INTEGER NOT NULL,
+        value REAL NOT NULL,
+        PRIMARY KEY (trial, step)
+    );
+"""
+
+
+@dataclass
+class SweepSpec:
+    """What to sweep and how each trial is trained"""
+
+    algorithm: str
+    params: dict[str, Any]
+    method: str = "grid"
+    trials: int = 10  # random search only
+    budget: int = 100  # episodes (dqn), generations (genetic) or rounds (neural) per trial
+    report_every: int = 10
+    width: int = 20
+    height: int = 20
+    max_steps: int = 1000
+    seed: int = 0
+    early_stopping: bool = True
+    warmup_reports: int = 2
+    min_trials: int = 3
+
+    def __post_init__(self) -> None:
+        if self.algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown sweep algorithm: {self.algorithm}")
+        if self.method not in ("grid", "random"):
+            raise ValueError(f"Unknown search method: {self.method}")
+        if not self.params:
+            raise ValueError("Sweep spec has no params")
+        if self.method == "grid":
+            for name, values in self.params.items():
+                if not isinstance(values, list) or not values:
+                    raise ValueError(f"Grid parameter {name} needs a non-empty list of values")
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SweepSpec":
+        unknown = set(data) - {f.name for f in fields(cls)}
+        if unknown:
+            raise ValueError(f"Unknown sweep spec keys: {', '.join(sorted(unknown))}")
+        return cls(**data)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "SweepSpec":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+
+def _sample(rng: random.Random, name: str, space: Any) -> Any:
+    if isinstance(space, list):
+        return rng.choice(space)
+    if isinstance(space, dict) and "low" in space and "high" in space:
+        low, high = space["low"], space["high"]
+        if space.get("log"):
+            value = math.exp(rng.uniform(math.log(low), math.log(high)))
+        else:
+            value = rng.uniform(low, high)
+        return round(value) if space.get("int") else value
+    # A scalar is a fixed value shared by every trial
+    if not isinstance(space, dict):
+        return space
+    raise ValueError(f"Cannot sample parameter {name} from {space}")
+
+
+def expand_trials(spec: SweepSpec) -> list[dict[str, Any]]:
+    """Parameter settings of every trial, in trial id order"""
+    names = list(spec.params)
+    if spec.method == "grid":
+        combos = itertools.product(*(spec.params[name] for name in names))
+        return [dict(zip(names, combo)) for combo in combos]
+
+    rng = random.Random(spec.seed)
+    return [
+        {name: _sample(rng, name, spec.params[name]) for name in names} for _ in range(spec.trials)
+    ]
+
+
+def trial_seed(spec: SweepSpec, trial_id: int) -> int:
+    return spec.seed * 1_000_003 + trial_id
+
+
+class SweepStore:
+    """SQLite record of one sweep; each process opens its own connection"""
+
+    def __init__(self, path: str | Path, timeout: float = 60.0):
+        self.path = Path(path)
+        self.conn = sqlite3.connect(self.path, timeout=timeout)
+        self.conn.row_factory = sqlite3.Row
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def register(self, spec: SweepSpec) -> None:
+        """Record the spec and its trials; a file belongs to one spec"""
+        spec_json = spec.to_json()
+        row = self.conn.execute("SELECT value FROM sweep WHERE key = 'spec'").fetchone()
+        if row is not None and row["value"] != spec_json:
+            raise ValueError(f"{self.path} holds a sweep with a different spec")
+
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO sweep (key, value) VALUES ('spec', ?)", (spec_json,)
+            )
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO trials (id, params, seed) VALUES (?, ?, ?)",
+                [
+                    (trial_id, json.dumps(params), trial_seed(spec, trial_id))
+                    for trial_id, params in enumerate(expand_trials(spec))
+                ],
+            )
+
+    def unfinished(self) -> list[tuple[int, dict, int]]:
+        """(id, params, seed) of trials neither complete nor pruned"""
+        rows = self.conn.execute(
+            "SELECT id, params, seed FROM trials WHERE status NOT IN (?, ?) ORDER BY id",
+            (COMPLETE, PRUNED),
+        )
+        return [(row["id"], json.loads(row["params"]), row["seed"]) for row in rows]
+
+    def status(self, trial_id: int) -> str:
+        row = self.conn.execute("SELECT status FROM trials WHERE id = ?", (trial_id,)).fetchone()
+        return row["status"]
+
+    def start(self, trial_id: int, step: int = 0) -> None:
+        """Mark a trial running, resuming after its report `step`"""
+        with self.conn:
+            # Reports an interrupted attempt made after its last checkpoint are stale
+            self.conn.execute("DELETE FROM reports WHERE trial = ? AND step > ?", (trial_id, step))
+            self.conn.execute(
+                "UPDATE trials SET status = ?, value = NULL, error = NULL, started = ?, "
+                "finished = NULL WHERE id = ?",
+                (RUNNING, time.time(), trial_id),
+            )
+
+    def report(self, trial_id: int, step: int, value: float) -> None:
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO reports (trial, step, value) VALUES (?, ?, ?)",
+                (trial_id, step, value),
+            )
+
+    def finish(
+        self, trial_id: int, status: str, value: float | None, error: str | None = None
+    ) -> None:
+        with self.conn:
+            self.conn.execute(
+                "UPDATE trials SET status = ?, value = ?, error = ?, finished = ? WHERE id = ?",
+                (status, value, error, time.time(), trial_id),
+            )
+
+    def step_values(self, step: int, exclude: int) -> list[float]:
+        """Scores other trials reported at the given step"""
+        rows = self.conn.execute(
+            "SELECT value FROM reports WHERE step = ? AND trial != ?", (step, exclude)
+        )
+        return [row["value"] for row in rows]
+
+    def results(self) -> list[dict]:
+        """Every trial: complete ones best value first, then pruned, then the rest"""
+        rows = self.conn.execute(
+            "SELECT t.id, t.params, t.seed, t.status, t.value, t.error, "
+            "(SELECT COUNT(*) FROM reports r WHERE r.trial = t.id) AS reports "
+            "FROM trials t ORDER BY t.status != ?, t.status != ?, t.value IS NULL, "
+            "t.value DESC, t.id",
+            (COMPLETE, PRUNED),
+        )
+        return [{**dict(row), "params": json.loads(row["params"])} for row in rows]
+
+
+def should_prune(
+    store: SweepStore, spec: SweepSpec, trial_id: int, step: int, value: float
+) -> bool:
+    """Median rule: below the median of other trials at the same step"""
+    if not spec.early_stopping or step <= spec.warmup_reports:
+        return False
+    others = store.step_values(step, exclude=trial_id)
+    return len(others) >= spec.min_trials and value < statistics.median(others)
+
+
+def _play_episode(game: SnakeGame, get_direction: Callable[[], Direction | None], max_steps: int):
+    steps = 0
+    while game.state == GameState.RUNNING and steps < max_steps:
+        direction = get_direction()
+        if direction:
+            game.set_direction(direction)
+        game.update()
+        steps += 1
+    return game.stats.score
+
+
+def _save_report(
+    checkpoints: CheckpointManager, arrays: dict, metadata: dict, step: int, value: float
+) -> None:
+    checkpoints.save(arrays, {**metadata, "step": step, "value": value}, score=value)
+
+
+def _train_dqn(
+    spec: SweepSpec, params: dict, seed: int, checkpoints: CheckpointManager, start: int
+) -> Iterator[float]:
+    """Mean episode score of each report window"""
+    from .dqn import DQNAI
+
+    config = GameConfig(width=spec.width, height=spec.height, speed_ms=0)
+    ai = DQNAI(
+        SnakeGame(config),
+        epsilon_start=params.get("epsilon_start", 1.0),
+        epsilon_end=params.get("epsilon_end", 0.01),
+        epsilon_decay=params.get("epsilon_decay", 0.995),
+    )
+    ai.trainer.lr = params.get("learning_rate", ai.trainer.lr)
+    ai.trainer.gamma = params.get("gamma", ai.trainer.gamma)
+    ai.trainer.tau = params.get("tau", ai.trainer.tau)
+    if start:
+        ai.load_checkpoint(*load_npz(checkpoints.latest()))
+    ai.start_training()
+
+    scores: list[int] = []
+    for episode in range(start * spec.report_every, spec.budget):
+        ai.game = SnakeGame(config)
+        scores.append(_play_episode(ai.game, ai.get_direction, spec.max_steps))
+        if (episode + 1) % spec.report_every == 0:
+            mean = sum(scores[-spec.report_every :]) / spec.report_every
+            step = (episode + 1) // spec.report_every
+            _save_report(checkpoints, ai.checkpoint_arrays(), ai.checkpoint_metadata(), step, mean)
+            yield mean
+    ai.stop_training()
+
+
+def _train_genetic(
+    spec: SweepSpec, params: dict, seed: int, checkpoints: CheckpointManager, start: int
+) -> Iterator[float]:
+    """Mean best genome score per generation of each report window"""
+    from .genetic import GeneticSnakeAI
+
+    ai = GeneticSnakeAI(
+        population_size=params.get("population_size", 50),
+        genome_size=params.get("genome_size", 100),
+        mutation_rate=params.get("mutation_rate", 0.1),
+        crossover_rate=params.get("crossover_rate", 0.7),
+        elite_size=params.get("elite_size", 5),
+        seed=seed,
+        cell_size=1,
+        field_size=spec.width,
+        field_height=spec.height,
+    )
+    if start:
+        ai.resume(checkpoints.latest())
+    eval_games = params.get("eval_games", 3)
+
+    best_scores: list[float] = []
+    for generation in range(start * spec.report_every, spec.budget):
+        # The sweep already runs one trial per process
+        ai.evaluate_population(eval_games, workers=1, max_steps=spec.max_steps)
+        best_scores.append(max(ai.genome_scores))
+        ai.evolve()
+        if (generation + 1) % spec.report_every == 0:
+            mean = sum(best_scores[-spec.report_every :]) / spec.report_every
+            step = (generation + 1) // spec.report_every
+            _save_report(checkpoints, ai.checkpoint_arrays(), ai.checkpoint_metadata(), step, mean)
+            yield mean
+
+
+_NEURAL_DIRECTIONS = {
+    "Up": Direction.UP,
+    "Down": Direction.DOWN,
+    "Left": Direction.LEFT,
+    "Right": Direction.RIGHT,
+}
+
+
+def _train_neural(
+    spec: SweepSpec, params: dict, seed: int, checkpoints: CheckpointManager, start: int
+) -> Iterator[float]:
+    """Mean score of the games played in each report window of play-then-fit rounds"""
+    from .neural import NeuralSnakeAI
+
+    ai = NeuralSnakeAI(
+        hidden_layers=tuple(params.get("hidden_layers", (100, 50, 25))),
+        cell_size=1,
+        field_size=spec.width,
+        field_height=spec.height,
+        # Samples are memory-mapped next to the checkpoints and survive an interruption
+        store_path=checkpoints.directory / "samples",
+    )
+    if start:
+        ai.load_checkpoint(checkpoints.latest())
+    else:
+        ai.store.clear()
+    ai.batch_size = params.get("batch_size", ai.batch_size)
+    ai.min_training_samples = params.get("min_training_samples", ai.min_training_samples)
+    games_per_round = params.get("games_per_round", 5)
+    exploration = params.get("exploration", 0.1)
+
+    config = GameConfig(width=spec.width, height=spec.height, speed_ms=0)
+    scores: list[int] = []
+    for round_ in range(start * spec.report_every, spec.budget):
+        for _ in range(games_per_round):
+            game = SnakeGame(config)
+
+            def choose(game: SnakeGame = game) -> Direction | None:
+                if random.random() < exploration:
+                    action = random.choice(ai.DIRECTIONS)
+                else:
+                    action = ai.predict_best_action(game.snake, game.food, game.obstacles)
+                if action is None:
+                    return None
+                ai.add_training_data(game.snake, game.food, game.obstacles, action, None)
+                return _NEURAL_DIRECTIONS[action]
+
+            scores.append(_play_episode(game, choose, spec.max_steps))
+
+        ai.train()
+        if (round_ + 1) % spec.report_every == 0:
+            window = scores[-spec.report_every * games_per_round :]
+            mean = sum(window) / len(window)
+            # Without a fitted model there is nothing to resume from yet
+            if ai.is_trained:
+                ai.store.flush()
+                step = (round_ + 1) // spec.report_every
+                _save_report(
+                    checkpoints, ai.checkpoint_arrays(), ai.checkpoint_metadata(), step, mean
+                )
+            yield mean
+    ai.close()
+
+
+# Trainers resume after report `start` from checkpoints.latest() and yield the later reports
+TRAINERS: dict[str, Callable[[SweepSpec, dict, int, CheckpointManager, int], Iterator[float]]] = {
+    "dqn": _train_dqn,
+    "genetic": _train_genetic,
+    "neural": _train_neural,
+}
+
+
+def run_trial(
+    db_path: str | Path,
+    spec: SweepSpec,
+    trial_id: int,
+    params: dict,
+    seed: int,
+    checkpoint_dir: str,
+) -> tuple[int, str, float | None]:
+    """Train one trial, reporting to the store; returns (id, status, value)"""
+    checkpoints = CheckpointManager(
+        Path(checkpoint_dir) / f"trial-{trial_id:04d}", prefix=spec.algorithm, keep_last=1
+    )
+    store = SweepStore(db_path)
+    # Checkpoints of a pending trial are left over from another sweep file
+    latest = checkpoints.latest() if store.status(trial_id) != PENDING else None
+    metadata = load_npz(latest, mmap=True)[1] if latest is not None else {}
+    start = metadata.get("step", 0)
+    value: float | None = metadata.get("value")
+    if start:
+        seed = int(np.random.SeedSequence([seed, start]).generate_state(1)[0])
+    random.seed(seed)
+    np.random.seed(seed % 2**32)
+
+    store.start(trial_id, start)
+    try:
+        trainer = TRAINERS[spec.algorithm](spec, params, seed, checkpoints, start)
+        for step, value in enumerate(trainer, start + 1):
+            store.report(trial_id, step, value)
+            if should_prune(store, spec, trial_id, step, value):
+                store.finish(trial_id, PRUNED, value)
+                return trial_id, PRUNED, value
+        store.finish(trial_id, COMPLETE, value)
+        return trial_id, COMPLETE, value
+    except Exception as e:
+        store.finish(trial_id, FAILED, value, error=f"{type(e).__name__}: {e}")
+        return trial_id, FAILED, value
+    finally:
+        checkpoints.close()
+        store.close()
+
+
+def _run_trial_task(task: tuple) -> tuple[int, str, float | None]:
+    return run_trial(*task)
+
+
+def run_sweep(
+    spec: SweepSpec,
+    db_path: str | Path,
+    workers: int = 1,
+    checkpoint_dir: str | Path | None = None,
+    on_trial: Callable[[int, str, float | None], None] | None = None,
+) -> list[dict]:
+    """Run every unfinished trial of the spec; returns SweepStore.results()"""
+    db_path = Path(db_path)
+    checkpoint_dir = str(checkpoint_dir or db_path.with_name(f"{db_path.stem}-checkpoints"))
+
+    store = SweepStore(db_path)
+    try:
+        store.register(spec)
+        tasks = [
+            (str(db_path), spec, trial_id, params, seed, checkpoint_dir)
+            for trial_id, params, seed in store.unfinished()
+        ]
+
+        if workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                result = run_trial(*task)
+                if on_trial:
+                    on_trial(*result)
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(tasks)), mp_context=mp.get_context()
+            ) as pool:
+                futures = [pool.submit(_run_trial_task, task) for task in tasks]
+                for future in as_completed(futures):
+                    if on_trial:
+                        on_trial(*future.result())
+
+        return store.results()
+    finally:
+        store.close()
@@ -95,21 +95,17 @@ class AdvancedGameAnalytics:
 
     def calculate_free_space(self, snake, obstacles):
         """Подсчет свободного пространства"""
-        total_cells = (400 // 10) * (400 // 10)
-        occupied = len(snake) + len(obstacles)
-        return total_cells - occupied
+        return self.analyze_board(snake, obstacles).free_cells
 
     def get_safe_directions(self, snake, food, obstacles):
         """Получить безопасные направления движения"""
-        head = snake[0]
-        safe_dirs = []
+        return [d.value for d in self.analyze_board(snake, obstacles).safe_directions]
 
-        for direction in ["Up", "Down", "Left", "Right"]:
-            next_pos = self.get_next_position(head, direction)
-            if self.is_valid_position(next_pos, snake, obstacles):
-                safe_dirs.append(direction)
+    def analyze_board(self, snake, obstacles):
+        """Общий анализ поля 400×400 с клеткой 10, кэшируемый по хэшу доски"""
+        from .ai.analysis import analyze_board
 
-        return safe_dirs
+        return analyze_board(list(snake), obstacles, 40, 40, cell_size=10)
 
     def is_valid_position(self, pos, snake, obstacles):
         """Проверка валидности позиции"""
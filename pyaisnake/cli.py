@@ -6,6 +6,9 @@ Commands:
     play       Play the game manually
     ai         Let AI play the game
     train      Train AI models
+    export     Export trained models for inference
+    solve      Precompute a policy table for a small board
+    sweep      Run a hyperparameter sweep
     stats      View game statistics
     tournament Run AI tournament
     achievements View achievements
@@ -13,6 +16,7 @@ Commands:
 
 import argparse
 import json
+import os
 import random
 import sqlite3
 import sys
@@ -25,6 +29,13 @@ from rich.table import Table
 
 from . import __version__
 from .achievements import Achievement, AchievementSystem
+from .ai.players import (
+    CHECKPOINT_DIR,
+    IMITATION_MODEL_FILE,
+    QUANTIZED_DQN_FILE,
+    create_ai,
+    policy_table_file,
+)
 from .engine import Difficulty, Direction, GameConfig, GameMode, GameState, SnakeGame
 from .renderer import CLIRenderer, Theme
 
@@ -38,6 +49,8 @@ except ImportError:
 
 console = Console()
 
+IMITATION_DATASET_FILE = "imitation_dataset.npz"
+
 
 def create_parser() -> argparse.ArgumentParser:
     """Create CLI argument parser"""
@@ -124,7 +137,18 @@ def create_parser() -> argparse.ArgumentParser:
     ai_parser.add_argument(
         "--algorithm",
         "-a",
-        choices=["a_star", "neural", "genetic", "random", "dqn"],
+        choices=[
+            "a_star",
+            "safe_greedy",
+            "expectimax",
+            "policy",
+            "imitation",
+            "neural",
+            "genetic",
+            "random",
+            "dqn",
+            "dqn_int8",
+        ],
         default="a_star",
         help="AI algorithm to use (default: a_star)",
     )
@@ -159,6 +183,11 @@ def create_parser() -> argparse.ArgumentParser:
         type=int,
         default=50,
     )
+    ai_parser.add_argument(
+        "--cache-decisions",
+        action="store_true",
+        help="Memoize decisions of observation-based players (dqn, dqn_int8)",
+    )
     ai_parser.add_argument(
         "--difficulty",
         "-d",
@@ -177,7 +206,7 @@ def create_parser() -> argparse.ArgumentParser:
     train_parser.add_argument(
         "--algorithm",
         "-a",
-        choices=["neural", "genetic", "dqn"],
+        choices=["neural", "genetic", "dqn", "es", "imitation"],
         required=True,
         help="Algorithm to train",
     )
@@ -198,6 +227,129 @@ def create_parser() -> argparse.ArgumentParser:
         type=str,
         help="Load existing model to continue training",
     )
+    train_parser.add_argument(
+        "--actors",
+        type=int,
+        default=0,
+        help="DQN only: number of actor processes for distributed training (default: 0, off)",
+    )
+    train_parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="ES, genetic and imitation: number of worker processes (default: CPU count)",
+    )
+    train_parser.add_argument(
+        "--eval-games",
+        type=int,
+        default=3,
+        help="Genetic only: games per genome, fitness is averaged (default: 3)",
+    )
+    train_parser.add_argument(
+        "--checkpoint-dir",
+        type=str,
+        default=CHECKPOINT_DIR,
+        help=f"Directory for versioned training checkpoints (default: {CHECKPOINT_DIR})",
+    )
+    train_parser.add_argument(
+        "--keep",
+        type=int,
+        default=3,
+        help="Number of recent checkpoints to keep besides the best one (default: 3)",
+    )
+    train_parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Resume from the latest checkpoint",
+    )
+    train_parser.add_argument(
+        "--curriculum",
+        nargs="?",
+        const="default",
+        default=None,
+        help="DQN only: train through board stages, built-in or from a JSON file; "
+        "--games caps the total episodes",
+    )
+    train_parser.add_argument(
+        "--teacher",
+        choices=["a_star", "safe_greedy", "expectimax", "policy"],
+        default="a_star",
+        help="Imitation only: player whose moves are distilled (default: a_star)",
+    )
+
+    # Export command
+    export_parser = subparsers.add_parser("export", help="Export trained models for inference")
+    export_parser.add_argument(
+        "--algorithm",
+        "-a",
+        choices=["dqn", "neural"],
+        default="dqn",
+        help="Model type to export (default: dqn)",
+    )
+    export_parser.add_argument(
+        "--model",
+        type=str,
+        default=None,
+        help="Trained model file (default: dqn_model.pkl; neural: saved model or best checkpoint)",
+    )
+    export_parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=None,
+        help="Output file (default: dqn_model.int8.npz; neural: neural_model.npz)",
+    )
+
+    # Solve command
+    solve_parser = subparsers.add_parser(
+        "solve", help="Precompute a policy table for a small board"
+    )
+    solve_parser.add_argument(
+        "--width",
+        "-W",
+        type=int,
+        default=6,
+    )
+    solve_parser.add_argument(
+        "--height",
+        "-H",
+        type=int,
+        default=6,
+    )
+    solve_parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        default=None,
+        help="Output file (default: policy_<width>x<height>.npz)",
+    )
+
+    # Sweep command
+    sweep_parser = subparsers.add_parser("sweep", help="Run a hyperparameter sweep")
+    sweep_parser.add_argument(
+        "spec",
+        type=str,
+        help="Sweep spec JSON: algorithm, params and search settings",
+    )
+    sweep_parser.add_argument(
+        "--db",
+        type=str,
+        default=None,
+        help="SQLite file with trial results; rerun to resume (default: <spec name>.db)",
+    )
+    sweep_parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of trials trained at once (default: CPU count)",
+    )
+    sweep_parser.add_argument(
+        "--top",
+        "-t",
+        type=int,
+        default=10,
+        help="Show top N trials (default: 10)",
+    )
 
     # Stats command
     stats_parser = subparsers.add_parser("stats", help="View game statistics")
@@ -636,20 +788,61 @@ def cmd_ai(args: argparse.Namespace) -> int:
     )
 
     results = []
+    decisions = None
+    if args.cache_decisions:
+        from .ai.cache import LRUCache
+
+        # One memo for every game: they all play the same model
+        decisions = LRUCache(max_entries=4096)
+
+    _warn_missing_export(args.algorithm)
+    if args.algorithm in ("dqn", "dqn_int8") and not args.visualize and args.games > 1:
+        games, game_moves = _play_dqn_lockstep(config, args.games, args.algorithm, decisions)
+        for game_num, (game, moves) in enumerate(zip(games, game_moves)):
+            results.append(
+                {
+                    "game": game_num + 1,
+                    "score": game.stats.score,
+                    "moves": moves,
+                    "duration": game.stats.duration,
+                    "power_ups": game.stats.power_ups_collected,
+                }
+            )
+            console.print(
+                f"Game {game_num + 1}: Score={game.stats.score}, "
+                f"Moves={moves}, Power-ups={game.stats.power_ups_collected}"
+            )
+        _show_ai_summary(results)
+        if decisions is not None:
+            _show_cache_stats(decisions.stats())
+        return 0
 
     for game_num in range(args.games):
         game = SnakeGame(config)
         renderer = CLIRenderer(game, theme=theme) if args.visualize else None
 
-        ai = _create_ai(args.algorithm, game)
+        ai = create_ai(args.algorithm, game)
+        if decisions is not None and hasattr(ai, "observe"):
+            from .ai.decision_cache import DecisionCache
+
+            ai = DecisionCache(ai, cache=decisions)
 
         if renderer and args.visualize:
+            from .ai.speculative import SpeculativeAI
+
+            # Decide the next move while this frame renders and sleeps
+            ai = SpeculativeAI(ai)
             renderer.start_live()
 
         try:
             moves = 0
+            deadline_misses = 0
             while game.state == GameState.RUNNING:
-                direction = ai.get_direction()
+                tick_end = time.perf_counter() + game.effective_speed / 1000
+                deadline = game.move_deadline()
+                direction = ai.get_direction(deadline)
+                if time.perf_counter() > deadline:
+                    deadline_misses += 1
                 if direction:
                     game.set_direction(direction)
 
@@ -657,11 +850,16 @@ def cmd_ai(args: argparse.Namespace) -> int:
                     moves += 1
 
                 if renderer:
+                    if game.state == GameState.RUNNING:
+                        # The prefetched move is consumed at the start of the next
+                        # tick, so it may use the rest of this one as well
+                        ai.prefetch(game.move_deadline(budget=1.8))
                     renderer.update()
-                    time.sleep(game.effective_speed / 1000)
+                    time.sleep(max(0.0, tick_end - time.perf_counter()))
 
         finally:
             if renderer:
+                ai.close()
                 renderer.stop_live()
 
         results.append(
@@ -671,41 +869,64 @@ def cmd_ai(args: argparse.Namespace) -> int:
                 "moves": moves,
                 "duration": game.stats.duration,
                 "power_ups": game.stats.power_ups_collected,
+                "deadline_misses": deadline_misses,
             }
         )
 
         if not args.visualize:
             console.print(
                 f"Game {game_num + 1}: Score={game.stats.score}, "
-                f"Moves={moves}, Power-ups={game.stats.power_ups_collected}"
+                f"Moves={moves}, Power-ups={game.stats.power_ups_collected}, "
+                f"Deadline misses={deadline_misses}"
             )
 
     if args.games > 1:
         _show_ai_summary(results)
+    if decisions is not None:
+        _show_cache_stats(decisions.stats())
 
     return 0
 
 
-def _create_ai(algorithm: str, game: SnakeGame):
-    """Create AI instance"""
-    if algorithm == "random":
-        return RandomAI(game)
-    elif algorithm == "a_star":
-        return AStarAI(game)
-    elif algorithm == "neural":
-        return NeuralAI(game)
-    elif algorithm == "genetic":
-        return GeneticAI(game)
-    elif algorithm == "dqn":
-        from .ai.dqn import DQNAI
-
-        ai = DQNAI(game)
-        model_path = Path("dqn_model.pkl")
-        if model_path.exists():
-            ai.load_model(str(model_path))
-        return ai
-    else:
-        return RandomAI(game)
+def _show_cache_stats(stats: dict) -> None:
+    console.print(
+        f"Decision cache: {stats['hits']} hits, {stats['misses']} misses "
+        f"({stats['hit_rate']:.1%}), {stats['entries']} entries"
+    )
+
+
+def _warn_missing_export(algorithm: str) -> None:
+    """create_ai quietly plays the float DQN when no int8 model was exported"""
+    if algorithm == "dqn_int8" and not Path(QUANTIZED_DQN_FILE).exists():
+        console.print(
+            f"[red]{QUANTIZED_DQN_FILE} not found, run `export` first; "
+            "playing the float DQN instead[/red]"
+        )
+
+
+def _play_dqn_lockstep(
+    config: GameConfig, count: int, algorithm: str = "dqn", decisions=None
+) -> tuple[list[SnakeGame], list[int]]:
+    """Play several DQN games side by side with one batched forward pass per tick"""
+    games = [SnakeGame(config) for _ in range(count)]
+    ai = create_ai(algorithm, games[0])
+    if decisions is not None:
+        from .ai.decision_cache import DecisionCache
+
+        # Only unseen observations reach the network
+        ai = DecisionCache(ai, cache=decisions)
+    moves = [0] * count
+
+    live = list(range(count))
+    while live:
+        directions = ai.get_directions([games[i] for i in live])
+        for i, direction in zip(live, directions):
+            games[i].set_direction(direction)
+            if games[i].update():
+                moves[i] += 1
+        live = [i for i in live if games[i].state == GameState.RUNNING]
+
+    return games, moves
 
 
 def _show_ai_summary(results: list) -> None:
@@ -722,18 +943,29 @@ def _show_ai_summary(results: list) -> None:
     table.add_row("Best Score", str(max(scores)))
     table.add_row("Worst Score", str(min(scores)))
     table.add_row("Total Power-ups", str(sum(power_ups)))
+    if any("deadline_misses" in r for r in results):
+        misses = sum(r.get("deadline_misses", 0) for r in results)
+        table.add_row("Deadline Misses", str(misses))
 
     console.print(table)
 
 
 def cmd_train(args: argparse.Namespace) -> int:
     """Train AI models"""
-    if args.algorithm not in ("neural", "dqn"):
+    if args.algorithm not in ("neural", "genetic", "dqn", "es", "imitation"):
         console.print(f"[red]Training not supported for {args.algorithm}[/red]")
         return 1
 
+    from .ai.checkpoint import CheckpointManager
     from .ai.dqn import DQNAI
 
+    if args.algorithm == "es":
+        return _train_es(args)
+    if args.algorithm == "imitation":
+        return _train_imitation(args)
+    if args.algorithm == "genetic":
+        return _train_genetic(args)
+
     console.print("[bold cyan]Training DQN AI...[/bold cyan]")
     console.print(f"Games: {args.games}")
 
@@ -747,9 +979,21 @@ def cmd_train(args: argparse.Namespace) -> int:
     ai = DQNAI(game, epsilon_start=1.0, epsilon_end=0.01, epsilon_decay=0.995)
     ai.start_training()
 
-    if dqn_path.exists():
+    checkpoints = CheckpointManager(args.checkpoint_dir, prefix="dqn", keep_last=args.keep)
+    resumed = checkpoints.load() if args.resume else None
+
+    if resumed is not None:
+        ai.load_checkpoint(*resumed)
+        console.print(f"Resumed from: {checkpoints.latest()}")
+    elif dqn_path.exists():
         ai.load_model(str(dqn_path))
 
+    if args.actors > 0:
+        return _train_dqn_distributed(args, ai, dqn_path, checkpoints)
+    if args.curriculum:
+        stage = resumed[1].get("stage", 0) if resumed is not None else 0
+        return _train_dqn_curriculum(args, ai, dqn_path, checkpoints, stage)
+
     for episode in range(args.games):
         game = SnakeGame(config)
         ai.game = game
@@ -777,12 +1021,20 @@ def cmd_train(args: argparse.Namespace) -> int:
                 f"Epsilon: {ai.epsilon:.3f}"
             )
 
-        if args.save:
-            ai.save_model(args.save)
-        else:
-            ai.save_model(str(dqn_path))
+        recent = scores_history[-10:]
+        checkpoints.save(
+            ai.checkpoint_arrays(),
+            {**ai.checkpoint_metadata(), "episode": episode + 1},
+            score=sum(recent) / len(recent),
+        )
 
     ai.stop_training()
+    checkpoints.close()
+
+    if args.save:
+        ai.save_model(args.save)
+    else:
+        ai.save_model(str(dqn_path))
 
     console.print("\n[bold green]Training complete![/bold green]")
     console.print(f"Best score: {best_score}")
@@ -796,6 +1048,353 @@ def cmd_train(args: argparse.Namespace) -> int:
     return 0
 
 
+def _train_dqn_distributed(args: argparse.Namespace, ai, dqn_path: Path, checkpoints) -> int:
+    """Train DQN with actor processes feeding a shared-memory replay buffer"""
+    from .ai.distributed import DistributedConfig, train_distributed
+
+    console.print(f"Actors: {args.actors}")
+
+    dist_config = DistributedConfig(num_actors=args.actors, episodes=args.games)
+    recent: list[int] = []
+
+    def on_episode(episode: int, actor_id: int, score: int) -> None:
+        recent.append(score)
+        if episode % 10 == 0:
+            checkpoints.save(
+                ai.checkpoint_arrays(),
+                {**ai.checkpoint_metadata(), "episode": episode},
+                score=sum(recent[-10:]) / len(recent[-10:]),
+            )
+            console.print(
+                f"Episode {episode}/{args.games} | "
+                f"Actor: {actor_id} | "
+                f"Avg(10): {sum(recent[-10:]) / len(recent[-10:]):.1f} | "
+                f"Best: {max(recent)}"
+            )
+
+    summary = train_distributed(ai, dist_config, on_episode=on_episode)
+    ai.stop_training()
+    checkpoints.close()
+
+    save_path = args.save or str(dqn_path)
+    ai.save_model(save_path)
+
+    console.print("\n[bold green]Training complete![/bold green]")
+    console.print(f"Best score: {summary['best_score']}")
+    console.print(f"Learner updates: {summary['updates']}")
+    console.print(f"Environment steps/s: {summary['steps_per_second']:.0f}")
+    console.print(f"Model saved to: {save_path}")
+
+    return 0
+
+
+def _train_dqn_curriculum(
+    args: argparse.Namespace, ai, dqn_path: Path, checkpoints, start_stage: int
+) -> int:
+    """Train DQN from small easy boards up, promoting when a stage's threshold is met"""
+    from .ai.curriculum import DEFAULT_CURRICULUM, CurriculumScheduler, load_curriculum
+
+    try:
+        stages = (
+            DEFAULT_CURRICULUM if args.curriculum == "default" else load_curriculum(args.curriculum)
+        )
+    except (OSError, ValueError, TypeError) as e:
+        console.print(f"[red]Invalid curriculum: {e}[/red]")
+        return 1
+
+    scheduler = CurriculumScheduler(stages, start=start_stage)
+    console.print(f"Curriculum: {len(stages)} stages")
+    if not scheduler.finished:
+        console.print(f"Stage {scheduler.stage_index + 1}: {scheduler.stage.describe()}")
+
+    for episode in range(args.games):
+        if scheduler.finished:
+            break
+        stage = scheduler.stage
+        game = scheduler.next_game()
+        ai.game = game
+
+        steps = 0
+        while game.state == GameState.RUNNING and steps < stage.max_steps:
+            direction = ai.get_direction()
+            if direction:
+                game.set_direction(direction)
+            game.update()
+            steps += 1
+
+        score = game.stats.score
+        promoted = scheduler.record(score, steps)
+
+        if promoted:
+            index, episodes, stage_steps = scheduler.history[-1]
+            console.print(
+                f"[green]Stage {index + 1} passed after {episodes} episodes "
+                f"({stage_steps} steps)[/green]"
+            )
+            if not scheduler.finished:
+                console.print(f"Stage {scheduler.stage_index + 1}: {scheduler.stage.describe()}")
+        elif (episode + 1) % 10 == 0:
+            console.print(
+                f"Episode {episode + 1}/{args.games} | "
+                f"Stage: {scheduler.stage_index + 1}/{len(stages)} | "
+                f"Score: {score} | "
+                f"Avg({stage.window}): {scheduler.recent_mean():.1f} | "
+                f"Epsilon: {ai.epsilon:.3f}"
+            )
+
+        # Scores on different boards are not comparable, so no checkpoint is ranked best
+        checkpoints.save(
+            ai.checkpoint_arrays(),
+            {**ai.checkpoint_metadata(), "episode": episode + 1, "stage": scheduler.stage_index},
+        )
+
+    ai.stop_training()
+    checkpoints.close()
+
+    save_path = args.save or str(dqn_path)
+    ai.save_model(save_path)
+
+    if scheduler.finished:
+        console.print("\n[bold green]Curriculum complete![/bold green]")
+    else:
+        console.print(
+            f"\n[bold yellow]Stopped in stage {scheduler.stage_index + 1}/{len(stages)}"
+            "[/bold yellow]"
+        )
+    console.print(f"Simulation steps: {scheduler.total_steps}")
+    console.print(f"Environments built: {scheduler.envs.created}")
+    console.print(f"Final epsilon: {ai.epsilon:.3f}")
+    console.print(f"Model saved to: {save_path}")
+
+    return 0
+
+
+def _train_genetic(args: argparse.Namespace) -> int:
+    """Evolve the genetic AI, evaluating each generation across worker processes"""
+    from .ai.checkpoint import CheckpointManager
+    from .ai.genetic import GeneticSnakeAI
+
+    console.print("[bold cyan]Training genetic AI...[/bold cyan]")
+    console.print(f"Generations: {args.games}")
+    console.print(f"Workers: {args.workers}")
+
+    genetic_path = args.save or "genetic_model.pkl"
+    ai = GeneticSnakeAI(
+        checkpoints=CheckpointManager(args.checkpoint_dir, prefix="genetic", keep_last=args.keep)
+    )
+    if args.resume and ai.resume():
+        console.print(f"Resumed from: {ai.checkpoints.latest()}")
+    elif args.load:
+        ai.load_population(args.load)
+
+    for _ in range(args.games):
+        fitness = ai.evaluate_population(args.eval_games, workers=max(1, args.workers))
+        console.print(
+            f"Generation {ai.generation + 1} | "
+            f"Best fitness: {fitness.max():.0f} | "
+            f"Avg fitness: {fitness.mean():.0f} | "
+            f"Best score: {max(ai.genome_scores):.1f}"
+        )
+        ai.evolve()
+
+    ai.close()
+    ai.save_population(genetic_path)
+
+    console.print("\n[bold green]Training complete![/bold green]")
+    console.print(f"Best fitness: {ai.best_fitness:.0f}")
+    console.print(f"Population saved to: {genetic_path}")
+
+    return 0
+
+
+def _train_es(args: argparse.Namespace) -> int:
+    """Train the DQN policy network with Evolution Strategies"""
+    from .ai.checkpoint import CheckpointManager
+    from .ai.dqn import DQNAI
+    from .ai.es import ESConfig, train_es
+
+    console.print("[bold cyan]Training DQN policy with Evolution Strategies...[/bold cyan]")
+    console.print(f"Generations: {args.games}")
+    console.print(f"Workers: {args.workers}")
+
+    dqn_path = Path("dqn_model.pkl")
+    ai = DQNAI(SnakeGame(GameConfig(width=20, height=20, speed_ms=0)), epsilon_start=0.0)
+
+    checkpoints = CheckpointManager(args.checkpoint_dir, prefix="es", keep_last=args.keep)
+    resumed = checkpoints.load() if args.resume else None
+    if resumed is not None:
+        ai.load_checkpoint(*resumed)
+        console.print(f"Resumed from: {checkpoints.latest()}")
+    elif args.load:
+        ai.load_model(args.load)
+    elif dqn_path.exists():
+        ai.load_model(str(dqn_path))
+
+    def on_generation(generation: int, stats: dict) -> None:
+        checkpoints.save(
+            ai.checkpoint_arrays(),
+            {**ai.checkpoint_metadata(), "generation": generation},
+            score=stats["mean_return"],
+        )
+        console.print(
+            f"Generation {generation}/{args.games} | "
+            f"Mean return: {stats['mean_return']:.2f} | "
+            f"Best: {stats['best_return']:.2f}"
+        )
+
+    es_config = ESConfig(generations=args.games, workers=max(1, args.workers))
+    summary = train_es(ai, es_config, on_generation=on_generation)
+    checkpoints.close()
+
+    save_path = args.save or str(dqn_path)
+    ai.save_model(save_path)
+
+    console.print("\n[bold green]Training complete![/bold green]")
+    console.print(f"Final mean return: {summary['mean_return']:.2f}")
+    console.print(f"Games/s: {summary['games_per_second']:.0f}")
+    console.print(f"Model saved to: {save_path}")
+
+    return 0
+
+
+def _train_imitation(args: argparse.Namespace) -> int:
+    """Distil a search player into a small policy network"""
+    from .ai.imitation import ImitationConfig, build_dataset, save_dataset, train_policy
+
+    config = ImitationConfig(teacher=args.teacher, games=args.games, workers=max(1, args.workers))
+    console.print(f"[bold cyan]Distilling {config.teacher} into a policy network...[/bold cyan]")
+    console.print(f"Teacher games: {config.games}")
+    console.print(f"Workers: {config.workers}")
+
+    start = time.time()
+    observations, actions = build_dataset(config)
+    save_dataset(IMITATION_DATASET_FILE, observations, actions, config)
+    console.print(
+        f"Dataset: {len(actions)} moves in {time.time() - start:.1f}s "
+        f"saved to {IMITATION_DATASET_FILE}"
+    )
+
+    policy, accuracy = train_policy(observations, actions, config)
+    save_path = args.save or IMITATION_MODEL_FILE
+    policy.save(save_path)
+
+    console.print("\n[bold green]Training complete![/bold green]")
+    console.print(f"Agreement with teacher: {accuracy:.1%}")
+    console.print(f"Model saved to: {save_path} ({policy.nbytes / 1024:.1f} KiB)")
+    return 0
+
+
+def cmd_export(args: argparse.Namespace) -> int:
+    """Export a trained model for play-only inference"""
+    if args.algorithm == "neural":
+        return _export_neural(args)
+
+    from .ai.quantize import export_quantized
+
+    model_path = args.model or "dqn_model.pkl"
+    output = args.output or QUANTIZED_DQN_FILE
+    try:
+        network = export_quantized(model_path, output)
+    except FileNotFoundError:
+        console.print(f"[red]Model not found: {model_path}[/red]")
+        return 1
+
+    original = Path(model_path).stat().st_size
+    console.print(f"[green]Quantized model saved to: {output}[/green]")
+    console.print(
+        f"Weights: {network.nbytes / 1024:.1f} KiB (source file {original / 1024:.1f} KiB)"
+    )
+    return 0
+
+
+def _export_neural(args: argparse.Namespace) -> int:
+    """Compile the neural model into a NumPy-only .npz archive"""
+    from .ai.checkpoint import CheckpointManager
+    from .ai.neural import NeuralSnakeAI
+
+    model = NeuralSnakeAI()
+    output = args.output or model.inference_file
+    if args.model:
+        loaded = Path(args.model).exists() and model.load_checkpoint(args.model)
+    else:
+        best = CheckpointManager(CHECKPOINT_DIR, prefix="neural").best()
+        loaded = model.load_model() or model.load_checkpoint(best)
+    if not loaded:
+        console.print(f"[red]Model not found: {args.model or model.model_file}[/red]")
+        return 1
+
+    model.export_inference(output)
+    console.print(f"[green]Neural model saved to: {output}[/green]")
+    console.print(
+        f"Weights: {model.inference.nbytes / 1024:.1f} KiB, playable without scikit-learn"
+    )
+    return 0
+
+
+def cmd_solve(args: argparse.Namespace) -> int:
+    """Precompute the policy table for an obstacle-free board"""
+    from .ai.policy_table import PolicyTable
+
+    output = args.output or policy_table_file(args.width, args.height)
+    try:
+        policy = PolicyTable.solve(args.width, args.height)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return 1
+
+    policy.save(output)
+    console.print(f"[green]Policy table saved to: {output}[/green]")
+    console.print(f"Table: {policy.nbytes / 1024:.1f} KiB, one lookup per move")
+    return 0
+
+
+def cmd_sweep(args: argparse.Namespace) -> int:
+    """Train every trial of a sweep spec, resuming from its results file"""
+    from .ai.sweep import SweepSpec, run_sweep
+
+    try:
+        spec = SweepSpec.load(args.spec)
+    except (OSError, ValueError, TypeError) as e:
+        console.print(f"[red]Invalid sweep spec: {e}[/red]")
+        return 1
+
+    db_path = args.db or str(Path(args.spec).with_suffix(".db"))
+    console.print(f"[bold cyan]Sweeping {spec.algorithm} ({spec.method} search)...[/bold cyan]")
+    console.print(f"Results: {db_path}")
+    console.print(f"Workers: {args.workers}")
+
+    def on_trial(trial_id: int, status: str, value: float | None) -> None:
+        score = "-" if value is None else f"{value:.2f}"
+        console.print(f"Trial {trial_id} | {status} | Score: {score}")
+
+    try:
+        results = run_sweep(spec, db_path, workers=max(1, args.workers), on_trial=on_trial)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return 1
+
+    table = Table(title=f"Sweep results (top {args.top})")
+    table.add_column("Trial", justify="right")
+    table.add_column("Status")
+    table.add_column("Score", justify="right")
+    table.add_column("Reports", justify="right")
+    table.add_column("Params")
+    for row in results[: args.top]:
+        table.add_row(
+            str(row["id"]),
+            row["status"],
+            "-" if row["value"] is None else f"{row['value']:.2f}",
+            str(row["reports"]),
+            json.dumps(row["params"]),
+        )
+    console.print(table)
+
+    failed = [row for row in results if row["status"] == "failed"]
+    for row in failed:
+        console.print(f"[red]Trial {row['id']} failed: {row['error']}[/red]")
+    return 1 if failed else 0
+
+
 def cmd_stats(args: argparse.Namespace) -> int:
     """Show game statistics"""
     db_path = Path("snake_stats.db")
@@ -889,19 +1488,24 @@ def cmd_tournament(args: argparse.Namespace) -> int:
 
     for algorithm in algorithms:
         console.print(f"[yellow]Running {algorithm}...[/yellow]")
+        _warn_missing_export(algorithm)
         scores = []
 
-        for _ in range(args.games):
-            game = SnakeGame(config)
-            ai = _create_ai(algorithm, game)
+        if algorithm in ("dqn", "dqn_int8"):
+            games, _ = _play_dqn_lockstep(config, args.games, algorithm)
+            scores = [game.stats.score for game in games]
+        else:
+            for _ in range(args.games):
+                game = SnakeGame(config)
+                ai = create_ai(algorithm, game)
 
-            while game.state == GameState.RUNNING:
-                direction = ai.get_direction()
-                if direction:
-                    game.set_direction(direction)
-                game.update()
+                while game.state == GameState.RUNNING:
+                    direction = ai.get_direction()
+                    if direction:
+                        game.set_direction(direction)
+                    game.update()
 
-            scores.append(game.stats.score)
+                scores.append(game.stats.score)
 
         results[algorithm] = {
             "scores": scores,
@@ -939,176 +1543,6 @@ def cmd_tournament(args: argparse.Namespace) -> int:
     return 0
 
 
-# Simple AI implementations
-class RandomAI:
-    """Simple random AI"""
-
-    def __init__(self, game: SnakeGame):
-        self.game = game
-
-    def get_direction(self) -> Direction | None:
-        safe = self.game.get_safe_directions()
-        return random.choice(safe) if safe else None
-
-
-class AStarAI:
-    """A* pathfinding AI with trap avoidance"""
-
-    def __init__(self, game: SnakeGame):
-        self.game = game
-        self._path: list[tuple[int, int]] = []
-        self._last_food: tuple[int, int] | None = None
-
-    def get_direction(self) -> Direction | None:
-        if not self.game.food:
-            return self._get_safe_direction()
-
-        head = self.game.snake[0]
-        food = self.game.food
-
-        if food != self._last_food or not self._path:
-            self._path = self._find_path(head, food)
-            self._last_food = food
-
-        if self._path:
-            next_pos = self._path[0]
-            self._path = self._path[1:]
-            return self._pos_to_direction(head, next_pos)
-
-        return self._get_safe_direction()
-
-    def _find_path(self, start: tuple[int, int], goal: tuple[int, int]) -> list[tuple[int, int]]:
-        import heapq
-
-        snake_set = set(self.game.snake)
-        obstacles = self.game.obstacles
-        width = self.game.config.width
-        height = self.game.config.height
-
-        open_set: list[tuple[int, tuple[int, int]]] = [(0, start)]
-        came_from: dict[tuple[int, int], tuple[int, int]] = {}
-        g_score: dict[tuple[int, int], int] = {start: 0}
-
-        while open_set:
-            _, current = heapq.heappop(open_set)
-
-            if current == goal:
-                return self._reconstruct_path(came_from, current)
-
-            for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-                neighbor = (current[0] + dx, current[1] + dy)
-
-                if not (0 <= neighbor[0] < width and 0 <= neighbor[1] < height):
-                    continue
-
-                if neighbor in snake_set and neighbor != self.game.snake[-1]:
-                    continue
-
-                if neighbor in obstacles:
-                    continue
-
-                tentative_g = g_score[current] + 1
-
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
-                    came_from[neighbor] = current
-                    g_score[neighbor] = tentative_g
-                    f_score = tentative_g + abs(neighbor[0] - goal[0]) + abs(neighbor[1] - goal[1])
-                    heapq.heappush(open_set, (f_score, neighbor))
-
-        return []
-
-    def _reconstruct_path(
-        self, came_from: dict[tuple[int, int], tuple[int, int]], current: tuple[int, int]
-    ) -> list[tuple[int, int]]:
-        path = []
-        while current in came_from:
-            path.append(current)
-            current = came_from[current]
-        path.reverse()
-        return path
-
-    def _pos_to_direction(self, head: tuple[int, int], next_pos: tuple[int, int]) -> Direction:
-        dx = next_pos[0] - head[0]
-        dy = next_pos[1] - head[1]
-
-        if dy < 0:
-            return Direction.UP
-        elif dy > 0:
-            return Direction.DOWN
-        elif dx < 0:
-            return Direction.LEFT
-        else:
-            return Direction.RIGHT
-
-    def _get_safe_direction(self) -> Direction | None:
-        safe = self.game.get_safe_directions()
-        if not safe:
-            return None
-
-        best_dir = None
-        best_space = -1
-
-        for direction in safe:
-            space = self._count_accessible_space(direction)
-            if space > best_space:
-                best_space = space
-                best_dir = direction
-
-        return best_dir
-
-    def _count_accessible_space(self, direction: Direction) -> int:
-        head = self.game.snake[0]
-        dx, dy = {
-            Direction.UP: (0, -1),
-            Direction.DOWN: (0, 1),
-            Direction.LEFT: (-1, 0),
-            Direction.RIGHT: (1, 0),
-        }[direction]
-
-        new_head = (head[0] + dx, head[1] + dy)
-
-        visited = {new_head}
-        queue = [new_head]
-        snake_set = set(self.game.snake)
-        obstacles = self.game.obstacles
-
-        while queue:
-            pos = queue.pop(0)
-            for ddx, ddy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-                npos = (pos[0] + ddx, pos[1] + ddy)
-                if (
-                    0 <= npos[0] < self.game.config.width
-                    and 0 <= npos[1] < self.game.config.height
-                    and npos not in visited
-                    and npos not in snake_set
-                    and npos not in obstacles
-                ):
-                    visited.add(npos)
-                    queue.append(npos)
-
-        return len(visited)
-
-
-class NeuralAI:
-    """Neural network AI placeholder"""
-
-    def __init__(self, game: SnakeGame):
-        self.game = game
-
-    def get_direction(self) -> Direction | None:
-        return AStarAI(self.game).get_direction()
-
-
-class GeneticAI:
-    """Genetic algorithm AI placeholder"""
-
-    def __init__(self, game: SnakeGame):
-        self.game = game
-
-    def get_direction(self) -> Direction | None:
-        return AStarAI(self.game).get_direction()
-
-
 def cmd_achievements(args: argparse.Namespace) -> int:
     """Show achievements"""
     system = AchievementSystem()
@@ -1315,6 +1749,7 @@ def cmd_level(args: argparse.Namespace) -> int:
             (start_x - 1, start_y),
             (start_x - 2, start_y),
         ]
+    game.tick += 1
 
     renderer = CLIRenderer(game, theme=theme)
 
@@ -1615,6 +2050,12 @@ def main() -> int:
         return cmd_ai(args)
     elif args.command == "train":
         return cmd_train(args)
+    elif args.command == "export":
+        return cmd_export(args)
+    elif args.command == "solve":
+        return cmd_solve(args)
+    elif args.command == "sweep":
+        return cmd_sweep(args)
     elif args.command == "stats":
         return cmd_stats(args)
     elif args.command == "tournament":
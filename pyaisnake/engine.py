@@ -2,8 +2,10 @@
 Game Engine - Pure game logic without GUI dependencies.
 """
 
+import copy
 import random
 import time
+from collections import deque
 from collections.abc import Callable
 from dataclasses import dataclass, field
 from enum import Enum
@@ -234,6 +236,11 @@ class SnakeGame:
         self._mode_start_speed: int = 100
         self._last_speed_increase: float = 0
 
+        # Board version: bumped whenever the snake, food or obstacles change,
+        # so per-tick analysis can be cached. Code that edits the board
+        # directly must bump it too.
+        self.tick = 0
+
         # Callbacks
         self.on_food_eaten: Callable[[], None] | None = None
         self.on_collision: Callable[[], None] | None = None
@@ -272,6 +279,7 @@ class SnakeGame:
 
     def _init_game(self) -> None:
         """Initialize game state"""
+        self.tick += 1
         center_x = self.config.width // 2
         center_y = self.config.height // 2
 
@@ -397,6 +405,7 @@ class SnakeGame:
 
         self.snake.insert(0, new_head)
         self.stats.moves += 1
+        self.tick += 1
 
         if self.on_move:
             self.on_move(new_head)
@@ -516,6 +525,15 @@ class SnakeGame:
         base_speed = self._mode_start_speed if self._speed_increase else self.config.speed_ms
         return int(base_speed * self.speed_modifier)
 
+    def move_deadline(self, budget: float = 0.8) -> float:
+        """
+        Absolute time.perf_counter() deadline for choosing the next move.
+
+        budget is the share of the tick the AI may spend; the rest is left for
+        the update and rendering.
+        """
+        return time.perf_counter() + self.effective_speed * budget / 1000
+
     def _is_valid_position(self, pos: tuple[int, int]) -> bool:
         """Check if position is valid for movement"""
         x, y = pos
@@ -534,6 +552,78 @@ class SnakeGame:
 
         return pos not in self.obstacles
 
+    def clone(self) -> "SnakeGame":
+        """
+        Cheap copy for look-ahead: board, direction, effects and stats.
+
+        The config is shared and callbacks are dropped, so simulating moves on
+        the clone never reaches the GUI or the original game.
+        """
+        game = copy.copy(self)
+        game.snake = list(self.snake)
+        game.obstacles = set(self.obstacles)
+        game.active_effects = list(self.active_effects)
+        game.stats = copy.copy(self.stats)
+        game.on_food_eaten = game.on_collision = game.on_move = game.on_power_up = None
+        return game
+
+    def advance_virtual(self, path: list[tuple[int, int]]) -> None:
+        """
+        Move the snake along path without collision checks or a food respawn.
+
+        Eating food grows the snake and leaves food as None; no random numbers
+        are drawn, so simulating on a clone does not disturb the real game.
+        """
+        for cell in path:
+            self.snake.insert(0, cell)
+            if cell == self.food:
+                self.food = None
+            else:
+                self.snake.pop()
+        self.tick += 1
+
+    def find_path(self, goal: tuple[int, int], min_steps: int = 1) -> list[tuple[int, int]]:
+        """
+        Shortest path from the head to goal by BFS, excluding the head.
+
+        Snake cells and obstacles are blocked except goal itself, which may be
+        entered after at least min_steps moves. Returns [] if goal is unreachable.
+        """
+        width = self.config.width
+        height = self.config.height
+        start = self.snake[0]
+        blocked = set(self.snake) | self.obstacles
+
+        came_from = {start: start}
+        queue = deque([(start, 0)])
+        while queue:
+            current, steps = queue.popleft()
+            for dx, dy in ((0, -1), (0, 1), (-1, 0), (1, 0)):
+                neighbor = (current[0] + dx, current[1] + dy)
+                if neighbor == goal and steps + 1 >= min_steps:
+                    path = [neighbor]
+                    while current != start:
+                        path.append(current)
+                        current = came_from[current]
+                    path.reverse()
+                    return path
+                if neighbor in came_from or neighbor in blocked:
+                    continue
+                if not (0 <= neighbor[0] < width and 0 <= neighbor[1] < height):
+                    continue
+                came_from[neighbor] = current
+                queue.append((neighbor, steps + 1))
+        return []
+
+    def path_to_tail(self) -> list[tuple[int, int]]:
+        """
+        Path the head can follow onto the tail's current cell, [] if none.
+
+        The tail cell counts as occupied on the next tick, so the path must be at
+        least two moves long; by then the tail has moved on.
+        """
+        return self.find_path(self.snake[-1], min_steps=2)
+
     def reset(self) -> None:
         """Reset game to initial state"""
         self.state = GameState.RUNNING
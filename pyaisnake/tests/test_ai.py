@@ -0,0 +1,1549 @@
+"""
+Tests for PyAISnake AI modules.
+"""
+
+import subprocess
+import sys
+import tempfile
+import unittest
+import unittest.mock
+from pathlib import Path
+
+import numpy as np
+
+from pyaisnake.ai.analysis import BoardAnalysis, analyze, analyze_board
+from pyaisnake.ai.base import AdvancedSnakeAI
+from pyaisnake.ai.cache import LRUCache, board_key
+from pyaisnake.ai.checkpoint import CheckpointManager, load_npz
+from pyaisnake.ai.distributed import (
+    DistributedConfig,
+    SharedParameters,
+    SharedReplayBuffer,
+    train_distributed,
+)
+from pyaisnake.ai.dqn import DQNAI, DQNetwork
+from pyaisnake.ai.es import ESConfig, apply_update, centered_ranks, train_es
+from pyaisnake.ai.feature_store import FeatureStore
+from pyaisnake.ai.genetic import DECISION_GENES, GeneticSnakeAI, Genome
+from pyaisnake.ai.inference import DQNInferenceEngine, MLPInference
+from pyaisnake.ai.neural import NeuralSnakeAI
+from pyaisnake.ai.qtable import QTable, pack_bits
+from pyaisnake.ai.quantize import QuantizedDQNAI, QuantizedDQNetwork, export_quantized
+from pyaisnake.engine import Direction, GameConfig, SnakeGame
+from pyaisnake.multiplayer import MultiplayerConfig
+
+
+class TestDQNetwork(unittest.TestCase):
+    """Test DQNetwork parameter helpers"""
+
+    def test_flat_roundtrip(self):
+        """Test weights survive get_flat/set_flat"""
+        source = DQNetwork(11, 16, 4)
+        target = DQNetwork(11, 16, 4)
+
+        target.set_flat(source.get_flat())
+
+        state = np.random.rand(11)
+        np.testing.assert_allclose(source.forward(state), target.forward(state))
+        self.assertEqual(source.num_parameters(), source.get_flat().size)
+
+
+class TestDQNInferenceEngine(unittest.TestCase):
+    """Test batched float32 inference"""
+
+    def setUp(self):
+        self.net = DQNetwork(11, 32, 4)
+        self.states = (np.random.rand(10, 11) > 0.5).astype(np.float32)
+
+    def test_matches_forward(self):
+        """Test engine agrees with DQNetwork.forward"""
+        engine = DQNInferenceEngine(self.net, max_batch=16)
+
+        np.testing.assert_allclose(
+            engine.q_values(self.states), self.net.forward(self.states), rtol=1e-4, atol=1e-5
+        )
+        self.assertEqual(engine.predict(self.states[0]), self.net.predict(self.states[0]))
+
+    def test_chunks_large_batches(self):
+        """Test batches above max_batch are split"""
+        engine = DQNInferenceEngine(self.net, max_batch=4)
+
+        actions = engine.predict_batch(self.states)
+        np.testing.assert_array_equal(actions, np.argmax(self.net.forward(self.states), axis=1))
+
+    def test_dqn_batch_directions(self):
+        """Test DQNAI decides for several games in one call"""
+        games = [SnakeGame(GameConfig(width=10, height=10)) for _ in range(3)]
+        ai = DQNAI(games[0], epsilon_start=0.0)
+
+        directions = ai.get_directions(games)
+        expected = ai.ACTIONS[ai.policy_net.predict(ai.get_state(games[1]))]
+        self.assertEqual(directions[1].name, expected)
+
+
+class TestQuantizedDQNetwork(unittest.TestCase):
+    """Test int8 weight quantization"""
+
+    def setUp(self):
+        np.random.seed(0)
+        self.net = DQNetwork(11, 256, 4)
+        self.states = (np.random.rand(32, 11) > 0.5).astype(np.float32)
+
+    def test_quarter_size(self):
+        """Test int8 weights take about a quarter of float32 storage"""
+        quantized = QuantizedDQNetwork.from_network(self.net)
+        float32_bytes = self.net.num_parameters() * 4
+
+        self.assertEqual(quantized.layers[1][0].dtype, np.int8)
+        self.assertLess(quantized.nbytes, float32_bytes * 0.3)
+
+    def test_close_to_float(self):
+        """Test quantized Q-values stay close to the float network"""
+        quantized = QuantizedDQNetwork.from_network(self.net)
+        expected = self.net.forward(self.states)
+
+        error = np.abs(quantized.forward(self.states) - expected).max()
+        self.assertLess(error, 0.05 * np.abs(expected).max() + 1e-3)
+
+    def test_scratch_per_thread(self):
+        """Test concurrent forward passes on one network match a serial run"""
+        import concurrent.futures
+
+        quantized = QuantizedDQNetwork.from_network(self.net)
+        expected = quantized.forward(self.states)
+        with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+            outputs = list(pool.map(lambda _: quantized.forward(self.states), range(32)))
+
+        for output in outputs:
+            np.testing.assert_array_equal(output, expected)
+
+    def test_networks_share_scratch(self):
+        """Test networks of one shape hold no float copy of their own weights"""
+        from pyaisnake.ai import quantize
+
+        first = QuantizedDQNetwork.from_network(self.net)
+        second = QuantizedDQNetwork.from_network(DQNetwork(11, 256, 4))
+        first.forward(self.states)
+        buffers = dict(quantize._local.buffers)
+        second.forward(self.states)
+
+        self.assertEqual(len(quantize._local.buffers), len(buffers))
+        for shape, scratch in buffers.items():
+            self.assertIs(quantize._local.buffers[shape], scratch)
+        self.assertEqual(vars(second).keys(), {"layers"})
+
+    def test_missing_export_falls_back(self):
+        """Test dqn_int8 plays the float DQN when no quantized model was exported"""
+        from pyaisnake.ai.players import create_ai
+
+        game = SnakeGame(GameConfig(width=10, height=10))
+        with unittest.mock.patch("pyaisnake.ai.players.QUANTIZED_DQN_FILE", "missing.int8.npz"):
+            ai = create_ai("dqn_int8", game)
+
+        self.assertIsInstance(ai, DQNAI)
+        self.assertNotIsInstance(ai, QuantizedDQNAI)
+
+    def test_export_and_play(self):
+        """Test exporting a saved model and playing with it"""
+        game = SnakeGame(GameConfig(width=10, height=10))
+        source = DQNAI(game)
+        with tempfile.TemporaryDirectory() as tmp:
+            model_path = Path(tmp) / "model.pkl"
+            output_path = Path(tmp) / "model.int8.npz"
+            source.save_model(str(model_path))
+
+            export_quantized(model_path, output_path)
+            network = QuantizedDQNetwork.load(output_path, mmap=True)
+            ai = QuantizedDQNAI(game, network)
+
+            state = source.get_state()
+            self.assertEqual(network.predict(state), source.policy_net.predict(state))
+            self.assertIsNotNone(ai.get_direction())
+            del ai, network
+
+
+class TestMLPInference(unittest.TestCase):
+    """Test sklearn-free inference for NeuralSnakeAI"""
+
+    def setUp(self):
+        from sklearn.neural_network import MLPRegressor
+        from sklearn.preprocessing import StandardScaler
+
+        rng = np.random.default_rng(0)
+        self.X = rng.normal(3.0, 2.0, size=(200, 19))
+        y = rng.normal(size=(200, 4))
+        self.scaler = StandardScaler().fit(self.X)
+        self.model = MLPRegressor(hidden_layer_sizes=(16, 8), max_iter=50, random_state=0)
+        self.model.fit(self.scaler.transform(self.X), y)
+
+    def test_folded_scaler_matches_sklearn(self):
+        """Test folding the scaler into layer one reproduces sklearn outputs"""
+        inference = MLPInference.from_sklearn(self.model, self.scaler)
+        expected = self.model.predict(self.scaler.transform(self.X))
+
+        np.testing.assert_allclose(inference.predict(self.X), expected, atol=1e-4)
+        np.testing.assert_allclose(inference.predict(self.X[0]), expected[0], atol=1e-4)
+        self.assertEqual(inference.coefs[0].dtype, np.float32)
+
+    def test_load_without_sklearn(self):
+        """Test an exported model plays in a process where sklearn cannot be imported"""
+        neural = NeuralSnakeAI(cell_size=1, field_size=10)
+        neural.model, neural.scaler = self.model, self.scaler
+        neural.compile_inference()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "neural_model.npz"
+            neural.export_inference(path)
+            script = (
+                "import sys; sys.modules['sklearn'] = None\n"
+                "from pyaisnake.ai.neural import NeuralSnakeAI\n"
+                "ai = NeuralSnakeAI(cell_size=1, field_size=10)\n"
+                f"assert ai.load_inference({str(path)!r}, mmap=True)\n"
+                "print(ai.predict_best_action([(5, 5), (5, 6)], (2, 2), []))\n"
+            )
+            result = subprocess.run(
+                [sys.executable, "-c", script], capture_output=True, text=True, check=True
+            )
+
+        self.assertEqual(
+            result.stdout.strip(), neural.predict_best_action([(5, 5), (5, 6)], (2, 2), [])
+        )
+
+
+class TestFeatureStore(unittest.TestCase):
+    """Test the columnar training sample store"""
+
+    def _fill(self, store, start, count):
+        for i in range(start, start + count):
+            store.append(np.full(store.n_features, i, dtype=np.float32), i % 4, float(i))
+
+    def test_ring_keeps_newest_in_order(self):
+        """Test overflow drops the oldest samples and since() returns new ones in order"""
+        store = FeatureStore(capacity=5, n_features=3)
+        self._fill(store, 0, 8)
+
+        features, actions, rewards = store.arrays()
+        self.assertEqual(len(store), 5)
+        np.testing.assert_array_equal(rewards, [3, 4, 5, 6, 7])
+        np.testing.assert_array_equal(features[:, 0], rewards)
+        np.testing.assert_array_equal(store.since(6)[2], [6, 7])
+        self.assertEqual(len(store.since(8)[0]), 0)
+
+    def test_memmap_survives_reopen(self):
+        """Test a disk-backed store reopens with its samples and cursor"""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FeatureStore(capacity=4, n_features=2, path=tmp)
+            self._fill(store, 0, 6)
+            store.flush()
+            del store
+
+            reopened = FeatureStore(capacity=4, n_features=2, path=tmp)
+            self.assertEqual(reopened.total, 6)
+            np.testing.assert_array_equal(reopened.arrays()[2], [2, 3, 4, 5])
+            del reopened
+
+    def test_resized_column_resets_cursor(self):
+        """Test reopening with a different feature width starts empty"""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = FeatureStore(capacity=4, n_features=2, path=tmp)
+            self._fill(store, 0, 3)
+            store.flush()
+            del store
+
+            reopened = FeatureStore(capacity=4, n_features=3, path=tmp)
+            self.assertEqual(reopened.total, 0)
+            self.assertEqual(len(reopened.arrays()[0]), 0)
+            del reopened
+
+    def test_neural_incremental_retrain(self):
+        """Test incremental and background retraining publish new model versions"""
+        from pyaisnake.ai.checkpoint import CheckpointManager
+
+        rng = np.random.default_rng(0)
+        with tempfile.TemporaryDirectory() as tmp:
+            ai = NeuralSnakeAI(
+                hidden_layers=(8,),
+                checkpoints=CheckpointManager(tmp, prefix="neural"),
+                cell_size=1,
+                field_size=10,
+            )
+            ai.min_training_samples = 20
+
+            def add_samples(count):
+                for _ in range(count):
+                    x, y = rng.integers(1, 9, size=2)
+                    food = tuple(int(v) for v in rng.integers(0, 10, size=2))
+                    snake = [(int(x), int(y)), (int(x), int(y) + 1)]
+                    ai.add_training_data(snake, food, [], str(rng.choice(ai.DIRECTIONS)), None)
+
+            add_samples(30)
+            self.assertTrue(ai.train())
+            self.assertEqual(ai.store.features.dtype, np.float32)
+            self.assertFalse(ai.retrain_if_needed())
+
+            weights = ai.inference.coefs[0].copy()
+            add_samples(25)
+            with unittest.mock.patch.object(
+                ai.model, "fit", side_effect=AssertionError("full refit")
+            ):
+                self.assertTrue(ai.retrain_if_needed())
+            self.assertFalse(np.array_equal(ai.inference.coefs[0], weights))
+            self.assertEqual(ai.get_training_stats()["pending_samples"], 0)
+
+            add_samples(25)
+            inference, version = ai.inference, ai.model_version
+            self.assertTrue(ai.retrain_if_needed(background=True))
+            # The playing model stays usable until the new version is swapped in
+            self.assertIsNotNone(ai.predict_best_action([(5, 5), (5, 6)], (2, 2), []))
+            # A synchronous retrain must not race the background one
+            with unittest.mock.patch.object(
+                ai, "partial_train", side_effect=AssertionError("concurrent retrain")
+            ):
+                self.assertFalse(ai.retrain_if_needed())
+            self.assertTrue(ai.wait_retrain(timeout=60))
+            ai.close()
+
+            self.assertEqual(ai.model_version, version + 1)
+            self.assertIsNot(ai.inference, inference)
+            self.assertEqual(ai.get_training_stats()["pending_samples"], 0)
+            # close() also flushed the checkpoint written by the background retrain
+            self.assertEqual(len(ai.checkpoints.versions()), ai.model_version)
+
+
+class TestSharedReplayBuffer(unittest.TestCase):
+    """Test shared-memory replay buffer"""
+
+    def setUp(self):
+        self.buffer = SharedReplayBuffer(capacity=8, state_size=3)
+
+    def tearDown(self):
+        self.buffer.close()
+
+    def _push(self, start, count):
+        states = np.arange(start, start + count, dtype=np.float32)[:, None].repeat(3, axis=1)
+        self.buffer.push_batch(
+            states,
+            np.zeros(count, dtype=np.int64),
+            np.ones(count, dtype=np.float32),
+            states + 1,
+            np.zeros(count, dtype=np.float32),
+        )
+
+    def test_wraps_around(self):
+        """Test buffer overwrites oldest entries once full"""
+        self._push(0, 6)
+        self._push(6, 6)
+
+        self.assertEqual(len(self.buffer), 8)
+        self.assertEqual(sorted(self.buffer.states[:, 0]), list(range(4, 12)))
+
+    def test_attach_sees_writes(self):
+        """Test a second handle on the same block sees pushed data"""
+        self._push(0, 4)
+        name, capacity, state_size = self.buffer.spec()
+        other = SharedReplayBuffer(capacity, state_size, name=name)
+        try:
+            self.assertEqual(len(other), 4)
+        finally:
+            other.close()
+
+    def test_sample_shapes(self):
+        """Test sampled batch layout"""
+        self._push(0, 5)
+        states, actions, rewards, next_states, dones = self.buffer.sample(
+            4, np.random.default_rng(0)
+        )
+
+        self.assertEqual(states.shape, (4, 3))
+        self.assertEqual(next_states.shape, (4, 3))
+        self.assertEqual(actions.shape, (4,))
+        np.testing.assert_array_equal(next_states, states + 1)
+
+    def test_sample_during_writes(self):
+        """Test sampled rows never mix two transitions while a writer is pushing"""
+        import threading
+
+        self._push(0, 8)
+        stop = threading.Event()
+
+        def write():
+            start = 8
+            while not stop.is_set():
+                self._push(start, 5)
+                start += 5
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            rng = np.random.default_rng(0)
+            for _ in range(500):
+                states, _, _, next_states, _ = self.buffer.sample(8, rng)
+                np.testing.assert_array_equal(next_states, states + 1)
+        finally:
+            stop.set()
+            writer.join()
+
+
+def _fill_replay_and_exit(actor_id, config, replay_spec, replay_lock, *_args):
+    """Actor stand-in that writes one warmup's worth of transitions, then dies"""
+    replay = SharedReplayBuffer(*replay_spec[1:], name=replay_spec[0], lock=replay_lock)
+    count, size = config.warmup, replay_spec[2]
+    replay.push_batch(
+        np.zeros((count, size), dtype=np.float32),
+        np.zeros(count, dtype=np.int64),
+        np.zeros(count, dtype=np.float32),
+        np.zeros((count, size), dtype=np.float32),
+        np.ones(count, dtype=np.float32),
+    )
+
+
+def _exit_immediately(*_args):
+    """Worker stand-in that dies without reporting anything"""
+
+
+class TestDistributedTraining(unittest.TestCase):
+    """Test actor-learner DQN training"""
+
+    def test_parameters_refresh(self):
+        """Test published weights reach another network"""
+        learner = DQNetwork(11, 8, 4)
+        actor = DQNetwork(11, 8, 4)
+        params = SharedParameters(learner.num_parameters())
+        try:
+            version = params.publish(learner)
+            self.assertEqual(params.refresh(actor, -1), version)
+            np.testing.assert_allclose(actor.get_flat(), learner.get_flat())
+        finally:
+            params.close()
+
+    def test_train_distributed(self):
+        """Test a short run with two actors"""
+        ai = DQNAI(SnakeGame(GameConfig(width=10, height=10)))
+        config = DistributedConfig(
+            num_actors=2, episodes=20, width=10, height=10, warmup=64, buffer_capacity=4096
+        )
+
+        summary = train_distributed(ai, config)
+
+        self.assertGreaterEqual(summary["episodes"], 20)
+        self.assertGreater(summary["env_steps"], 0)
+
+    def test_dead_actors_after_warmup(self):
+        """Test the learner stops instead of waiting forever once every actor has died"""
+        ai = DQNAI(SnakeGame(GameConfig(width=10, height=10)))
+        config = DistributedConfig(num_actors=2, episodes=20, warmup=64, buffer_capacity=4096)
+
+        with (
+            unittest.mock.patch("pyaisnake.ai.distributed._actor_loop", _fill_replay_and_exit),
+            self.assertRaises(RuntimeError),
+        ):
+            train_distributed(ai, config)
+
+
+class TestEvolutionStrategies(unittest.TestCase):
+    """Test shared-seed ES training"""
+
+    def test_centered_ranks(self):
+        """Test ranks span [-0.5, 0.5] regardless of return scale"""
+        ranks = centered_ranks(np.array([[10.0, -3.0], [1000.0, 0.0]]))
+        np.testing.assert_allclose(ranks, [[1 / 6, -0.5], [0.5, -1 / 6]])
+
+    def test_replicas_stay_identical(self):
+        """Test every replica reaches the same weights from (seed, weight) pairs"""
+        config = ESConfig()
+        theta = np.random.rand(50)
+        replica = theta.copy()
+        seeds = np.array([3, 17, 99])
+        weights = np.array([0.5, -0.25, 0.0])
+
+        apply_update(theta, seeds, weights, config)
+        apply_update(replica, seeds, weights, config)
+
+        np.testing.assert_array_equal(theta, replica)
+
+    def test_train_es(self):
+        """Test a short run updates the policy and reports every generation"""
+        ai = DQNAI(SnakeGame(GameConfig(width=10, height=10)))
+        before = ai.policy_net.get_flat()
+        generations = []
+        config = ESConfig(
+            generations=2, population=4, workers=2, width=10, height=10, max_steps=100
+        )
+
+        summary = train_es(ai, config, on_generation=lambda g, _stats: generations.append(g))
+
+        self.assertEqual(generations, [1, 2])
+        self.assertEqual(summary["generations"], 2)
+        self.assertFalse(np.array_equal(before, ai.policy_net.get_flat()))
+
+    def test_dead_workers(self):
+        """Test a generation fails fast when its workers have died"""
+        ai = DQNAI(SnakeGame(GameConfig(width=10, height=10)))
+        config = ESConfig(generations=1, population=4, workers=2, width=10, height=10)
+
+        with (
+            unittest.mock.patch("pyaisnake.ai.es._worker_loop", _exit_immediately),
+            self.assertRaises(RuntimeError),
+        ):
+            train_es(ai, config)
+
+
+class TestGeneticPopulation(unittest.TestCase):
+    """Test the matrix-backed genetic population"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.ga = GeneticSnakeAI(
+            population_size=20,
+            genome_size=30,
+            elite_size=2,
+            checkpoints=CheckpointManager(self._tmp.name, prefix="genetic"),
+            seed=0,
+        )
+
+    def tearDown(self):
+        self.ga.close()
+        self._tmp.cleanup()
+
+    def test_genomes_are_views(self):
+        """Test Genome objects read and write the population matrix"""
+        genome = self.ga.population[4]
+        genome.fitness = 12.5
+        genome.genes[0] = 0.25
+
+        self.assertEqual(self.ga.fitness[4], 12.5)
+        self.assertEqual(self.ga.genes[4, 0], np.float32(0.25))
+        self.assertEqual(self.ga.genes.dtype, np.float32)
+
+    def test_evolve(self):
+        """Test evolution keeps the best genome and stays within bounds"""
+        self.ga.fitness[:] = np.arange(20)
+        best = self.ga.genes[19].copy()
+
+        self.ga.evolve()
+
+        np.testing.assert_array_equal(self.ga.best_genome.genes, best)
+        self.assertEqual(self.ga.best_fitness, 19)
+        self.assertEqual(self.ga.genes.shape, (20, 30))
+        self.assertLessEqual(np.abs(self.ga.genes).max(), 1.0)
+        self.assertTrue(np.shares_memory(self.ga.population[0].genes, self.ga.genes))
+
+    def test_tournament_without_replacement(self):
+        """Test a tournament as large as the population is always won by the best genome"""
+        self.ga.fitness[:] = np.arange(20)
+
+        winners = self.ga._tournament_indices(200, tournament_size=20)
+        np.testing.assert_array_equal(winners, np.full(200, 19))
+
+    def test_resume(self):
+        """Test population matrix restores from a checkpoint"""
+        self.ga.fitness[:] = np.arange(20)
+        self.ga.evolve()
+        genes = self.ga.genes.copy()
+
+        other = GeneticSnakeAI(
+            population_size=5, genome_size=30, checkpoints=self.ga.checkpoints, seed=1
+        )
+        self.assertTrue(other.resume())
+        np.testing.assert_array_equal(other.genes, genes)
+        self.assertEqual(len(other.population), 20)
+        self.assertEqual(other.generation, 1)
+
+    def test_without_checkpoints(self):
+        """Test a population without a manager writes nothing but still loads a given path"""
+        self.ga.fitness[:] = np.arange(20)
+        self.ga.evolve()
+        self.ga.checkpoints.flush()
+
+        other = GeneticSnakeAI(population_size=5, genome_size=30, seed=1)
+        other.evolve()
+        other.close()
+        self.assertIsNone(other.checkpoints)
+        self.assertFalse(other.resume())
+        self.assertTrue(other.resume(self.ga.checkpoints.latest()))
+        np.testing.assert_array_equal(other.genes, self.ga.genes)
+
+    def test_evaluate_population(self):
+        """Test parallel evaluation is deterministic and matches a serial run"""
+        serial = self.ga.evaluate_population(n_games=2, workers=1, max_steps=200)
+        parallel = self.ga.evaluate_population(n_games=2, workers=2, max_steps=200)
+
+        np.testing.assert_array_equal(serial, parallel)
+        np.testing.assert_array_equal(self.ga.fitness, parallel)
+        self.assertEqual(len(self.ga.genome_scores), 20)
+
+    def test_lockstep_matches_serial(self):
+        """Test whole-population lockstep play reproduces per-genome play"""
+        serial = self.ga.evaluate_population(n_games=2, workers=1, max_steps=150, lockstep=False)
+        lockstep = self.ga.evaluate_population(n_games=2, workers=1, max_steps=150)
+
+        np.testing.assert_array_equal(serial, lockstep)
+
+    def test_batch_scores_match_decision(self):
+        """Test batched direction scores agree with get_decision"""
+        game = SnakeGame(GameConfig(width=40, height=40, initial_obstacles=5))
+        scores = self.ga.batch_direction_scores(self.ga.genes[:3], [game] * 3)
+
+        cell = self.ga.cell_size
+        snake = [(x * cell, y * cell) for x, y in game.snake]
+        food = (game.food[0] * cell, game.food[1] * cell)
+        obstacles = [(x * cell, y * cell) for x, y in game.obstacles]
+        for row, genome in zip(scores, self.ga.population[:3]):
+            decision = self.ga.get_decision(genome, snake, food, obstacles)
+            self.assertEqual(
+                row[self.ga.DIRECTIONS.index(decision)], row.max(), f"decision {decision}"
+            )
+
+    def test_standalone_genome(self):
+        """Test Genome operations outside a population"""
+        parent = Genome(10)
+        child = parent.crossover(Genome(10))
+        child.mutate(1.0)
+
+        self.assertEqual(child.genes.shape, (10,))
+        self.assertLessEqual(np.abs(child.genes).max(), 1.0)
+
+    def test_decision_layout(self):
+        """Test genomes report whether they carry weights for every direction"""
+        self.assertTrue(self.ga.population[0].decides_all_directions)
+        self.assertFalse(Genome(DECISION_GENES - 1).decides_all_directions)
+        self.assertTrue(Genome(DECISION_GENES).decides_all_directions)
+        with self.assertRaises(ValueError):
+            self.ga.play_lockstep(self.ga.genes[:, : DECISION_GENES - 1], [0])
+
+
+class TestQTable(unittest.TestCase):
+    """Test the integer-keyed Q-table"""
+
+    def test_pack_bits(self):
+        """Test fields are packed low bits first and masked to their width"""
+        self.assertEqual(pack_bits([(3, 2), (1, 1), (5, 3)]), 3 | 1 << 2 | 5 << 3)
+        self.assertEqual(pack_bits([(9, 2)]), 1)
+
+    def test_batch_update_matches_sequential(self):
+        """Test a batch of distinct pairs equals one-by-one updates"""
+        batch = QTable(16, learning_rate=0.5)
+        sequential = QTable(16, learning_rate=0.5)
+        keys, actions, targets = [1, 2, 3], [0, 3, 1], [1.0, -2.0, 4.0]
+
+        batch.update(keys, actions, targets)
+        for key, action, target in zip(keys, actions, targets):
+            sequential.update([key], [action], [target])
+
+        np.testing.assert_array_equal(batch.values, sequential.values)
+        self.assertEqual(len(batch), 3)
+
+    def test_repeated_pairs_match_sequential(self):
+        """Test repeats of one pair step towards the target instead of overshooting it"""
+        batch = QTable(16, learning_rate=0.1)
+        sequential = QTable(16, learning_rate=0.1)
+        keys = [5] * 30 + [2, 5, 2]
+        actions = [1] * 30 + [0, 1, 0]
+        targets = [1.0] * 30 + [3.0, -1.0, 2.0]
+
+        batch.update(keys, actions, targets)
+        for key, action, target in zip(keys, actions, targets):
+            sequential.update([key], [action], [target])
+
+        np.testing.assert_allclose(batch.values, sequential.values, rtol=1e-6)
+        self.assertLess(float(batch.row(5)[1]), 1.0)
+        self.assertEqual(int(batch.visits[5]), 31)
+
+    def test_episode_returns_and_hashing(self):
+        """Test episode updates use discounted returns and hashed tables stay bounded"""
+        table = QTable(1 << 20, learning_rate=1.0, max_states=8)
+        table.update_episode([1, 9], [2, 2], [1.0, 10.0], discount=0.5)
+
+        self.assertTrue(table.hashed)
+        self.assertEqual(table.values.shape, (8, 4))
+        # Keys 1 and 9 collide; with learning_rate 1 the later return (10) wins over 6
+        self.assertAlmostEqual(float(table.row(1)[2]), 10.0)
+
+    def test_state_key_accepts_obstacle_set(self):
+        """Test state keys work with the engine's obstacle set and drive decisions"""
+        ai = AdvancedSnakeAI()
+        ai.exploration_rate = 0.0
+        snake = [(200, 200), (200, 210)]
+        key = ai.create_state_key(snake, (100, 200), {(250, 200), (0, 0)})
+
+        self.assertLess(key, 1 << ai.STATE_BITS)
+        ai.learn_episode([key, key], ["Right", "Up"], [5.0, -1.0])
+        self.assertEqual(ai.reinforcement_learning_decision(snake, (100, 200), set(), key), "Right")
+
+
+class TestLRUCache(unittest.TestCase):
+    """Test the bounded path cache"""
+
+    def test_evicts_least_recently_used(self):
+        """Test a hit protects an entry from the next eviction"""
+        cache = LRUCache(max_entries=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        self.assertEqual(cache.get("a"), 1)
+        cache.put("c", 3)
+
+        self.assertNotIn("b", cache)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.hits, cache.misses, cache.evictions, len(cache)), (1, 1, 1, 2))
+
+    def test_memory_budget(self):
+        """Test the byte budget evicts old entries and tracks the total"""
+        cache = LRUCache(max_entries=100, max_bytes=25, sizeof=len)
+        for key in range(4):
+            cache.put(key, "x" * 10)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.nbytes, 20)
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+    def test_board_key_sees_body(self):
+        """Test boards with the same head but different bodies get different keys"""
+        food, obstacles = (5, 5), {(0, 0)}
+        self.assertNotEqual(
+            board_key([(1, 1), (1, 2)], food, obstacles),
+            board_key([(1, 1), (2, 1)], food, obstacles),
+        )
+        self.assertEqual(
+            board_key([(1, 1)], food, [(0, 0), (3, 3)]),
+            board_key([(1, 1)], food, {(3, 3), (0, 0)}),
+        )
+
+    def test_colliding_hashes_keep_separate_entries(self):
+        """Test boards whose hashes collide are still told apart by the cache"""
+        ai = AdvancedSnakeAI()
+        snake, food = [(100, 100), (100, 110)], (150, 100)
+        with unittest.mock.patch("builtins.hash", return_value=0):
+            ai.path_cache.put(ai.create_cache_key(snake, food, []), ["cached"])
+            self.assertIsNone(ai.path_cache.get(ai.create_cache_key(snake, food, [(0, 0)])))
+
+    def test_pathfinding_hits_cache(self):
+        """Test repeated searches on the same board are served from the cache"""
+        ai = AdvancedSnakeAI(cache_size_limit=10, cache_memory_limit=10_000)
+        snake = [(100, 100), (100, 110)]
+
+        path = ai.a_star_pathfinding(snake, (150, 100), set())
+        self.assertEqual(ai.a_star_pathfinding(snake, (150, 100), set()), path)
+        self.assertEqual(ai.cache_stats()["hits"], 1)
+        self.assertGreater(ai.cache_stats()["bytes"], 0)
+
+
+class TestBoardAnalysis(unittest.TestCase):
+    """Test the shared per-tick board analysis"""
+
+    def setUp(self):
+        # 5x3 board, a wall at x=2 with one gap at y=2:
+        #   S S # . .
+        #   H . # . .
+        #   . . . . .
+        self.analysis = BoardAnalysis(
+            5, 3, snake=[(0, 1), (0, 0), (1, 0)], obstacles={(2, 0), (2, 1)}
+        )
+
+    def test_distance_field_and_areas(self):
+        """Test BFS distances, per-move reachable areas and the free count"""
+        distance = self.analysis.head_distance
+
+        self.assertEqual(distance[1, 0], 0)
+        self.assertEqual(distance[0, 4], 7)
+        self.assertEqual(self.analysis.free_cells, 10)
+        self.assertEqual(self.analysis.reachable_area(Direction.RIGHT), 10)
+        self.assertEqual(self.analysis.reachable_area(Direction.UP), 0)
+        self.assertEqual(self.analysis.safe_directions, [Direction.DOWN, Direction.RIGHT])
+
+    def test_tail_distance_and_choke_cells(self):
+        """Test the tail distance and the articulation cells of the free region"""
+        self.assertEqual(self.analysis.tail_distance, 2)
+        # The path through the wall's only gap is a corridor of cut cells
+        self.assertEqual(self.analysis.choke_cells, {(1, 2), (2, 2), (3, 2)})
+
+    def test_cached_per_tick(self):
+        """Test consumers share one analysis until the game moves"""
+        game = SnakeGame(GameConfig(width=10, height=10))
+        first = analyze(game)
+
+        self.assertIs(analyze(game), first)
+        game.update()
+        self.assertIsNot(analyze(game), first)
+        self.assertEqual(analyze(game).head, game.snake[0])
+
+    def test_pixel_boards(self):
+        """Test pixel coordinates map to cells and identical boards share a result"""
+        snake = [(100, 100), (90, 100)]
+        board = analyze_board(snake, {(110, 100)}, 40, 40, cell_size=10)
+
+        self.assertEqual(board.head, (10, 10))
+        self.assertNotIn(Direction.RIGHT, board.safe_directions)
+        self.assertIs(analyze_board(list(snake), [(110, 100)], 40, 40, cell_size=10), board)
+
+
+class TestAnytimeAStar(unittest.TestCase):
+    """Test the deadline-aware A* player"""
+
+    def setUp(self):
+        from pyaisnake.ai.players import AStarAI
+
+        self.game = SnakeGame(GameConfig(width=40, height=40))
+        self.game.food = (39, 39)
+        self.ai = AStarAI(self.game)
+
+    def test_expired_deadline_returns_partial_step(self):
+        """Test an expired search still answers and does not cache its partial path"""
+        import time
+
+        path, complete = self.ai._find_path(self.game.snake[0], self.game.food, 0.0)
+        self.assertFalse(complete)
+        self.assertTrue(path)
+
+        direction = self.ai.get_direction(time.perf_counter() - 1)
+        self.assertIn(direction, self.game.get_safe_directions())
+        self.assertEqual(self.ai._path, [])
+
+    def test_no_deadline_finds_full_path(self):
+        """Test searching without a deadline reaches the food"""
+        path, complete = self.ai._find_path(self.game.snake[0], self.game.food)
+
+        self.assertTrue(complete)
+        self.assertEqual(path[-1], self.game.food)
+
+
+class TestSafeGreedyAI(unittest.TestCase):
+    """Test the tail-verified greedy player"""
+
+    def setUp(self):
+        from pyaisnake.ai.players import SafeGreedyAI
+
+        # Food at the end of a dead-end corridor the snake would fill
+        self.game = SnakeGame(GameConfig(width=7, height=3, power_ups_enabled=False))
+        self.game.snake = [(2, 1), (1, 1), (0, 1)]
+        self.game.obstacles = {(x, y) for x in range(3, 7) for y in (0, 2)}
+        self.game.food = (6, 1)
+        self.ai = SafeGreedyAI(self.game)
+
+    def test_rejects_trapping_path(self):
+        """Test the snake follows its tail instead of entering the dead end"""
+        self.assertIn(self.ai.get_direction(), (Direction.UP, Direction.DOWN))
+        self.assertEqual(self.ai._path, [])
+
+    def test_takes_safe_path(self):
+        """Test a path that keeps the tail reachable is taken and cached"""
+        self.game.obstacles = set()
+
+        self.assertEqual(self.ai.get_direction(), Direction.RIGHT)
+        self.assertEqual(self.ai._path[-1], (6, 1))
+
+
+class TestExpectimaxAI(unittest.TestCase):
+    """Test the expectimax player over sampled food spawns"""
+
+    def setUp(self):
+        from pyaisnake.ai.expectimax import ExpectimaxAI
+
+        self.game = SnakeGame(GameConfig(width=7, height=3))
+        self.game.snake = [(2, 1), (1, 1), (0, 1)]
+        self.game.food = (3, 1)
+        self.ai = ExpectimaxAI(self.game, seed=0)
+
+    def test_avoids_dead_end(self):
+        """Test the player does not walk into a corridor it cannot leave"""
+        self.game.obstacles = {(x, y) for x in range(3, 7) for y in (0, 2)}
+        self.game.food = (6, 1)
+
+        self.assertIn(self.ai.get_direction(), (Direction.UP, Direction.DOWN))
+
+    def test_moves_without_exit_are_pruned(self):
+        """Test a move into a cell with no way out is cut without expansion"""
+        from pyaisnake.engine import PowerUpType
+
+        self.ai._obstacles = frozenset((x, y) for x in range(3, 7) for y in (0, 2))
+        state = (((5, 1), (4, 1), (3, 1)), (0, 0), PowerUpType.APPLE, 0, 1.0)
+
+        self.assertIsNone(self.ai._move_value(state, 1, 0, depth=3))
+        self.assertEqual((self.ai.pruned, self.ai.nodes), (1, 0))
+
+    def test_tail_is_not_an_exit(self):
+        """Test a head boxed in by its own tail counts as trapped, as in the engine"""
+        from pyaisnake.engine import PowerUpType
+
+        self.ai._obstacles = frozenset()
+        state = (((0, 0), (1, 0), (1, 1), (0, 1)), (6, 2), PowerUpType.APPLE, 0, 1.0)
+
+        self.assertFalse(self.ai._has_exit(state))
+        self.assertEqual(self.ai._step(state, 0, 1), (None, 0.0))
+
+    def test_spawn_sampling_keeps_global_random(self):
+        """Test chance nodes sample with the player's own RNG"""
+        import random
+
+        state = random.getstate()
+        self.assertEqual(self.ai.get_direction(), Direction.RIGHT)
+        self.assertEqual(random.getstate(), state)
+
+    def test_states_are_cached(self):
+        """Test repeated searches of the same board hit the cache"""
+        self.ai.get_direction()
+        self.ai.get_direction()
+        self.assertGreater(self.ai.cache.hits, 0)
+
+    def test_expired_deadline_returns_safe_move(self):
+        """Test the player still answers when out of time"""
+        self.game.food = (6, 2)
+        direction = self.ai.get_direction(deadline=0.0)
+        self.assertIn(direction, self.game.get_safe_directions())
+
+    def test_registered_in_cli(self):
+        """Test the CLI can create the player"""
+        from pyaisnake.ai.expectimax import ExpectimaxAI
+        from pyaisnake.ai.players import create_ai
+
+        self.assertIsInstance(create_ai("expectimax", self.game), ExpectimaxAI)
+
+
+class TestPolicyTable(unittest.TestCase):
+    """Test the precomputed small-board policy"""
+
+    @classmethod
+    def setUpClass(cls):
+        from pyaisnake.ai.policy_table import PolicyTable
+
+        cls.policy = PolicyTable.solve(6, 6)
+
+    def test_cycle_visits_every_cell_once(self):
+        """Test the cycle is Hamiltonian and starts forward along the spawn row"""
+        from pyaisnake.ai.policy_table import hamiltonian_cycle
+
+        for width, height in ((6, 6), (8, 8), (6, 4)):
+            order = hamiltonian_cycle(width, height)
+            self.assertEqual(sorted(order), list(range(width * height)))
+            cells = [(i % width, i // width) for i in order]
+            for a, b in zip(cells, cells[1:] + cells[:1]):
+                self.assertEqual(abs(a[0] - b[0]) + abs(a[1] - b[1]), 1)
+
+            x, y = width // 2, height // 2
+            index = list(order).index(y * width + x)
+            self.assertEqual(order[index - 1], y * width + x - 1)
+
+    def test_unsupported_board(self):
+        """Test boards without a usable cycle are rejected"""
+        from pyaisnake.ai.policy_table import PolicyTable
+
+        with self.assertRaises(ValueError):
+            PolicyTable.solve(7, 7)
+
+    def test_policy_fills_the_board(self):
+        """Test table play never collides and wins on an obstacle-free board"""
+        import random
+
+        from pyaisnake.ai.policy_table import PolicyTableAI
+        from pyaisnake.engine import GameState
+
+        random.seed(3)
+        game = SnakeGame(GameConfig(width=6, height=6))
+        ai = PolicyTableAI(game, self.policy)
+        while game.state == GameState.RUNNING:
+            game.set_direction(ai.get_direction())
+            game.update()
+
+        self.assertEqual(game.state, GameState.WIN)
+
+    def test_follows_cycle_without_food(self):
+        """Test a board without food steps to the next cycle cell, not a shortcut"""
+        from pyaisnake.ai.analysis import DELTAS
+        from pyaisnake.ai.policy_table import PolicyTableAI
+
+        game = SnakeGame(GameConfig(width=6, height=6))
+        game.snake = [(0, 3), (0, 2), (0, 1)]
+        game.direction = Direction.DOWN
+        game.food = None
+        nxt = int(self.policy.successor[3 * 6])
+
+        direction = PolicyTableAI(game, self.policy).get_direction()
+        self.assertEqual(DELTAS[direction], (nxt % 6, nxt // 6 - 3))
+
+    def test_save_load_mmap(self):
+        """Test a saved table is memory-mapped back unchanged"""
+        from pyaisnake.ai.policy_table import PolicyTable
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "policy.npz"
+            self.policy.save(path)
+            loaded = PolicyTable.load(path, mmap=True)
+
+            self.assertIsInstance(loaded.table, np.memmap)
+            np.testing.assert_array_equal(loaded.table, self.policy.table)
+            del loaded
+
+    def test_board_size_must_match(self):
+        """Test a table cannot drive a board of another size"""
+        from pyaisnake.ai.policy_table import PolicyTableAI
+
+        with self.assertRaises(ValueError):
+            PolicyTableAI(SnakeGame(GameConfig(width=8, height=8)), self.policy)
+
+
+class TestImitation(unittest.TestCase):
+    """Test distilling a teacher's moves into a policy network"""
+
+    def setUp(self):
+        from pyaisnake.ai.imitation import ImitationConfig
+
+        self.config = ImitationConfig(
+            games=2, workers=1, width=8, height=8, max_steps=50, epochs=30, hidden_size=16
+        )
+
+    def test_observe(self):
+        """Test free runs, direction and food features"""
+        from pyaisnake.ai.imitation import N_FEATURES, observe
+
+        game = SnakeGame(GameConfig(width=10, height=10))
+        game.food = (5, 2)
+        obs = observe(game)
+
+        self.assertEqual(obs.shape, (N_FEATURES,))
+        # Head (5, 5) moving right, body to the left
+        np.testing.assert_allclose(obs[:4], [0.5, 0.4, 0.0, 0.4])
+        np.testing.assert_array_equal(obs[4:8], [0, 0, 0, 1])
+        np.testing.assert_allclose(obs[8:14], [0.0, -0.3, 0, 0, 1, 0])
+
+    def test_dataset_is_deterministic(self):
+        """Test seeded teacher games produce the same dataset every time"""
+        from pyaisnake.ai.imitation import build_dataset, load_dataset, save_dataset
+
+        observations, actions = build_dataset(self.config)
+        again, again_actions = build_dataset(self.config)
+        np.testing.assert_array_equal(observations, again)
+        np.testing.assert_array_equal(actions, again_actions)
+        self.assertEqual(len(observations), len(actions))
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "dataset.npz"
+            save_dataset(path, observations, actions, self.config)
+            loaded, loaded_actions, metadata = load_dataset(path)
+
+        self.assertEqual(loaded.dtype, np.float16)
+        np.testing.assert_array_equal(loaded_actions, actions)
+        self.assertEqual(metadata["teacher"], "a_star")
+
+    def test_student_learns_teacher(self):
+        """Test the student agrees with the teacher on its own training data"""
+        from pyaisnake.ai.imitation import build_dataset, train_policy
+        from pyaisnake.ai.inference import MLPInference
+
+        observations, actions = build_dataset(self.config)
+        policy, accuracy = train_policy(observations, actions, self.config)
+
+        self.assertIsInstance(policy, MLPInference)
+        self.assertGreater(accuracy, 0.8)
+
+    def test_colliding_moves_are_masked(self):
+        """Test the player never follows the network into a wall or its body"""
+        from pyaisnake.ai.imitation import N_FEATURES, ImitationAI
+        from pyaisnake.ai.inference import MLPInference
+
+        # Network that always prefers LEFT, straight into the neck
+        coef = np.zeros((N_FEATURES, 4), dtype=np.float32)
+        intercept = np.array([0, 0, 1, 0], dtype=np.float32)
+        game = SnakeGame(GameConfig(width=10, height=10))
+
+        direction = ImitationAI(game, MLPInference([coef], [intercept])).get_direction()
+        self.assertIn(direction, game.get_safe_directions())
+
+
+class TestDecisionCache(unittest.TestCase):
+    """Test memoized decisions keyed on packed observations"""
+
+    def setUp(self):
+        from pyaisnake.ai.decision_cache import DecisionCache
+
+        self.games = [SnakeGame(GameConfig(width=10, height=10)) for _ in range(3)]
+        for game in self.games:
+            game.food = (8, 2)
+        self.ai = DQNAI(self.games[0], epsilon_start=0.0)
+        self.cached = DecisionCache(self.ai)
+
+    def test_observation_key(self):
+        """Test binary observations pack into bits and others keep their bytes"""
+        from pyaisnake.ai.decision_cache import observation_key
+
+        binary = np.array([1, 0, 1] + [0] * 8, dtype=np.float32)
+        self.assertEqual(observation_key(binary), (11, bytes([0b10100000, 0])))
+        self.assertEqual(
+            observation_key(np.array([0.5], dtype=np.float32)), np.float32(0.5).tobytes()
+        )
+
+    def test_matches_uncached_play(self):
+        """Test cached decisions equal the network's greedy moves"""
+        expected = self.ai.get_directions(self.games)
+        self.assertEqual(self.cached.get_directions(self.games), expected)
+        self.assertEqual(self.cached.get_directions(self.games), expected)
+
+    def test_repeated_observations_skip_the_network(self):
+        """Test identical boards are decided once"""
+        with unittest.mock.patch.object(self.ai, "decide_batch", wraps=self.ai.decide_batch) as spy:
+            self.cached.get_directions(self.games)
+            self.cached.get_direction()
+
+        self.assertEqual(spy.call_count, 1)
+        self.assertEqual(len(spy.call_args[0][0]), 1)
+        self.assertEqual(self.cached.cache.hits, 1)
+
+    def test_model_version_invalidates(self):
+        """Test new weights drop every cached decision"""
+        self.cached.get_direction()
+        self.ai.model_version += 1
+        self.cached.get_direction()
+
+        self.assertEqual(len(self.cached.cache), 1)
+        self.assertEqual(self.cached.cache.hits, 0)
+
+    def test_training_bypasses_cache(self):
+        """Test moves made while learning are not memoized"""
+        self.ai.start_training()
+        self.cached.get_direction()
+        self.assertEqual(len(self.cached.cache), 0)
+
+
+class TestSweep(unittest.TestCase):
+    """Test hyperparameter sweep expansion, resume and early stopping"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.db = Path(self._tmp.name) / "sweep.db"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _spec(self, **overrides):
+        from pyaisnake.ai.sweep import SweepSpec
+
+        settings = {
+            "algorithm": "dqn",
+            "params": {"learning_rate": [0.001, 0.01], "gamma": [0.9, 0.99]},
+            "budget": 2,
+            "report_every": 1,
+            "width": 8,
+            "height": 8,
+            "max_steps": 50,
+        }
+        return SweepSpec.from_dict({**settings, **overrides})
+
+    def test_grid_and_random_expansion(self):
+        """Test grid takes every combination and random search is seeded"""
+        from pyaisnake.ai.sweep import expand_trials
+
+        self.assertEqual(len(expand_trials(self._spec())), 4)
+
+        params = {"learning_rate": {"low": 1e-4, "high": 1e-2, "log": True}, "hidden": [8, 16]}
+        spec = self._spec(method="random", trials=5, params=params)
+        trials = expand_trials(spec)
+        self.assertEqual(
+            trials, expand_trials(self._spec(method="random", trials=5, params=params))
+        )
+        self.assertEqual(len(trials), 5)
+        self.assertTrue(all(1e-4 <= t["learning_rate"] <= 1e-2 for t in trials))
+
+    def test_invalid_spec(self):
+        """Test unknown keys, algorithms and non-list grid values are rejected"""
+        with self.assertRaises(ValueError):
+            self._spec(epochs=3)
+        with self.assertRaises(ValueError):
+            self._spec(algorithm="a_star")
+        with self.assertRaises(ValueError):
+            self._spec(params={"gamma": 0.9})
+
+    def test_resume_skips_finished_trials(self):
+        """Test rerunning a sweep only trains unfinished trials"""
+        from pyaisnake.ai.sweep import COMPLETE, SweepStore, run_sweep
+
+        spec = self._spec(early_stopping=False)
+        results = run_sweep(spec, self.db)
+        self.assertTrue(all(row["status"] == COMPLETE for row in results))
+        self.assertTrue(all(row["reports"] == 2 for row in results))
+
+        store = SweepStore(self.db)
+        store.start(1)  # as if the sweep was killed during trial 1
+        store.close()
+
+        rerun: list[int] = []
+        run_sweep(spec, self.db, on_trial=lambda trial_id, *_: rerun.append(trial_id))
+        self.assertEqual(rerun, [1])
+
+        with self.assertRaises(ValueError):
+            run_sweep(self._spec(budget=3), self.db)
+
+    def test_interrupted_trial_continues_from_checkpoint(self):
+        """Test a trial that died after two reports resumes at the third"""
+        from pyaisnake.ai import sweep
+
+        spec = self._spec(
+            algorithm="genetic",
+            params={"population_size": [6], "genome_size": [20], "eval_games": [1]},
+            budget=4,
+        )
+        with unittest.mock.patch.object(
+            sweep, "should_prune", side_effect=[False, RuntimeError("killed")]
+        ):
+            results = sweep.run_sweep(spec, self.db)
+        self.assertEqual((results[0]["status"], results[0]["reports"]), (sweep.FAILED, 2))
+
+        starts: list[int] = []
+        train = sweep.TRAINERS["genetic"]
+
+        def recording(*args):
+            starts.append(args[-1])
+            return train(*args)
+
+        with unittest.mock.patch.dict(sweep.TRAINERS, {"genetic": recording}):
+            results = sweep.run_sweep(spec, self.db)
+
+        self.assertEqual(starts, [2])
+        self.assertEqual((results[0]["status"], results[0]["reports"]), (sweep.COMPLETE, 4))
+
+    def test_median_early_stopping(self):
+        """Test a trial below the median of its peers is pruned after warmup"""
+        from pyaisnake.ai.sweep import SweepStore, should_prune
+
+        spec = self._spec(warmup_reports=1, min_trials=2)
+        store = SweepStore(self.db)
+        store.register(spec)
+        for trial_id, value in enumerate([4.0, 6.0, 8.0]):
+            store.report(trial_id, 2, value)
+
+        self.assertFalse(should_prune(store, spec, 3, 1, 0.0))
+        self.assertTrue(should_prune(store, spec, 3, 2, 5.0))
+        self.assertFalse(should_prune(store, spec, 3, 2, 7.0))
+        store.close()
+
+
+class TestCurriculum(unittest.TestCase):
+    """Test curriculum promotion and environment reuse"""
+
+    def test_promotes_on_threshold(self):
+        """Test a stage is left once its window mean reaches the threshold"""
+        from pyaisnake.ai.curriculum import CurriculumScheduler, Stage
+
+        scheduler = CurriculumScheduler(
+            [Stage(8, 8, promote_score=2, window=3), Stage(10, 10, promote_score=5, window=3)]
+        )
+        self.assertFalse(scheduler.record(3, 10))  # window not full yet
+        self.assertFalse(scheduler.record(0, 10))
+        self.assertTrue(scheduler.record(4, 10))
+
+        self.assertEqual(scheduler.stage.width, 10)
+        self.assertEqual(scheduler.history, [(0, 3, 30)])
+        self.assertEqual(scheduler.recent_mean(), 0.0)
+
+    def test_max_episodes_promotes(self):
+        """Test a stage that never meets its threshold is left after max_episodes"""
+        from pyaisnake.ai.curriculum import CurriculumScheduler, Stage
+
+        scheduler = CurriculumScheduler([Stage(8, 8, promote_score=100, max_episodes=2)])
+        scheduler.record(0, 5)
+        self.assertTrue(scheduler.record(0, 5))
+        self.assertTrue(scheduler.finished)
+        self.assertEqual(scheduler.total_steps, 10)
+
+    def test_environments_are_reused(self):
+        """Test each board configuration is built once and reset afterwards"""
+        from pyaisnake.ai.curriculum import CurriculumScheduler, Stage
+        from pyaisnake.engine import Difficulty, GameState
+
+        stages = [
+            Stage(8, 8, Difficulty.EASY, window=1, promote_score=0),
+            Stage(12, 12, Difficulty.HARD, window=1, promote_score=0),
+            Stage(8, 8, Difficulty.EASY, window=1, promote_score=0),
+        ]
+        scheduler = CurriculumScheduler(stages)
+
+        first = scheduler.next_game()
+        first.state = GameState.GAME_OVER
+        self.assertIs(scheduler.next_game(), first)
+        self.assertEqual(first.state, GameState.RUNNING)
+
+        scheduler.record(0, 1)
+        hard = scheduler.next_game()
+        self.assertEqual((hard.config.width, len(hard.obstacles)), (12, 5))
+        scheduler.record(0, 1)
+        self.assertIs(scheduler.next_game(), first)
+        self.assertEqual(scheduler.envs.created, 2)
+
+    def test_load_curriculum(self):
+        """Test stages load from JSON with enums given by value"""
+        from pyaisnake.ai.curriculum import load_curriculum
+        from pyaisnake.engine import Difficulty, GameMode
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "curriculum.json"
+            path.write_text(
+                '[{"width": 10, "height": 10, "difficulty": "hard", "game_mode": "puzzle"}]'
+            )
+            (stage,) = load_curriculum(path)
+
+        self.assertEqual(stage.difficulty, Difficulty.HARD)
+        self.assertEqual(stage.game_mode, GameMode.PUZZLE)
+
+
+class TestSelfPlay(unittest.TestCase):
+    """Test vectorised two-snake arenas and the opponent pool"""
+
+    def test_matches_multiplayer_game(self):
+        """Test arenas follow MultiplayerGame rules move for move"""
+        import random
+
+        from pyaisnake.ai.selfplay import ACTIONS, OUTCOMES, SelfPlayArena, greedy_policy
+        from pyaisnake.multiplayer import MultiplayerGame, MultiplayerState
+
+        rng = random.Random(0)
+        for seed in range(20):
+            config = MultiplayerConfig(width=12, height=8)
+            arena = SelfPlayArena(1, config, max_steps=300, seed=seed)
+            game = MultiplayerGame(config)
+
+            for _ in range(300):
+                game.food = divmod(int(arena.food[0]), 12)[::-1]
+                moves = [
+                    int(greedy_policy(arena.observe(p))[0])
+                    if rng.random() < 0.8
+                    else rng.randrange(4)
+                    for p in (0, 1)
+                ]
+                game.set_direction1(ACTIONS[moves[0]])
+                game.set_direction2(ACTIONS[moves[1]])
+                game.update()
+                _, done, outcome = arena.step(np.array(moves[:1]), np.array(moves[1:]))
+
+                if done[0]:
+                    if game.state != MultiplayerState.RUNNING:
+                        self.assertEqual(OUTCOMES[outcome[0]], game.state)
+                    break
+                self.assertEqual(game.state, MultiplayerState.RUNNING)
+                for player, snake in enumerate((game.snake1, game.snake2)):
+                    head, length = arena.head[0, player], arena.length[0, player]
+                    cells = arena.body[0, player, (head + np.arange(length)) % arena.cells]
+                    self.assertEqual([(int(c) % 12, int(c) // 12) for c in cells], snake)
+
+    def test_opening_observation(self):
+        """Test free runs and heading at the opening position"""
+        from pyaisnake.ai.selfplay import N_FEATURES, SelfPlayArena
+
+        arena = SelfPlayArena(2, MultiplayerConfig(width=20, height=10), seed=0)
+        obs = arena.observe(0)
+
+        self.assertEqual(obs.shape, (2, N_FEATURES))
+        # Right of (5, 5) runs up to the opponent's head at (14, 5); left is the body
+        np.testing.assert_allclose(obs[0, :4], [5 / 20, 4 / 20, 0, 8 / 20])
+        np.testing.assert_array_equal(obs[0, 4:8], [0, 0, 0, 1])
+        np.testing.assert_allclose(obs[0, 15:17], [9 / 20, 0])
+        np.testing.assert_array_equal(arena.observe(1)[0, 4:8], [0, 0, 1, 0])
+
+    def test_pool_sampling_and_eviction(self):
+        """Test the pool keeps frozen copies of the newest policies"""
+        from pyaisnake.ai.selfplay import P1_WINS, P2_WINS, OpponentPool
+
+        pool = OpponentPool(capacity=2, latest_weight=1.0, seed=0)
+        weights = {"bias": np.zeros(4)}
+        first = pool.add(weights)
+        weights["bias"][0] = 1.0
+        self.assertEqual(pool.policies[first]["bias"][0], 0.0)
+
+        pool.add(weights)
+        newest = pool.add(weights)
+        self.assertNotIn(first, pool.policies)
+        self.assertTrue((pool.sample(10) == newest).all())
+
+        pool.record(newest, P1_WINS)
+        pool.record(newest, P2_WINS)
+        self.assertEqual(pool.win_rate(newest), 0.5)
+
+    def test_env_batches_opponents_and_resets(self):
+        """Test one opponent call per snapshot and automatic resets"""
+        from pyaisnake.ai.selfplay import OpponentPool, SelfPlayEnv, greedy_policy
+
+        pool = OpponentPool(seed=0)
+        calls: list[int] = []
+
+        def opponent(observations):
+            calls.append(len(observations))
+            return greedy_policy(observations)
+
+        pool.add(opponent)
+        env = SelfPlayEnv(8, pool, MultiplayerConfig(width=12, height=6), max_steps=50, seed=0)
+        obs1, obs2 = env.reset()
+
+        for _ in range(60):
+            calls.clear()
+            result = env.step(greedy_policy(obs1), obs2)
+            obs1, obs2 = result.obs1, result.obs2
+            self.assertEqual(calls, [8])
+
+        self.assertGreater(env.games_played, 0)
+        self.assertEqual(sum(pool.records[0]), env.games_played)
+        self.assertTrue((env.arena.steps < 50).all())
+
+
+class TestSpeculativeAI(unittest.TestCase):
+    """Test background precomputation of the next move"""
+
+    def setUp(self):
+        from pyaisnake.ai.speculative import SpeculativeAI
+
+        self.game = SnakeGame(GameConfig(width=10, height=10))
+        self.calls = []
+
+        class Recorder:
+            game = self.game
+
+            def get_direction(inner, deadline=None):
+                self.calls.append(self.game.tick)
+                return Direction.DOWN
+
+        self.ai = SpeculativeAI(Recorder())
+
+    def tearDown(self):
+        self.ai.close()
+
+    def test_prefetched_move_is_consumed(self):
+        """Test an unchanged board reuses the background decision"""
+        self.ai.prefetch()
+        self.assertEqual(self.ai.get_direction(), Direction.DOWN)
+
+        self.assertEqual(self.calls, [self.game.tick])
+        self.assertEqual(self.ai.hits, 1)
+
+    def test_stale_prefetch_is_recomputed(self):
+        """Test a stale A* decision is discarded and replanned from the current head"""
+        from pyaisnake.ai.players import AStarAI
+        from pyaisnake.ai.speculative import SpeculativeAI
+
+        game = SnakeGame(GameConfig(width=10, height=10))
+        head = game.snake[0]
+        game.food = (head[0], head[1] - 3)
+        ai = SpeculativeAI(AStarAI(game))
+        try:
+            ai.prefetch()
+            self.assertEqual(ai._pending[1].result(), Direction.UP)
+            # The board moves on without the prefetched move; the old path now
+            # leads back into the body
+            game.set_direction(Direction.DOWN)
+            game.update()
+
+            expected = AStarAI(game).get_direction()
+            self.assertEqual(ai.get_direction(), expected)
+            self.assertIn(expected, game.get_safe_directions())
+            self.assertEqual((ai.hits, ai.discarded), (0, 1))
+        finally:
+            ai.close()
+
+
+class TestGridGeometry(unittest.TestCase):
+    """Test models running directly on engine grid coordinates"""
+
+    def setUp(self):
+        game = SnakeGame(GameConfig(width=40, height=40, initial_obstacles=8))
+        self.snake = list(game.snake)
+        self.food = game.food
+        self.obstacles = list(game.obstacles)
+
+    def _pixels(self, cells):
+        return [(x * 10, y * 10) for x, y in cells]
+
+    def test_neural_features_match_pixels(self):
+        """Test grid features equal the 400-pixel features for a 40-cell field"""
+        pixel = NeuralSnakeAI()
+        grid = NeuralSnakeAI(cell_size=1, field_size=40)
+
+        np.testing.assert_allclose(
+            grid.extract_features(self.snake, self.food, self.obstacles),
+            pixel.extract_features(
+                self._pixels(self.snake), self._pixels([self.food])[0], self._pixels(self.obstacles)
+            ),
+        )
+
+    def test_genetic_features_match_pixels(self):
+        """Test genetic features are independent of the coordinate scale"""
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoints = CheckpointManager(tmp)
+            pixel = GeneticSnakeAI(population_size=1, checkpoints=checkpoints)
+            grid = GeneticSnakeAI(
+                population_size=1, checkpoints=checkpoints, cell_size=1, field_size=40
+            )
+
+            np.testing.assert_allclose(
+                grid.extract_features(self.snake, self.food, self.obstacles),
+                pixel.extract_features(
+                    self._pixels(self.snake),
+                    self._pixels([self.food])[0],
+                    self._pixels(self.obstacles),
+                ),
+            )
+
+    def test_rectangular_field_bounds(self):
+        """Test a non-square field uses its own height for bounds"""
+        model = NeuralSnakeAI(cell_size=1, field_size=40, field_height=20)
+
+        self.assertFalse(model.is_valid_position((5, 20), set(), set()))
+        self.assertTrue(model.is_valid_position((39, 19), set(), set()))
+
+
+class TestCheckpointManager(unittest.TestCase):
+    """Test asynchronous versioned checkpoints"""
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_retention_keeps_best(self):
+        """Test only the last N versions plus the best survive"""
+        manager = CheckpointManager(self.directory, prefix="t", keep_last=2)
+        for score in [5.0, 1.0, 2.0, 3.0]:
+            manager.save({"w": np.full(3, score)}, score=score)
+        manager.close()
+
+        self.assertEqual(manager.versions(), [1, 3, 4])
+        self.assertEqual(manager.best(), manager.path_for(1))
+        self.assertEqual(sorted(p.name for p in self.directory.glob("*.tmp")), [])
+
+        reopened = CheckpointManager(self.directory, prefix="t", keep_last=2)
+        self.assertEqual(reopened.latest(), manager.path_for(4))
+
+    def test_snapshot_is_copied(self):
+        """Test arrays mutated after save do not leak into the checkpoint"""
+        manager = CheckpointManager(self.directory)
+        weights = np.zeros(4)
+        manager.save({"w": weights}, {"episode": 7})
+        weights += 1
+        manager.close()
+
+        arrays, metadata = manager.load()
+        np.testing.assert_array_equal(arrays["w"], np.zeros(4))
+        self.assertEqual(metadata["episode"], 7)
+
+    def test_mmap_load(self):
+        """Test memory-mapped loading matches a regular load"""
+        manager = CheckpointManager(self.directory)
+        manager.save({"a": np.arange(12, dtype=np.float32).reshape(3, 4), "b": np.ones(2)})
+        manager.close()
+
+        arrays, _ = load_npz(manager.latest(), mmap=True)
+        self.assertIsInstance(arrays["a"], np.memmap)
+        np.testing.assert_array_equal(arrays["a"], np.arange(12).reshape(3, 4))
+
+    def test_dqn_resume(self):
+        """Test DQN weights restore from a checkpoint"""
+        game = SnakeGame(GameConfig(width=10, height=10))
+        source = DQNAI(game)
+        manager = CheckpointManager(self.directory, prefix="dqn")
+        manager.save(source.checkpoint_arrays(), source.checkpoint_metadata())
+        manager.close()
+
+        target = DQNAI(game)
+        target.load_checkpoint(*manager.load(mmap=True))
+        state = source.get_state()
+        self.assertEqual(source.policy_net.predict(state), target.policy_net.predict(state))
+        np.testing.assert_allclose(source.policy_net.get_flat(), target.policy_net.get_flat())
+
+
+if __name__ == "__main__":
+    unittest.main()
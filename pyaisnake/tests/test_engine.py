@@ -32,6 +32,26 @@ class TestSnakeGame(unittest.TestCase):
         # Head should be one step in direction
         self.assertEqual(new_head[0], initial_head[0] + 1)  # RIGHT direction
 
+    def test_tick_advances(self):
+        """Test the board version changes on every move and on reset"""
+        tick = self.game.tick
+        self.game.update()
+        self.assertEqual(self.game.tick, tick + 1)
+
+        self.game.reset()
+        self.assertGreater(self.game.tick, tick + 1)
+
+    def test_move_deadline(self):
+        """Test the move deadline is a share of the current tick"""
+        import time
+
+        now = time.perf_counter()
+        deadline = self.game.move_deadline(budget=0.5)
+        tick = self.game.effective_speed / 1000
+
+        self.assertGreaterEqual(deadline, now + tick * 0.5)
+        self.assertLess(deadline, now + tick)
+
     def test_direction_change(self):
         """Test direction change"""
         self.assertTrue(self.game.set_direction(Direction.UP))
@@ -143,6 +163,55 @@ class TestSnakeGame(unittest.TestCase):
         self.assertEqual(len(game.obstacles), 5)
 
 
+class TestLookahead(unittest.TestCase):
+    """Test cloning and virtual moves used for look-ahead"""
+
+    def setUp(self):
+        # Dead-end corridor on row 1 ending in food
+        self.game = SnakeGame(GameConfig(width=7, height=3, power_ups_enabled=False))
+        self.game.snake = [(2, 1), (1, 1), (0, 1)]
+        self.game.obstacles = {(x, y) for x in range(3, 7) for y in (0, 2)}
+        self.game.food = (6, 1)
+
+    def test_clone_is_independent(self):
+        """Test moving a clone leaves the original game untouched"""
+        self.game.on_move = lambda pos: self.fail("callback reached the original game")
+        clone = self.game.clone()
+        clone.update()
+
+        self.assertEqual(self.game.snake[0], (2, 1))
+        self.assertEqual(clone.snake[0], (3, 1))
+        self.assertEqual(self.game.stats.moves, 0)
+
+    def test_advance_virtual_grows_without_respawn(self):
+        """Test eating along a virtual path grows the snake and draws no random numbers"""
+        import random
+
+        state = random.getstate()
+        path = self.game.find_path(self.game.food)
+        self.game.advance_virtual(path)
+
+        self.assertEqual(random.getstate(), state)
+        self.assertIsNone(self.game.food)
+        self.assertEqual(self.game.snake, [(6, 1), (5, 1), (4, 1), (3, 1)])
+
+    def test_find_path(self):
+        """Test BFS returns the shortest path excluding the head"""
+        self.assertEqual(self.game.find_path((6, 1)), [(3, 1), (4, 1), (5, 1), (6, 1)])
+
+        self.game.obstacles.add((3, 1))
+        self.assertEqual(self.game.find_path((6, 1)), [])
+
+    def test_path_to_tail(self):
+        """Test the tail is reached around the body, never in a single move"""
+        path = self.game.path_to_tail()
+        self.assertEqual(len(path), 4)
+        self.assertEqual(path[-1], (0, 1))
+
+        self.game.advance_virtual(self.game.find_path(self.game.food))
+        self.assertEqual(self.game.path_to_tail(), [])
+
+
 class TestGameConfig(unittest.TestCase):
     """Test GameConfig"""
 